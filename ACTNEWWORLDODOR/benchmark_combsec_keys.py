@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+ACTNEWWORLDODOR - COMBSEC Key Minting Benchmark
+
+Compares the throughput of the per-key minting path (one
+generate_combsec_key call per key) with the bulk generate_key_batch and
+generate_key_bytes paths, of validate_combsec_key with the check_key
+and validate_many fast paths, and of constructing a generator per call
+with the shared get_generator registry, and writes the results as JSON so runs from
+different commits can be compared.
+
+Usage:
+    python benchmark_combsec_keys.py --counts 10000 1000000
+"""
+
+import argparse
+import json
+import os
+import platform
+import secrets
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Add the repo root to the Python path for the ACTNEWWORLDODOR package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ACTNEWWORLDODOR.emoji_combsec_generator import EmojiCombsecGenerator, generate_combsec_key_u1f310, registry_info
+
+
+DEFAULT_COUNTS = [10_000, 100_000]
+
+
+def per_key_batch(generator: EmojiCombsecGenerator, count: int) -> List[str]:
+    """The per-key batch path: one generate_combsec_key call and token draw per key"""
+    base_time = int(time.time())
+    return [
+        generator.generate_combsec_key(base_time + i, f"batch_{i}_{secrets.token_hex(4)}")
+        for i in range(count)
+    ]
+
+
+def _paths(generator: EmojiCombsecGenerator) -> Dict[str, Callable[[int], Any]]:
+    """Minting paths as single-argument calls"""
+    return {
+        'per_key': lambda count: per_key_batch(generator, count),
+        'batch': generator.generate_key_batch,
+        'bytes': generator.generate_key_bytes
+    }
+
+
+def _validation_paths(generator: EmojiCombsecGenerator) -> Dict[str, Callable[[List[str]], Any]]:
+    """Validation paths as single-argument calls over a key list"""
+    return {
+        'validate_combsec_key': lambda keys: [generator.validate_combsec_key(key) for key in keys],
+        'check_key': lambda keys: [generator.check_key(key) for key in keys],
+        'validate_many': generator.validate_many
+    }
+
+
+def _registry_paths(firm_id: str) -> Dict[str, Callable[[int], Any]]:
+    """Per-call paths: a fresh generator per key versus the shared registry"""
+    return {
+        'construct_per_call': lambda count: [EmojiCombsecGenerator(firm_id).generate_combsec_key() for _ in range(count)],
+        'registry': lambda count: [generate_combsec_key_u1f310(firm_id) for _ in range(count)]
+    }
+
+
+def _time_paths(paths: Dict[str, Callable[[Any], Any]], argument: Any, count: int,
+                repeat: int, baseline: str) -> Dict[str, Dict[str, float]]:
+    """Best-of-``repeat`` time, keys per second and speedup over ``baseline`` per path"""
+    results = {}
+    for name, call in paths.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call(argument)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        results[name] = {
+            'seconds': best,
+            'keys_per_second': count / best if best > 0 else float('inf')
+        }
+
+    for result in results.values():
+        result['speedup'] = results[baseline]['seconds'] / result['seconds'] if result['seconds'] > 0 else float('inf')
+    return results
+
+
+def run_benchmark(counts: List[int] = None, repeat: int = 3, firm_id: str = "BENCHMARK") -> Dict[str, Any]:
+    """
+    Time every minting, validation and registry path for each batch size
+
+    Args:
+        counts: Batch sizes to benchmark
+        repeat: Timing repetitions per path (best time is reported)
+        firm_id: Firm identifier of the generator
+
+    Returns:
+        Machine-readable benchmark report
+    """
+    counts = counts or DEFAULT_COUNTS
+    generator = EmojiCombsecGenerator(firm_id)
+
+    report = {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform()
+        },
+        'config': {'counts': counts, 'repeat': repeat, 'firm_id': firm_id},
+        'results': []
+    }
+
+    for count in counts:
+        keys = generator.generate_key_batch(count)
+        report['results'].append({
+            'count': count,
+            'paths': _time_paths(_paths(generator), count, count, repeat, 'per_key'),
+            'validation': _time_paths(_validation_paths(generator), keys, count, repeat, 'validate_combsec_key'),
+            'registry': _time_paths(_registry_paths(firm_id), count, count, repeat, 'construct_per_call')
+        })
+
+    for entry in report['results']:
+        registry = entry['registry']
+        # Per-call cost of building the generator that the registry avoids
+        entry['construction_overhead_us'] = (
+            (registry['construct_per_call']['seconds'] - registry['registry']['seconds']) / entry['count'] * 1e6
+        )
+    report['registry_info'] = registry_info()
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark COMBSEC key minting paths")
+    parser.add_argument('--counts', type=lambda v: int(float(v)), nargs='+', default=DEFAULT_COUNTS,
+                        help="Batch sizes, e.g. 1e4 1e6")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing repetitions per path")
+    parser.add_argument('--output', default=None, help="Optional JSON output path")
+    args = parser.parse_args(argv)
+
+    print("🌐 COMBSEC Key Minting Benchmark")
+    print("=" * 55)
+    report = run_benchmark(args.counts, args.repeat)
+
+    for entry in report['results']:
+        timed = {**entry['paths'], **entry['validation'], **entry['registry']}
+        for name, result in timed.items():
+            print(f"   count={entry['count']:<9} {name:<20} {result['keys_per_second']:>12,.0f} keys/s "
+                  f"(x{result['speedup']:.2f})")
+        print(f"   count={entry['count']:<9} generator construction overhead: "
+              f"{entry['construction_overhead_us']:.2f} µs/call")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📁 Benchmark report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,13 +7,88 @@ This module provides the core functionality for generating combinatoric
 security keys using the globe emoji as the foundational element.
 """
 
+import bz2
+import csv
+import gzip
 import hashlib
+import hmac
+import lzma
+import os
+import re
+import threading
 import time
 import secrets
-from typing import Optional, Dict, List
+import warnings
+from collections import OrderedDict
+from itertools import islice
+from pathlib import PurePath
+from typing import Any, Optional, Dict, Iterable, List, MutableSequence, NamedTuple, Union
 import json
 from datetime import datetime
 
+# 🌐-[16 chars]-[timestamp]-[firm id]; timestamps of up to 11 ASCII digits
+# are always within datetime range, anything else takes the full parser
+_KEY_PATTERN = re.compile(r'\U0001F310-([^-]{16})-([0-9]{1,11})-([^-]*)')
+
+# HEXKEY of a signed key: a truncated upper-case HMAC hex digest
+_SIGNATURE_PATTERN = re.compile(r'[0-9A-F]{16}')
+
+
+class KeyCheck(NamedTuple):
+    """Lightweight COMBSEC key validation result"""
+    valid: bool
+    hex_key: Optional[str] = None
+    timestamp: Optional[int] = None
+    firm_id: Optional[str] = None
+    error: Optional[str] = None
+    
+    @property
+    def datetime(self) -> Optional[str]:
+        """Local ISO-8601 time of the key timestamp, formatted on demand"""
+        return datetime.fromtimestamp(self.timestamp).isoformat() if self.valid else None
+
+
+# Builds a KeyCheck from a full tuple without the NamedTuple argument handling
+_new_key_check = tuple.__new__
+
+# Keys minted per os.urandom draw; bounds the entropy held by large batches
+_MINT_CHUNK = 65536
+
+# Streaming export: formats, row columns and compression by file suffix
+EXPORT_FORMATS = {'.ndjson': 'ndjson', '.jsonl': 'ndjson', '.csv': 'csv', '.parquet': 'parquet'}
+EXPORT_COLUMNS = ('key', 'valid', 'hex_key', 'timestamp', 'datetime', 'firm_id', 'error')
+_COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+_TEXT_OPENERS = {None: open, 'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+# Environment variable holding the signing secret shared by all verifying nodes
+SIGNING_SECRET_ENV = "COMBSEC_SIGNING_SECRET"
+_process_signing_secret = None
+
+
+def configured_signing_secret(signing_secret: Optional[bytes] = None) -> Optional[bytes]:
+    """Explicit signing secret, else the one from SIGNING_SECRET_ENV, else None"""
+    if signing_secret:
+        return signing_secret
+    secret = os.environ.get(SIGNING_SECRET_ENV)
+    return secret.encode('utf-8') if secret else None
+
+
+def _default_signing_secret() -> bytes:
+    """Signing secret from the environment, else a random secret for this process"""
+    global _process_signing_secret
+    secret = configured_signing_secret()
+    if secret:
+        return secret
+    if _process_signing_secret is None:
+        warnings.warn(
+            f"{SIGNING_SECRET_ENV} is not set; signed COMBSEC keys use a random per-process "
+            "secret and will not verify on other nodes or after a restart",
+            RuntimeWarning
+        )
+        _process_signing_secret = os.urandom(32)
+    return _process_signing_secret
+
+
 class EmojiCombsecGenerator:
     """
     Emoji-based combinatoric security key generator
@@ -26,15 +101,24 @@ class EmojiCombsecGenerator:
     HEX_VALUE = 0x1F310
     UTF8_BYTES = b'\xf0\x9f\x8c\x90'
     
-    def __init__(self, firm_id: str = "YOURFIRM"):
+    def __init__(self, firm_id: str = "YOURFIRM", signing_secret: Optional[bytes] = None):
         """
         Initialize the COMBSEC key generator
         
         Args:
             firm_id: Unique identifier for the firm/organization
+            signing_secret: Secret for signed keys; defaults to the
+                COMBSEC_SIGNING_SECRET environment variable, else a random
+                secret that only this process knows
         """
         self.firm_id = firm_id
         self.base_seed = self._generate_base_seed()
+        self._signing_secret = signing_secret
+        self._signing_key = None
+        
+        # base_seed is the constant prefix of every key hash (exactly one
+        # SHA-256 block); batch minting copies this state instead of rehashing it
+        self._seeded_hash = hashlib.sha256(self.base_seed.encode('utf-8'))
         
     def _generate_base_seed(self) -> str:
         """Generate the foundational seed from the globe emoji"""
@@ -81,6 +165,60 @@ class EmojiCombsecGenerator:
         
         return key
     
+    def generate_signed_key(self, ttl_seconds: int = 3600, now: Optional[int] = None) -> str:
+        """
+        Generate an HMAC-signed COMBSEC key with an embedded expiry
+        
+        The key keeps the 🌐-[HEXKEY]-[TIMESTAMP]-[FIRMID] format, with the
+        expiry time as TIMESTAMP and a truncated HMAC-SHA256 of expiry and
+        firm as HEXKEY. The HMAC key is derived from base_seed and the
+        signing secret, so any node holding the secret can verify the key
+        with verify_signed_key without a session store. Keys minted for
+        the same firm and expiry second are identical.
+        
+        Args:
+            ttl_seconds: Lifetime of the key in seconds
+            now: Optional issue time (defaults to current time)
+            
+        Returns:
+            Signed COMBSEC key string
+        """
+        expires = int(time.time() if now is None else now) + int(ttl_seconds)
+        return f"{self.GLOBE_EMOJI}-{self._signature(expires, self.firm_id)}-{expires}-{self.firm_id}"
+    
+    def verify_signed_key(self, key: str, now: Optional[int] = None) -> KeyCheck:
+        """
+        Verify a key from generate_signed_key in constant time
+        
+        Args:
+            key: The signed COMBSEC key
+            now: Optional verification time (defaults to current time)
+            
+        Returns:
+            KeyCheck with the expiry as timestamp; invalid for malformed,
+            foreign-firm, forged or expired keys
+        """
+        check = self.check_key(key)
+        if not check.valid:
+            return check
+        if check.firm_id != self.firm_id:
+            return KeyCheck(False, error="Firm mismatch")
+        # compare_digest rejects non-ASCII str, so only well-formed tags are compared
+        if (_SIGNATURE_PATTERN.fullmatch(check.hex_key) is None
+                or not hmac.compare_digest(check.hex_key, self._signature(check.timestamp, check.firm_id))):
+            return KeyCheck(False, error="Invalid signature")
+        if check.timestamp <= (time.time() if now is None else now):
+            return KeyCheck(False, error="Key expired")
+        return check
+    
+    def _signature(self, expires: int, firm_id: str) -> str:
+        """Truncated HMAC-SHA256 tag of a signed key"""
+        if self._signing_key is None:
+            secret = self._signing_secret or _default_signing_secret()
+            self._signing_key = hmac.new(secret, self.base_seed.encode('utf-8'), hashlib.sha256).digest()
+        message = f"{self.UNICODE_CODEPOINT}|{expires}|{firm_id}".encode('utf-8')
+        return hmac.new(self._signing_key, message, hashlib.sha256).hexdigest()[:16].upper()
+    
     def validate_combsec_key(self, key: str) -> Dict[str, any]:
         """
         Validate and parse a COMBSEC key
@@ -127,32 +265,162 @@ class EmojiCombsecGenerator:
         except Exception as e:
             return {"valid": False, "error": f"Parsing error: {str(e)}"}
     
-    def generate_key_batch(self, count: int = 10) -> List[str]:
+    def check_key(self, key: str) -> KeyCheck:
+        """
+        Validate a COMBSEC key without building a dictionary
+        
+        Well-formed keys are matched by one precompiled regex; only keys it
+        rejects go through validate_combsec_key for the exact verdict and
+        error message. The datetime is formatted only when
+        KeyCheck.datetime is read.
+        
+        Args:
+            key: The COMBSEC key to validate
+            
+        Returns:
+            KeyCheck tuple (valid, hex_key, timestamp, firm_id, error)
+        """
+        match = _KEY_PATTERN.fullmatch(key) if isinstance(key, str) else None
+        if match is not None:
+            hex_key, timestamp, firm_id = match.groups()
+            return _new_key_check(KeyCheck, (True, hex_key, int(timestamp), firm_id, None))
+        return self._check_slow(key)
+    
+    def _check_slow(self, key: str) -> KeyCheck:
+        """KeyCheck from the full validate_combsec_key parser"""
+        result = self.validate_combsec_key(key)
+        if not result["valid"]:
+            return KeyCheck(False, error=result["error"])
+        return KeyCheck(True, result["hex_key"], result["timestamp"], result["firm_id"])
+    
+    def validate_many(self, keys: Iterable[str]) -> Dict[str, "np.ndarray"]:
+        """
+        Validate many COMBSEC keys into NumPy arrays
+        
+        Args:
+            keys: COMBSEC keys
+            
+        Returns:
+            Dictionary with 'valid' (bool), 'timestamp' (int64 epoch
+            seconds, 0 where invalid) and 'datetime' (datetime64[s] in
+            UTC, NaT where invalid) arrays
+        """
+        import numpy as np
+        
+        keys = keys if isinstance(keys, (list, tuple)) else list(keys)
+        try:
+            matches = list(map(_KEY_PATTERN.fullmatch, keys))
+        except TypeError:
+            matches = [_KEY_PATTERN.fullmatch(key) if isinstance(key, str) else None for key in keys]
+        valid = np.fromiter((match is not None for match in matches), dtype=bool, count=len(keys))
+        timestamps = np.zeros(len(keys), dtype=np.int64)
+        if valid.any():
+            # Fast-path timestamps are ASCII digits; NumPy parses them in one cast
+            timestamps[valid] = np.array([match[2] for match in matches if match is not None]).astype(np.int64)
+        
+        # Keys outside the fast-path grammar go through the full parser
+        for i in np.flatnonzero(~valid):
+            check = self._check_slow(keys[i])
+            if check.valid:
+                valid[i], timestamps[i] = True, check.timestamp
+        
+        dates = timestamps.astype('datetime64[s]')
+        dates[~valid] = np.datetime64('NaT')
+        return {'valid': valid, 'timestamp': timestamps, 'datetime': dates}
+    
+    def generate_key_batch(self,
+                           count: int = 10,
+                           out: Optional[MutableSequence] = None,
+                           base_time: Optional[int] = None) -> Union[List[str], MutableSequence]:
         """
         Generate a batch of COMBSEC keys for bulk operations
         
+        Keys are identical to generate_combsec_key(base_time + i,
+        f"batch_{i}_{entropy}") but minted in bulk: the entropy comes from
+        one os.urandom call per 65,536 keys and every hash starts from a
+        copy of the pre-seeded base_seed state.
+        
         Args:
             count: Number of keys to generate
+            out: Optional preallocated list or NumPy array (at least
+                ``count`` long) that receives the keys in place
+            base_time: Timestamp of the first key (defaults to current time)
             
         Returns:
-            List of COMBSEC keys
+            List of COMBSEC keys (``out`` when given)
         """
-        keys = []
-        base_time = int(time.time())
+        if out is None:
+            out = [None] * count
+        elif len(out) < count:
+            raise ValueError(f"Output holds {len(out)} keys, {count} requested")
         
-        for i in range(count):
-            # Use sequential timestamps to ensure uniqueness
-            timestamp = base_time + i
-            entropy = f"batch_{i}_{secrets.token_hex(4)}"
-            key = self.generate_combsec_key(timestamp, entropy)
-            keys.append(key)
+        for i, key in enumerate(self._mint_keys(count, base_time)):
+            out[i] = key
             
-        return keys
+        return out
+    
+    def generate_key_bytes(self,
+                           count: int = 10,
+                           buffer: Optional[bytearray] = None,
+                           base_time: Optional[int] = None) -> memoryview:
+        """
+        Mint a batch of keys as newline-terminated UTF-8 records
+        
+        Args:
+            count: Number of keys to generate
+            buffer: Optional preallocated bytearray; grown if too small
+            base_time: Timestamp of the first key (defaults to current time)
+            
+        Returns:
+            Memoryview of the written bytes
+        """
+        if base_time is None:
+            base_time = int(time.time())
+        
+        # Every record is fixed apart from the timestamp digits
+        fixed = len(f"{self.GLOBE_EMOJI}-{'0' * 16}--{self.firm_id}\n".encode('utf-8'))
+        size = count * fixed + _digit_count_sum(base_time, base_time + count)
+        if buffer is None:
+            buffer = bytearray(size)
+        elif len(buffer) < size:
+            buffer.extend(bytes(size - len(buffer)))
+        
+        view = memoryview(buffer)
+        offset = 0
+        for key in self._mint_keys(count, base_time):
+            record = (key + '\n').encode('utf-8')
+            view[offset:offset + len(record)] = record
+            offset += len(record)
+        return view[:size]
+    
+    def _mint_keys(self, count: int, base_time: Optional[int] = None):
+        """Yield ``count`` batch keys with sequential timestamps"""
+        if base_time is None:
+            base_time = int(time.time())
+        
+        copy_seeded = self._seeded_hash.copy
+        middle = f"{self.firm_id}{self.HEX_VALUE}batch_"
+        prefix = f"{self.GLOBE_EMOJI}-"
+        suffix = f"-{self.firm_id}"
+        
+        for start in range(0, count, _MINT_CHUNK):
+            stop = min(start + _MINT_CHUNK, count)
+            entropy = os.urandom(4 * (stop - start)).hex()
+            for i in range(start, stop):
+                # Use sequential timestamps to ensure uniqueness
+                timestamp = base_time + i
+                offset = 8 * (i - start)
+                digest = copy_seeded()
+                digest.update(f"{timestamp}{middle}{i}_{entropy[offset:offset + 8]}".encode('utf-8'))
+                yield f"{prefix}{digest.hexdigest()[:16].upper()}-{timestamp}{suffix}"
     
     def export_key_data(self, keys: List[str]) -> Dict[str, any]:
         """
         Export key data in structured format for integration
         
+        Holds every key and its validation in memory; use export_key_stream
+        for large key sets.
+        
         Args:
             keys: List of COMBSEC keys to export
             
@@ -177,6 +445,239 @@ class EmojiCombsecGenerator:
             })
             
         return export_data
+    
+    def export_key_stream(self,
+                          path: Union[str, os.PathLike],
+                          keys: Optional[Iterable[str]] = None,
+                          count: Optional[int] = None,
+                          fmt: Optional[str] = None,
+                          compression: Optional[str] = None,
+                          base_time: Optional[int] = None,
+                          chunk_size: int = 10000) -> Dict[str, Any]:
+        """
+        Stream key data to an NDJSON, CSV or Parquet file
+        
+        Keys are validated and written ``chunk_size`` rows at a time, so
+        memory stays constant however many keys are exported. Without
+        ``keys``, ``count`` keys are minted straight from the batch
+        generator as they are written. Every row holds the EXPORT_COLUMNS
+        of one key.
+        
+        Args:
+            path: Output file; the format and compression are inferred from
+                suffixes such as .ndjson, .jsonl, .csv, .parquet, .csv.gz
+            keys: Iterable of COMBSEC keys (consumed lazily)
+            count: Number of keys to mint when ``keys`` is not given
+            fmt: 'ndjson', 'csv' or 'parquet' (overrides the suffix)
+            compression: 'gzip', 'bz2' or 'xz' for NDJSON/CSV, or a Parquet
+                codec such as 'snappy' or 'zstd' (overrides the suffix)
+            base_time: Timestamp of the first minted key
+            chunk_size: Rows validated and written per chunk
+            
+        Returns:
+            Export summary dictionary (the export_key_data header without
+            the keys, plus the path, format, compression and valid count)
+        """
+        if keys is None:
+            if count is None:
+                raise ValueError("Either keys or count is required")
+            keys = self._mint_keys(count, base_time)
+        
+        suffixes = [suffix.lower() for suffix in PurePath(path).suffixes]
+        if compression is None and suffixes and suffixes[-1] in _COMPRESSION_SUFFIXES:
+            compression = _COMPRESSION_SUFFIXES[suffixes.pop()]
+        if fmt is None:
+            fmt = EXPORT_FORMATS.get(suffixes[-1]) if suffixes else None
+            if fmt is None:
+                raise ValueError(f"Cannot infer export format from {os.fspath(path)!r}")
+        if fmt not in EXPORT_FORMATS.values():
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if fmt != 'parquet' and compression not in _TEXT_OPENERS:
+            raise ValueError(f"Unsupported compression for {fmt}: {compression}")
+        
+        chunks = self._export_chunks(keys, chunk_size)
+        if fmt == 'parquet':
+            total, valid = _write_parquet_chunks(path, chunks, compression)
+        else:
+            with _TEXT_OPENERS[compression](path, 'wt', encoding='utf-8', newline='') as f:
+                total, valid = (_write_ndjson_chunks if fmt == 'ndjson' else _write_csv_chunks)(f, chunks)
+        
+        return {
+            "system": "ACTNEWWORLDODOR_COMBSEC",
+            "base_emoji": self.GLOBE_EMOJI,
+            "unicode_codepoint": self.UNICODE_CODEPOINT,
+            "firm_id": self.firm_id,
+            "generation_timestamp": datetime.now().isoformat(),
+            "total_keys": total,
+            "valid_keys": valid,
+            "path": os.fspath(path),
+            "format": fmt,
+            "compression": compression
+        }
+    
+    def _export_chunks(self, keys: Iterable[str], chunk_size: int):
+        """Yield lists of export rows (EXPORT_COLUMNS tuples), ``chunk_size`` keys each"""
+        keys = iter(keys)
+        check_key = self.check_key
+        while True:
+            chunk = list(islice(keys, chunk_size))
+            if not chunk:
+                return
+            rows = []
+            for key in chunk:
+                check = check_key(key)
+                rows.append((str(key), check.valid, check.hex_key, check.timestamp,
+                             check.datetime, check.firm_id, check.error))
+            yield rows
+
+
+def _write_ndjson_chunks(f, chunks) -> tuple:
+    """Write export rows as JSON lines; returns (rows, valid rows)"""
+    total = valid = 0
+    dumps = json.dumps
+    for rows in chunks:
+        f.write(''.join(dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n' for row in rows))
+        total += len(rows)
+        valid += sum(row[1] for row in rows)
+    return total, valid
+
+
+def _write_csv_chunks(f, chunks) -> tuple:
+    """Write export rows as CSV with a header; returns (rows, valid rows)"""
+    total = valid = 0
+    writer = csv.writer(f)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows(rows)
+        total += len(rows)
+        valid += sum(row[1] for row in rows)
+    return total, valid
+
+
+def _write_parquet_chunks(path, chunks, compression: Optional[str]) -> tuple:
+    """Write export rows as one Parquet row group per chunk; returns (rows, valid rows)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required for Parquet export")
+    
+    schema = pa.schema([
+        ('key', pa.string()), ('valid', pa.bool_()), ('hex_key', pa.string()),
+        ('timestamp', pa.int64()), ('datetime', pa.string()), ('firm_id', pa.string()),
+        ('error', pa.string())
+    ])
+    total = valid = 0
+    with pq.ParquetWriter(os.fspath(path), schema, compression=compression or 'snappy') as writer:
+        for rows in chunks:
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(zip(*rows), schema)],
+                schema=schema
+            ))
+            total += len(rows)
+            valid += sum(row[1] for row in rows)
+    return total, valid
+
+
+GENERATOR_REGISTRY_SIZE = 256
+
+# Process-wide generator registry: (firm_id, signing_secret) -> generator, LRU order
+_generator_registry = OrderedDict()
+_registry_lock = threading.Lock()
+_registry_stats = {'hits': 0, 'misses': 0}
+
+
+def _registry_key(firm_id: str, signing_secret: Optional[bytes]) -> tuple:
+    """Normalised registry key, so equivalent arguments share one entry"""
+    return str(firm_id), signing_secret or None
+
+
+def get_generator(firm_id: str = "YOURFIRM", signing_secret: Optional[bytes] = None) -> EmojiCombsecGenerator:
+    """
+    Shared generator for a firm from the process-wide registry
+    
+    Generators hold only per-firm constants (base_seed and the derived
+    hash/HMAC states), so one instance per firm can serve every caller and
+    thread. The registry is an LRU bounded at GENERATOR_REGISTRY_SIZE
+    firms; lookups and construction happen under one lock, so concurrent
+    callers never build duplicate generators. registry_info() reports its
+    hits and size and clear_registry() empties it.
+    
+    Args:
+        firm_id: Unique firm identifier
+        signing_secret: Optional signing secret for signed keys
+    
+    Returns:
+        EmojiCombsecGenerator for the firm
+    """
+    key = _registry_key(firm_id, signing_secret)
+    with _registry_lock:
+        generator = _generator_registry.get(key)
+        if generator is not None:
+            _generator_registry.move_to_end(key)
+            _registry_stats['hits'] += 1
+            return generator
+        
+        _registry_stats['misses'] += 1
+        generator = EmojiCombsecGenerator(*key)
+        _generator_registry[key] = generator
+        while len(_generator_registry) > GENERATOR_REGISTRY_SIZE:
+            _generator_registry.popitem(last=False)
+        return generator
+
+
+def registry_info() -> Dict[str, int]:
+    """Hits, misses, maximum and current size of the generator registry"""
+    with _registry_lock:
+        return dict(_registry_stats, maxsize=GENERATOR_REGISTRY_SIZE, currsize=len(_generator_registry))
+
+
+def clear_registry():
+    """Drop every registered generator and reset the registry counters"""
+    with _registry_lock:
+        _generator_registry.clear()
+        _registry_stats.update(hits=0, misses=0)
+
+
+def verify_signed_key_u1f310(key: str,
+                             signing_secret: Optional[bytes] = None,
+                             now: Optional[int] = None) -> KeyCheck:
+    """
+    Verify a signed COMBSEC key for whichever firm it names
+    
+    Args:
+        key: Signed COMBSEC key
+        signing_secret: Secret the key was signed with (defaults as in
+            EmojiCombsecGenerator)
+        now: Optional verification time (defaults to current time)
+    
+    Returns:
+        KeyCheck; valid only for an unexpired key with a correct signature
+    """
+    firm_id = key.rsplit('-', 1)[-1] if isinstance(key, str) else ""
+    with _registry_lock:
+        generator = _generator_registry.get(_registry_key(firm_id, signing_secret))
+    if generator is not None:
+        return generator.verify_signed_key(key, now)
+    
+    # The firm id comes from untrusted input: verify with a throwaway
+    # generator and register the firm only once a key for it checks out,
+    # so keys naming made-up firms cannot evict real ones
+    check = EmojiCombsecGenerator(firm_id, signing_secret).verify_signed_key(key, now)
+    if check.valid:
+        get_generator(firm_id, signing_secret)
+    return check
+
+
+def _digit_count_sum(start: int, stop: int) -> int:
+    """Total number of decimal digits of the integers in [start, stop)"""
+    total = 0
+    digits = len(str(start))
+    while start < stop:
+        end = min(stop, 10 ** digits)
+        total += (end - start) * digits
+        start, digits = end, digits + 1
+    return total
 
 
 def generate_combsec_key_u1f310(firm_id: str, timestamp: int = None) -> str:
@@ -193,8 +694,8 @@ def generate_combsec_key_u1f310(firm_id: str, timestamp: int = None) -> str:
     Returns:
         Formatted COMBSEC key string in format: 🌐-[HEXKEY]-[TIMESTAMP]-[FIRMID]
     """
-    # Create a generator instance for this specific request
-    generator = EmojiCombsecGenerator(firm_id)
+    # Shared generator for this firm from the process-wide registry
+    generator = get_generator(firm_id)
     
     # Generate and return the key using the existing implementation
     return generator.generate_combsec_key(timestamp=timestamp)
@@ -5,13 +5,17 @@ Enhanced timestamping with GitHub commit and workflow data integration
 """
 
 import os
+import sys
 import time
 import json
 import hashlib
 import subprocess
 from datetime import datetime
 from typing import Dict, Optional, List, Any
-from emoji_combsec_generator import EmojiCombsecGenerator
+
+# Import COMBSEC through the ACTNEWWORLDODOR package from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ACTNEWWORLDODOR.emoji_combsec_generator import get_generator
 
 class GitHubTimestampIntegrator:
     """
@@ -22,7 +26,7 @@ class GitHubTimestampIntegrator:
     def __init__(self, firm_id: str = "GITHUB_FIRM"):
         """Initialize GitHub timestamp integrator"""
         self.firm_id = firm_id
-        self.combsec_generator = EmojiCombsecGenerator(firm_id)
+        self.combsec_generator = get_generator(firm_id)
         
     def get_git_commit_info(self) -> Dict[str, Any]:
         """Get current Git commit information"""
@@ -6,11 +6,19 @@ Simple test suite for the emoji-based combinatoric security key system
 
 import sys
 import os
+import csv
+import gzip
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
-# Add the ACTNEWWORLDODOR directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add the repo root to the Python path for the ACTNEWWORLDODOR package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from emoji_combsec_generator import EmojiCombsecGenerator, generate_combsec_key_u1f310
+from ACTNEWWORLDODOR.emoji_combsec_generator import (
+    EmojiCombsecGenerator, GENERATOR_REGISTRY_SIZE, clear_registry, generate_combsec_key_u1f310,
+    get_generator, registry_info, verify_signed_key_u1f310
+)
 
 def test_key_generation():
     """Test basic key generation functionality"""
@@ -61,6 +69,189 @@ def test_batch_generation():
     print(f"✅ Generated {len(batch)} valid keys")
     return True
 
+def test_bulk_minting():
+    """Test bulk minting against the per-key path and its output targets"""
+    print("🏭 Testing bulk key minting...")
+    
+    generator = EmojiCombsecGenerator("TESTFIRM")
+    
+    # Same entropy through both paths must give the same keys
+    entropy = bytes(range(12))
+    real_urandom = os.urandom
+    os.urandom = lambda n: entropy[:n]
+    try:
+        batch = generator.generate_key_batch(3, base_time=1700000000)
+    finally:
+        os.urandom = real_urandom
+    expected = [
+        generator.generate_combsec_key(1700000000 + i, f"batch_{i}_{entropy[4 * i:4 * i + 4].hex()}")
+        for i in range(3)
+    ]
+    assert batch == expected, "Bulk keys differ from per-key keys"
+    
+    # Preallocated list and newline-terminated bytes buffer
+    out = [None] * 5
+    assert generator.generate_key_batch(4, out=out) is out, "Preallocated output not returned"
+    assert out[4] is None and all(generator.validate_combsec_key(k)["valid"] for k in out[:4])
+    
+    buffer = bytearray(8)
+    view = generator.generate_key_bytes(3, buffer=buffer, base_time=9999999999)
+    records = bytes(view).decode('utf-8').split('\n')
+    assert len(view) == len(buffer) and records[-1] == "", "Buffer not sized to the records"
+    assert [generator.validate_combsec_key(k)["timestamp"] for k in records[:-1]] == [9999999999, 10000000000, 10000000001]
+    
+    print("✅ Bulk minting matches the per-key path")
+    return True
+
+def test_fast_validation():
+    """Test check_key and validate_many against validate_combsec_key"""
+    print("⚡ Testing fast-path validation...")
+    
+    generator = EmojiCombsecGenerator("TESTFIRM")
+    keys = generator.generate_key_batch(3) + [
+        "invalid-key",
+        "🌐-TOOSHORT-123456-FIRM",
+        "🌐-VALIDHEXKEY1234-NOTANUMBER-FIRM",
+        "🌐-ABCDEF0123456789- 1234567890-FIRM",  # int() accepts the space
+        "🌐-ABCDEF0123456789-99999999999999999999-FIRM",  # out of datetime range
+    ]
+    
+    for key in keys:
+        expected = generator.validate_combsec_key(key)
+        check = generator.check_key(key)
+        assert check.valid == expected["valid"], f"Fast path disagrees on {key}"
+        if check.valid:
+            assert (check.hex_key, check.timestamp, check.firm_id, check.datetime) == (
+                expected["hex_key"], expected["timestamp"], expected["firm_id"], expected["datetime"])
+        else:
+            assert check.error == expected["error"], f"Error message differs for {key}"
+    
+    batch = generator.validate_many(keys)
+    assert batch["valid"].tolist() == [True, True, True, False, False, False, True, False]
+    assert batch["timestamp"][3] == 0 and batch["timestamp"][6] == 1234567890
+    assert str(batch["datetime"][6]) == "2009-02-13T23:31:30" and str(batch["datetime"][3]) == "NaT"
+    
+    print("✅ Fast-path validation matches the full parser")
+    return True
+
+def test_signed_keys():
+    """Test HMAC-signed keys with embedded expiry"""
+    print("🔏 Testing signed keys...")
+    
+    generator = EmojiCombsecGenerator("TESTFIRM", signing_secret=b"test-secret")
+    key = generator.generate_signed_key(ttl_seconds=60, now=1700000000)
+    
+    # Signed keys keep the standard format, with the expiry as timestamp
+    assert generator.validate_combsec_key(key)["timestamp"] == 1700000060
+    
+    # Any generator with the same secret verifies it, without shared state
+    verifier = EmojiCombsecGenerator("TESTFIRM", signing_secret=b"test-secret")
+    assert verifier.verify_signed_key(key, now=1700000059).valid, "Signed key rejected"
+    assert verify_signed_key_u1f310(key, b"test-secret", now=1700000000).valid
+    
+    forged = key.replace(key[2], "0" if key[2] != "0" else "1", 1)
+    assert verifier.verify_signed_key(forged, now=1700000000).error == "Invalid signature"
+    assert verifier.verify_signed_key(key, now=1700000060).error == "Key expired"
+    assert EmojiCombsecGenerator("TESTFIRM", b"other").verify_signed_key(key, now=1700000000).error == "Invalid signature"
+    assert EmojiCombsecGenerator("OTHERFIRM", b"test-secret").verify_signed_key(key, now=1700000000).error == "Firm mismatch"
+    assert not verifier.verify_signed_key(generator.generate_combsec_key(1700000060), now=1700000000).valid
+    
+    # Non-hex signatures are rejected rather than raising in compare_digest
+    for tag in ("ÄÖÜ" + key[5:18], key[2:18].lower()):
+        tampered = key[:2] + tag + key[18:]
+        assert verifier.verify_signed_key(tampered, now=1700000000).error == "Invalid signature"
+        assert not verify_signed_key_u1f310(tampered, b"test-secret", now=1700000000).valid
+    
+    print("✅ Signed keys verify statelessly and expire")
+    return True
+
+def test_generator_registry():
+    """Test the shared, bounded generator registry"""
+    print("🗂️  Testing generator registry...")
+    
+    clear_registry()
+    
+    # Threads asking for the same firm share one generator, built once
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        generators = list(executor.map(lambda _: get_generator("TESTFIRM"), range(64)))
+    assert all(generator is generators[0] for generator in generators), "Registry returned distinct generators"
+    assert registry_info()["misses"] == 1
+    assert get_generator("OTHERFIRM") is not generators[0]
+    
+    # Positional and keyword lookups and the API function share one entry
+    assert get_generator(firm_id="TESTFIRM") is generators[0]
+    assert get_generator("TESTFIRM", b"") is generators[0]
+    generate_combsec_key_u1f310("TESTFIRM")
+    assert registry_info()["currsize"] == 2
+    
+    # Keys naming unknown firms are verified before they enter the registry
+    assert not verify_signed_key_u1f310("🌐-0123456789ABCDEF-9999999999-MADEUPFIRM", b"test-secret").valid
+    assert registry_info()["currsize"] == 2
+    signed = EmojiCombsecGenerator("SIGNEDFIRM", b"test-secret").generate_signed_key(60)
+    assert verify_signed_key_u1f310(signed, b"test-secret").valid
+    assert get_generator("SIGNEDFIRM", b"test-secret") is get_generator("SIGNEDFIRM", b"test-secret")
+    assert registry_info()["currsize"] == 3
+    
+    # Shared generators produce the same keys as fresh ones
+    key = generators[0].generate_combsec_key(1700000000, "seed")
+    assert key == EmojiCombsecGenerator("TESTFIRM").generate_combsec_key(1700000000, "seed")
+    
+    # The registry stays bounded
+    for i in range(GENERATOR_REGISTRY_SIZE + 10):
+        get_generator(f"FIRM{i}")
+    assert registry_info()["currsize"] == GENERATOR_REGISTRY_SIZE
+    clear_registry()
+    
+    print("✅ Generator registry is shared and bounded")
+    return True
+
+def test_streaming_export():
+    """Test streaming key export to NDJSON, CSV and Parquet"""
+    print("💾 Testing streaming export...")
+    
+    generator = EmojiCombsecGenerator("TESTFIRM")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Minted straight from the batch generator, in several chunks
+        path = os.path.join(tmp, "keys.ndjson.gz")
+        summary = generator.export_key_stream(path, count=2500, base_time=1700000000, chunk_size=1000)
+        assert summary["total_keys"] == summary["valid_keys"] == 2500
+        assert (summary["format"], summary["compression"]) == ("ndjson", "gzip")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        assert len(rows) == 2500 and rows[-1]["timestamp"] == 1700002499
+        assert rows[0]["datetime"] == generator.validate_combsec_key(rows[0]["key"])["datetime"]
+        
+        # Any key iterable, invalid keys included
+        keys = ["bad-key", generator.generate_combsec_key(1700000000)]
+        path = os.path.join(tmp, "keys.csv")
+        summary = generator.export_key_stream(path, keys=iter(keys))
+        assert (summary["total_keys"], summary["valid_keys"]) == (2, 1)
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["key"] for row in rows] == keys
+        assert rows[0]["error"] == "Invalid key format" and rows[1]["valid"] == "True"
+        
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            pq = None
+        if pq is not None:
+            path = os.path.join(tmp, "keys.parquet")
+            generator.export_key_stream(path, count=1500, chunk_size=1000)
+            assert pq.ParquetFile(path).metadata.num_row_groups == 2
+            assert pq.read_table(path).column("valid").to_pylist() == [True] * 1500
+        
+        for bad in ({"fmt": "xml"}, {"compression": "zip"}):
+            try:
+                generator.export_key_stream(os.path.join(tmp, "keys.csv"), count=1, **bad)
+                assert False, f"Accepted {bad}"
+            except ValueError:
+                pass
+    
+    print("✅ Streaming export writes every format in chunks")
+    return True
+
 def test_unicode_consistency():
     """Test Unicode codepoint consistency"""
     print("🔤 Testing Unicode consistency...")
@@ -138,6 +329,11 @@ def run_all_tests():
         test_key_generation,
         test_key_validation,
         test_batch_generation,
+        test_bulk_minting,
+        test_fast_validation,
+        test_signed_keys,
+        test_generator_registry,
+        test_streaming_export,
         test_invalid_key_handling,
         test_api_function_u1f310,
     ]
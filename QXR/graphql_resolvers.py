@@ -30,23 +30,38 @@ try:
     from QXR.social_media_engine import SocialMediaEngine
     from QXR.notion_page_generator import NotionPageGenerator  
     from QXR.notebook_to_social import NotebookProcessor
-    from ACTNEWWORLDODOR.emoji_combsec_generator import EmojiCombsecGenerator
+    from ACTNEWWORLDODOR.emoji_combsec_generator import (
+        SIGNING_SECRET_ENV, configured_signing_secret, get_generator, verify_signed_key_u1f310
+    )
 except ImportError as e:
     print(f"⚠️  Import warning in GraphQL resolvers: {e}")
     # Fallback for development/testing
     SocialMediaEngine = None
     NotionPageGenerator = None
     NotebookProcessor = None
-    EmojiCombsecGenerator = None
+    get_generator = None
+    verify_signed_key_u1f310 = None
+    configured_signing_secret = None
+    SIGNING_SECRET_ENV = "COMBSEC_SIGNING_SECRET"
 
 
 class GraphQLResolvers:
     """GraphQL resolvers for QXR system integration"""
     
-    def __init__(self):
-        """Initialize resolvers with system components"""
-        self.combsec_generator = EmojiCombsecGenerator() if EmojiCombsecGenerator else None
-        self.active_sessions = {}  # Track active COMBSEC sessions
+    def __init__(self, session_ttl: int = 3600, signing_secret: Optional[bytes] = None):
+        """
+        Initialize resolvers with system components
+        
+        Args:
+            session_ttl: Lifetime of issued COMBSEC session keys in seconds
+            signing_secret: Secret for signing session keys; every node that
+                verifies keys needs the same one (defaults to the
+                COMBSEC_SIGNING_SECRET environment variable). Keys are only
+                issued and verified when a secret is configured.
+        """
+        self.combsec_generator = get_generator() if get_generator else None
+        self.session_ttl = session_ttl
+        self.signing_secret = signing_secret
         
     # Query Resolvers
     
@@ -54,16 +69,17 @@ class GraphQLResolvers:
         """Generate a new COMBSEC authentication key"""
         if not self.combsec_generator:
             raise Exception("COMBSEC generator not available")
+        
+        # A per-process fallback secret would make keys unverifiable on other nodes
+        signing_secret = configured_signing_secret(self.signing_secret)
+        if signing_secret is None:
+            raise Exception(f"COMBSEC signing secret not configured; pass signing_secret or set {SIGNING_SECRET_ENV}")
             
         try:
-            session_key = self.combsec_generator.generate_combsec_key()
-            
-            # Store session for validation
-            self.active_sessions[session_key] = {
-                'firm_id': firm_id,
-                'generated_at': datetime.now().isoformat(),
-                'expires_at': None  # Could add expiration logic
-            }
+            # Signed keys carry their own expiry, so no session is stored
+            generator = get_generator(firm_id, signing_secret)
+            session_key = generator.generate_signed_key(self.session_ttl)
+            expires_at = generator.check_key(session_key).datetime
             
             return {
                 'id': f"combsec_{firm_id}_{int(datetime.now().timestamp())}",
@@ -71,14 +87,19 @@ class GraphQLResolvers:
                 'truncated_key': session_key[:20] + "..." if len(session_key) > 20 else session_key,
                 'verified': True,
                 'generated_at': datetime.now().isoformat(),
-                'expires_at': None
+                'expires_at': expires_at
             }
         except Exception as e:
             raise Exception(f"Failed to generate COMBSEC key: {str(e)}")
     
     def validate_combsec_key(self, info, session_key: str) -> bool:
-        """Validate a COMBSEC session key"""
-        return session_key in self.active_sessions
+        """Validate a COMBSEC session key by its signature and expiry"""
+        if not verify_signed_key_u1f310:
+            return False
+        signing_secret = configured_signing_secret(self.signing_secret)
+        if signing_secret is None:
+            return False
+        return verify_signed_key_u1f310(session_key, signing_secret).valid
     
     def extract_notebook_metrics(self, info, notebook_path: str) -> Dict[str, Any]:
         """Extract research metrics from a Jupyter notebook"""
@@ -272,9 +293,9 @@ class GraphQLResolvers:
     
     def refresh_combsec_key(self, info, current_key: str, firm_id: str) -> Dict[str, Any]:
         """Refresh an existing COMBSEC key"""
-        if current_key in self.active_sessions:
-            # Remove old session
-            del self.active_sessions[current_key]
+        # Signed keys are stateless: the old key stays valid until it expires
+        if not self.validate_combsec_key(info, current_key):
+            raise Exception("Invalid COMBSEC key")
         
         # Generate new key
         return self.generate_combsec_key(info, firm_id)
@@ -14,9 +14,19 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+# Repo-root imports: the ACTNEWWORLDODOR package and the backtest engine
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Import ACTNEWWORLDODOR COMBSEC system
-sys.path.append('../ACTNEWWORLDODOR')
-from emoji_combsec_generator import EmojiCombsecGenerator
+from ACTNEWWORLDODOR.emoji_combsec_generator import get_generator
+
+# Walk-forward backtests for measured results (optional)
+try:
+    from walk_forward_backtest import walk_forward_backtest
+    WALK_FORWARD_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️  Walk-forward backtests unavailable, backtest figures will be illustrative: {e}")
+    WALK_FORWARD_AVAILABLE = False
 
 
 @dataclass
@@ -43,6 +53,7 @@ class BacktestResult:
     avg_trade_duration: str
     risk_adjusted_return: float
     peer_review_validation: bool
+    measured: bool = False
 
 
 class NotionPageGenerator:
@@ -54,7 +65,7 @@ class NotionPageGenerator:
     def __init__(self, firm_id: str = "QXR"):
         """Initialize the Notion page generator with COMBSEC authentication"""
         self.firm_id = firm_id
-        self.combsec_generator = EmojiCombsecGenerator(firm_id)
+        self.combsec_generator = get_generator(firm_id)
         self.session_key = self.combsec_generator.generate_combsec_key()
         
         # NEWWORLDODOR context initialization
@@ -143,6 +154,16 @@ class NotionPageGenerator:
     
     def _create_backtest_results(self, research_data: Dict) -> BacktestResult:
         """Create structured backtest results from research data"""
+        # Measured walk-forward results when the research data carries prices
+        if research_data.get('prices') is not None:
+            if not WALK_FORWARD_AVAILABLE:
+                print("⚠️  Prices given but walk-forward backtests are unavailable")
+            else:
+                measured = self._measure_backtest_results(research_data)
+                if measured is not None:
+                    return measured
+        print("⚠️  No measured backtest; reporting illustrative figures")
+        
         # Extract metrics and simulate professional backtest results
         signals = research_data.get('signals', 45)
         opportunities = research_data.get('opportunities', 8)
@@ -167,6 +188,36 @@ class NotionPageGenerator:
             peer_review_validation=True
         )
     
+    def _measure_backtest_results(self, research_data: Dict) -> Optional[BacktestResult]:
+        """
+        Walk-forward backtest of research_data['prices']
+        
+        Keyword overrides for walk_forward_backtest can be passed in
+        research_data['backtest_params']. Returns None if the backtest
+        cannot run (e.g. too few prices), so the caller can fall back.
+        """
+        results = walk_forward_backtest(research_data['prices'], **research_data.get('backtest_params', {}))
+        if 'error' in results:
+            print(f"⚠️  Walk-forward backtest unavailable: {results['error']}")
+            return None
+        
+        summary = results['summary']
+        total_return = summary['total_return'] * 100
+        max_drawdown = summary['max_drawdown'] * 100
+        
+        return BacktestResult(
+            strategy_name=research_data.get('strategy', "ETH Statistical Arbitrage"),
+            total_return=total_return,
+            sharpe_ratio=summary['sharpe_ratio'],
+            max_drawdown=max_drawdown,
+            win_rate=summary['win_rate'],
+            total_trades=summary['total_trades'],
+            avg_trade_duration=f"{summary['avg_holding_periods']:.1f} periods",
+            risk_adjusted_return=total_return / max_drawdown if max_drawdown > 0 else 0.0,
+            peer_review_validation=True,
+            measured=True
+        )
+    
     def _create_landing_page_template(self, backtest_results: BacktestResult, research_data: Dict) -> NotionPageTemplate:
         """Create the comprehensive landing page template"""
         
@@ -277,9 +328,15 @@ class NotionPageGenerator:
             ['Win Rate', f'{backtest_results.win_rate:.1%}', '>60% (Industry Standard)'],
             ['Total Trades', f'{backtest_results.total_trades}', 'Monthly Frequency'],
             ['Avg Duration', backtest_results.avg_trade_duration, 'Intraday Focus'],
-            ['Risk-Adj Return', f'{backtest_results.risk_adjusted_return:.2f}', '>2.0 (Preferred)']
+            ['Risk-Adj Return', f'{backtest_results.risk_adjusted_return:.2f}', '>2.0 (Preferred)'],
+            ['Source', self._results_source(backtest_results), 'Out-of-Sample Folds']
         ]
     
+    @staticmethod
+    def _results_source(backtest_results: BacktestResult) -> str:
+        """Where the backtest figures come from"""
+        return 'Walk-forward backtest' if backtest_results.measured else 'Illustrative (not measured)'
+    
     def _generate_allocator_table(self) -> List[List[str]]:
         """Generate allocator access control table"""
         table_data = [['Allocator', 'Role', 'Permissions', 'COMBSEC Verified']]
@@ -377,6 +434,7 @@ class NotionPageGenerator:
 | Total Trades | {backtest_results.total_trades} | Monthly Frequency |
 | Avg Duration | {backtest_results.avg_trade_duration} | Intraday Focus |
 | Risk-Adj Return | {backtest_results.risk_adjusted_return:.2f} | >2.0 (Preferred) |
+| Source | {self._results_source(backtest_results)} | Out-of-Sample Folds |
 
 ## 🔬 Peer-Reviewed Validation
 
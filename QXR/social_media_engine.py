@@ -18,9 +18,9 @@ from dataclasses import dataclass
 import requests
 from urllib.parse import urlencode
 
-# Import ACTNEWWORLDODOR COMBSEC system
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ACTNEWWORLDODOR'))
-from emoji_combsec_generator import EmojiCombsecGenerator
+# Import ACTNEWWORLDODOR COMBSEC system through the package from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ACTNEWWORLDODOR.emoji_combsec_generator import get_generator
 
 # Import Notion page generation functionality
 from notion_page_generator import NotionPageGenerator
@@ -59,7 +59,7 @@ class SocialMediaEngine:
     def __init__(self, firm_id: str = "QXR"):
         """Initialize the social media engine with COMBSEC authentication"""
         self.firm_id = firm_id
-        self.combsec_generator = EmojiCombsecGenerator(firm_id)
+        self.combsec_generator = get_generator(firm_id)
         self.session_key = self.combsec_generator.generate_combsec_key()
         
         # Initialize Notion page generator for comprehensive webpage publishing
@@ -19,6 +19,7 @@ import json
 import os
 import sys
 from datetime import datetime
+from unittest import mock
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -35,7 +36,7 @@ class TestGraphQLResolvers(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures"""
-        self.resolvers = GraphQLResolvers()
+        self.resolvers = GraphQLResolvers(signing_secret=b"test-secret")
         self.sample_research_data = {
             'signals': 45,
             'opportunities': 8,
@@ -77,6 +78,42 @@ class TestGraphQLResolvers(unittest.TestCase):
         is_invalid = self.resolvers.validate_combsec_key(None, "invalid_key")
         self.assertFalse(is_invalid)
     
+    def test_combsec_key_validation_is_stateless(self):
+        """Test that signed session keys verify on another node and expire"""
+        issuer = GraphQLResolvers(session_ttl=60, signing_secret=b"shared-secret")
+        other_node = GraphQLResolvers(signing_secret=b"shared-secret")
+        session_key = issuer.generate_combsec_key(None, self.sample_firm_id)['session_key']
+        
+        self.assertTrue(other_node.validate_combsec_key(None, session_key))
+        self.assertFalse(GraphQLResolvers(signing_secret=b"other").validate_combsec_key(None, session_key))
+        
+        # A format-valid key that was never signed is rejected
+        unsigned = issuer.combsec_generator.generate_combsec_key()
+        self.assertFalse(other_node.validate_combsec_key(None, unsigned))
+        
+        expired = GraphQLResolvers(session_ttl=-1, signing_secret=b"shared-secret")
+        expired_key = expired.generate_combsec_key(None, self.sample_firm_id)['session_key']
+        self.assertFalse(other_node.validate_combsec_key(None, expired_key))
+        
+        # Client input with a non-hex signature is rejected, not raised
+        tampered = session_key[:2] + "ÄÖÜ" + session_key[5:]
+        self.assertFalse(other_node.validate_combsec_key(None, tampered))
+        with self.assertRaises(Exception):
+            other_node.refresh_combsec_key(None, tampered, self.sample_firm_id)
+    
+    def test_combsec_keys_require_signing_secret(self):
+        """Test that keys are not issued with an unconfigured signing secret"""
+        with mock.patch.dict(os.environ):
+            os.environ.pop("COMBSEC_SIGNING_SECRET", None)
+            unconfigured = GraphQLResolvers()
+            with self.assertRaisesRegex(Exception, "signing secret not configured"):
+                unconfigured.generate_combsec_key(None, self.sample_firm_id)
+            self.assertFalse(unconfigured.validate_combsec_key(None, "invalid_key"))
+            
+            os.environ["COMBSEC_SIGNING_SECRET"] = "env-secret"
+            session_key = unconfigured.generate_combsec_key(None, self.sample_firm_id)['session_key']
+            self.assertTrue(GraphQLResolvers(signing_secret=b"env-secret").validate_combsec_key(None, session_key))
+    
     def test_backtest_results_generation(self):
         """Test backtest results generation"""
         result = self.resolvers.get_backtest_results(None, self.sample_research_data)
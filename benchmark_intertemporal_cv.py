@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness for the Intertemporal Differentials Analysis Module
+
+Times each stage of IntertemporalAnalyzer.analyze_temporal_diffs
+(temporal differentials, cross-validation, parody detection, volatility
+clustering) separately over a grid of row counts, column counts and CV
+methods, records peak traced memory per stage and writes the results as
+JSON so runs from different commits can be compared.
+
+Usage:
+    python benchmark_intertemporal_cv.py --rows 1000 10000 --columns 4 16
+    python benchmark_intertemporal_cv.py --compare baseline.json current.json
+    python benchmark_intertemporal_cv.py --import-time --import-budget 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add the repository root to path
+repo_root = Path(__file__).parent
+sys.path.insert(0, str(repo_root))
+
+from intertemporal_cv import IntertemporalAnalyzer, create_sample_financial_data
+
+
+STAGES = ['differentials', 'cv', 'parody', 'volatility']
+DEFAULT_ROWS = [1_000, 10_000, 50_000]
+DEFAULT_COLUMNS = [4]
+DEFAULT_CV_METHODS = ['time_series', 'expanding_window', 'blocked']
+IMPORT_BUDGET_SECONDS = 1.0
+HEAVY_MODULES = ['pandas', 'sklearn', 'statsmodels', 'pyarrow']
+
+_IMPORT_PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))\n"
+)
+
+
+def build_benchmark_frame(n_rows: int, n_columns: int) -> pd.DataFrame:
+    """
+    Build a benchmark frame from create_sample_financial_data
+
+    The sample frame provides price, volume, returns and a text column;
+    further numeric columns are added as seeded random walks until the
+    frame has ``n_columns`` numeric columns.
+
+    Args:
+        n_rows: Number of rows
+        n_columns: Number of numeric columns (at least 3)
+
+    Returns:
+        Benchmark DataFrame
+    """
+    df = create_sample_financial_data(n_rows, freq='min')
+    extra = max(0, n_columns - 3)
+    if extra:
+        rng = np.random.default_rng(42)
+        walks = 100 + rng.normal(0, 1, size=(n_rows, extra)).cumsum(axis=0)
+        features = pd.DataFrame(walks, index=df.index, columns=[f'feature_{i}' for i in range(extra)])
+        df = pd.concat([df, features], axis=1)
+    return df
+
+
+def _stage_calls(analyzer: IntertemporalAnalyzer, df: pd.DataFrame, cv_method: str) -> Dict[str, Callable[[], Any]]:
+    """The analyze_temporal_diffs stages as independent zero-argument calls"""
+    return {
+        'differentials': lambda: analyzer._calculate_temporal_differentials(df),
+        'cv': lambda: analyzer._perform_cross_validation(df, cv_method, 'price'),
+        'parody': lambda: analyzer._detect_parody_patterns(df),
+        'volatility': lambda: analyzer._analyze_volatility_clustering(df['price'])
+    }
+
+
+def _measure(call: Callable[[], Any], repeat: int, track_memory: bool) -> Dict[str, Any]:
+    """Best-of-``repeat`` wall time plus (optionally) peak traced memory of one call"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+
+    result = {'seconds': min(timings), 'all_seconds': timings}
+
+    if track_memory:
+        tracemalloc.start()
+        try:
+            call()
+            result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result
+
+
+def run_benchmark(rows: List[int] = None,
+                  columns: List[int] = None,
+                  cv_methods: List[str] = None,
+                  repeat: int = 3,
+                  track_memory: bool = True) -> Dict[str, Any]:
+    """
+    Run the benchmark grid
+
+    Args:
+        rows: Row counts to benchmark
+        columns: Numeric column counts to benchmark
+        cv_methods: CV methods to benchmark
+        repeat: Timing repetitions per stage (best time is reported)
+        track_memory: Record peak traced memory per stage
+
+    Returns:
+        Machine-readable benchmark report
+    """
+    rows = rows or DEFAULT_ROWS
+    columns = columns or DEFAULT_COLUMNS
+    cv_methods = cv_methods or DEFAULT_CV_METHODS
+
+    report = {
+        'metadata': _environment_metadata(),
+        'config': {
+            'rows': rows,
+            'columns': columns,
+            'cv_methods': cv_methods,
+            'repeat': repeat,
+            'track_memory': track_memory
+        },
+        'results': []
+    }
+
+    analyzer = IntertemporalAnalyzer(firm_id="BENCHMARK")
+
+    for n_rows in rows:
+        for n_columns in columns:
+            try:
+                df = build_benchmark_frame(n_rows, n_columns)
+            except Exception as e:
+                for cv_method in cv_methods:
+                    report['results'].append({
+                        'rows': n_rows, 'columns': n_columns, 'cv_method': cv_method,
+                        'error': f"Data generation failed: {str(e)}"
+                    })
+                continue
+
+            for cv_method in cv_methods:
+                entry = {'rows': n_rows, 'columns': n_columns, 'cv_method': cv_method, 'stages': {}}
+                print(f"⏱️  rows={n_rows} columns={n_columns} cv_method={cv_method}")
+
+                for stage, call in _stage_calls(analyzer, df, cv_method).items():
+                    # Only the CV stage depends on the method; reuse the others
+                    previous = _find_stage(report['results'], n_rows, n_columns, stage)
+                    if stage != 'cv' and previous is not None:
+                        entry['stages'][stage] = previous
+                        continue
+                    try:
+                        with warnings.catch_warnings():
+                            warnings.simplefilter('ignore')
+                            entry['stages'][stage] = _measure(call, repeat, track_memory)
+                    except Exception as e:
+                        entry['stages'][stage] = {'error': str(e)}
+
+                entry['total_seconds'] = sum(
+                    stage_result.get('seconds', 0.0) for stage_result in entry['stages'].values()
+                )
+                report['results'].append(entry)
+
+    return report
+
+
+def measure_import_time(module: str = 'intertemporal_cv', repeat: int = 5) -> Dict[str, Any]:
+    """
+    Time a cold import of ``module`` in fresh interpreters
+    
+    Args:
+        module: Module to import
+        repeat: Number of fresh interpreters (best time is reported)
+        
+    Returns:
+        Best and all import times plus the heavy modules the import pulled in
+    """
+    probe = _IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-c', probe], cwd=repo_root,
+            capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    
+    return {
+        'module': module,
+        'seconds': min(run['seconds'] for run in runs),
+        'all_seconds': [run['seconds'] for run in runs],
+        'heavy_modules_loaded': runs[0]['loaded']
+    }
+
+
+def _find_stage(results: List[Dict[str, Any]], n_rows: int, n_columns: int, stage: str) -> Optional[Dict[str, Any]]:
+    """Previously measured result for a method-independent stage"""
+    for entry in results:
+        if entry['rows'] == n_rows and entry['columns'] == n_columns and stage in entry.get('stages', {}):
+            return entry['stages'][stage]
+    return None
+
+
+def _environment_metadata() -> Dict[str, Any]:
+    """Commit, interpreter and library versions for the report header"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=repo_root,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 1.2) -> List[Dict[str, Any]]:
+    """
+    Compare stage timings of two benchmark reports
+
+    Args:
+        baseline: Earlier report
+        current: Later report
+        threshold: Slowdown ratio above which a stage counts as a regression
+
+    Returns:
+        One row per (rows, columns, cv_method, stage) present in both reports
+    """
+    def index(report):
+        return {
+            (entry['rows'], entry['columns'], entry['cv_method'], stage): stage_result['seconds']
+            for entry in report['results']
+            for stage, stage_result in entry.get('stages', {}).items()
+            if 'seconds' in stage_result
+        }
+
+    before, after = index(baseline), index(current)
+    comparison = []
+    for key in sorted(set(before) & set(after)):
+        ratio = after[key] / before[key] if before[key] > 0 else float('inf')
+        comparison.append({
+            'rows': key[0], 'columns': key[1], 'cv_method': key[2], 'stage': key[3],
+            'baseline_seconds': before[key],
+            'current_seconds': after[key],
+            'ratio': ratio,
+            'regression': ratio > threshold
+        })
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark IntertemporalAnalyzer stages")
+    parser.add_argument('--rows', type=lambda v: int(float(v)), nargs='+', default=DEFAULT_ROWS,
+                        help="Row counts, e.g. 1e3 1e5 1e7")
+    parser.add_argument('--columns', type=int, nargs='+', default=DEFAULT_COLUMNS,
+                        help="Numeric column counts")
+    parser.add_argument('--cv-methods', nargs='+', default=DEFAULT_CV_METHODS,
+                        help="CV methods to benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing repetitions per stage")
+    parser.add_argument('--no-memory', action='store_true', help="Skip peak memory tracking")
+    parser.add_argument('--output', default=None, help="JSON output path")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="Compare two JSON reports instead of running")
+    parser.add_argument('--threshold', type=float, default=1.2, help="Regression ratio threshold")
+    parser.add_argument('--import-time', action='store_true',
+                        help="Only measure the cold import time against --import-budget")
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET_SECONDS,
+                        help="Cold import budget in seconds")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        comparison = compare_reports(baseline, current, args.threshold)
+        for row in comparison:
+            flag = "❌" if row['regression'] else "✅"
+            print(f"{flag} rows={row['rows']} columns={row['columns']} {row['cv_method']:<16} "
+                  f"{row['stage']:<13} {row['baseline_seconds']:.4f}s -> {row['current_seconds']:.4f}s "
+                  f"(x{row['ratio']:.2f})")
+        return 1 if any(row['regression'] for row in comparison) else 0
+
+    if args.import_time:
+        result = measure_import_time(repeat=args.repeat)
+        within_budget = result['seconds'] <= args.import_budget
+        flag = "✅" if within_budget else "❌"
+        print(f"{flag} import {result['module']}: {result['seconds']:.4f}s (budget {args.import_budget:.2f}s)")
+        print(f"   Heavy modules loaded: {', '.join(result['heavy_modules_loaded']) or 'none'}")
+        return 0 if within_budget else 1
+    
+    print("🏁 IntertemporalAnalyzer Benchmark")
+    print("=" * 60)
+    report = run_benchmark(args.rows, args.columns, args.cv_methods, args.repeat, not args.no_memory)
+
+    output = args.output or f"benchmark_intertemporal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+
+    print(f"\n📁 Benchmark report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
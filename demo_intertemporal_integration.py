@@ -169,6 +169,7 @@ def demonstrate_qxr_integration(analysis_results, demo_data):
         'signal_strength': best_results.get('cv_analysis', {}).get('performance_metrics', {}).get('out_of_sample_accuracy', 0.5),
         'price_range': [demo_data['price'].min(), demo_data['price'].max()],
         'max_liquidity': demo_data['volume'].max(),
+        'prices': demo_data['price'],
         'strategy': 'Intertemporal Differentials Analysis',
         'timeframe': '24h',
         'combsec_key': best_results.get('security_key', '')
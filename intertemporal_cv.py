@@ -10,46 +10,633 @@ collaboration transparency project.
 Hash Reference: 277828ff6bf7804a83d2e307eafcaa09
 """
 
-import pandas as pd
+from __future__ import annotations
+
 import numpy as np
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
+from dataclasses import dataclass, field, replace
+from contextlib import contextmanager
+import functools
+import logging
+import time
+import tracemalloc
 import warnings
+import re
+import gzip
+import hashlib
+import importlib
+import itertools
+import json
+import importlib.util
+import pickle
+import threading
+from collections import OrderedDict
 from pathlib import Path
-import sys
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+
+class _LazyModule:
+    """
+    Stand-in for a heavy module, imported on first attribute access
+    
+    On import the real module replaces the stand-in in this module's
+    globals, so later lookups cost nothing extra.
+    """
+    
+    def __init__(self, module_name: str, alias: str):
+        self._module_name = module_name
+        self._alias = alias
+    
+    def __getattr__(self, attr: str) -> Any:
+        module = importlib.import_module(self._module_name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
 
-# Add ACTNEWWORLDODOR to path for COMBSEC integration
-current_dir = Path(__file__).parent
-actnewworld_dir = current_dir / "ACTNEWWORLDODOR"
-sys.path.insert(0, str(actnewworld_dir))
+def _module_available(module_name: str) -> bool:
+    """Whether a top-level module is installed, without importing it"""
+    return importlib.util.find_spec(module_name) is not None
+
+
+# Silent unless the application configures logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Heavy dependencies load on first use of the stage that needs them
+pd = _LazyModule('pandas', 'pd')
 
 try:
-    from emoji_combsec_generator import EmojiCombsecGenerator
+    from ACTNEWWORLDODOR.emoji_combsec_generator import get_generator
     COMBSEC_AVAILABLE = True
 except ImportError:
     COMBSEC_AVAILABLE = False
     warnings.warn("COMBSEC integration not available", UserWarning)
 
 # Conditional imports for optional dependencies
-try:
-    from sklearn.model_selection import TimeSeriesSplit, train_test_split
-    from sklearn.metrics import mean_squared_error, accuracy_score
-    from sklearn.linear_model import LinearRegression
-    from sklearn.ensemble import RandomForestRegressor
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+SKLEARN_AVAILABLE = _module_available('sklearn')
+if not SKLEARN_AVAILABLE:
     warnings.warn("scikit-learn not available, limited functionality", UserWarning)
 
-try:
-    import statsmodels.api as sm
-    from statsmodels.tsa.stattools import adfuller
-    from statsmodels.stats.diagnostic import het_breuschpagan
-    STATSMODELS_AVAILABLE = True
-except ImportError:
-    STATSMODELS_AVAILABLE = False
+PYARROW_AVAILABLE = _module_available('pyarrow')
+if PYARROW_AVAILABLE:
+    pa = _LazyModule('pyarrow', 'pa')
+    pq = _LazyModule('pyarrow.parquet', 'pq')
+    pa_ipc = _LazyModule('pyarrow.ipc', 'pa_ipc')
+
+STATSMODELS_AVAILABLE = _module_available('statsmodels')
+if not STATSMODELS_AVAILABLE:
     warnings.warn("statsmodels not available, limited functionality", UserWarning)
 
+from intertemporal_kernels import (
+    grouped_lag_correlations,
+    lag_matrix,
+    rolling_moments,
+    select_columns,
+    series_kernels
+)
+
+_LAZY_IMPORTS = {
+    'TimeSeriesSplit': 'sklearn.model_selection',
+    'mean_squared_error': 'sklearn.metrics',
+    'LinearRegression': 'sklearn.linear_model',
+    'RandomForestRegressor': 'sklearn.ensemble',
+    'clone': 'sklearn.base',
+    'adfuller': 'statsmodels.tsa.stattools'
+}
+
+
+def _require(*names: str):
+    """Bind the named optional-dependency objects into module globals on first use"""
+    module_globals = globals()
+    for name in names:
+        if name not in module_globals:
+            module_globals[name] = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+
+
+@dataclass
+class StreamingState:
+    """
+    Running state behind IntertemporalAnalyzer.update()
+    
+    Holds only fixed-size summaries: Welford/Chan moments for temporal
+    deltas, lag co-moments per (lag, column), rolling volatility moments of
+    the target column, parody counts and a tail of the last ``max_lag`` rows
+    to carry lag pairs and deltas across batch boundaries.
+    """
+    columns: List[str]
+    target_column: Optional[str]
+    max_lag: int
+    volatility_window: int
+    rows_seen: int = 0
+    value_counts: np.ndarray = None
+    tail: np.ndarray = None
+    delta_moments: Dict[str, np.ndarray] = None
+    lag_moments: Dict[str, np.ndarray] = None
+    last_price: float = np.nan
+    return_tail: np.ndarray = None
+    volatility_moments: Dict[str, np.ndarray] = None
+    parody_counts: Dict[str, int] = field(default_factory=dict)
+    text_counts: Dict[str, int] = field(default_factory=dict)
+    total_parody_indicators: int = 0
+    total_text_entries: int = 0
+
+
+def _empty_moments(shape) -> Dict[str, np.ndarray]:
+    """Zeroed univariate moment accumulator (count, mean, M2, min, max)"""
+    return {
+        'count': np.zeros(shape),
+        'mean': np.zeros(shape),
+        'm2': np.zeros(shape),
+        'min': np.full(shape, np.inf),
+        'max': np.full(shape, -np.inf)
+    }
+
+
+def _batch_moments(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Univariate moments of a batch along axis 0, ignoring NaN"""
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(valid, values, 0.0).sum(axis=0) / count
+    mean = np.where(count > 0, mean, 0.0)
+    m2 = np.where(valid, (values - mean) ** 2, 0.0).sum(axis=0)
+    return {
+        'count': count,
+        'mean': mean,
+        'm2': m2,
+        'min': np.where(valid, values, np.inf).min(axis=0, initial=np.inf),
+        'max': np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf)
+    }
+
+
+def _merge_moments(acc: Dict[str, np.ndarray], batch: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Combine two moment accumulators (Chan et al. parallel update)"""
+    count = acc['count'] + batch['count']
+    safe = np.where(count > 0, count, 1.0)
+    delta = batch['mean'] - acc['mean']
+    return {
+        'count': count,
+        'mean': acc['mean'] + delta * batch['count'] / safe,
+        'm2': acc['m2'] + batch['m2'] + delta ** 2 * acc['count'] * batch['count'] / safe,
+        'min': np.minimum(acc['min'], batch['min']),
+        'max': np.maximum(acc['max'], batch['max'])
+    }
+
+
+def _empty_comoments(shape) -> Dict[str, np.ndarray]:
+    """Zeroed bivariate co-moment accumulator for lag pairs"""
+    return {name: np.zeros(shape) for name in ('count', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'c_xy')}
+
+
+def _batch_comoments(x: np.ndarray, y: np.ndarray) -> Dict[str, np.ndarray]:
+    """Bivariate co-moments of pairwise-complete (x, y) rows along axis 0"""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    count = valid.sum(axis=0).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = np.where(valid, x, 0.0).sum(axis=0) / count
+        mean_y = np.where(valid, y, 0.0).sum(axis=0) / count
+    mean_x = np.where(count > 0, mean_x, 0.0)
+    mean_y = np.where(count > 0, mean_y, 0.0)
+    dx = np.where(valid, x - mean_x, 0.0)
+    dy = np.where(valid, y - mean_y, 0.0)
+    return {
+        'count': count,
+        'mean_x': mean_x,
+        'mean_y': mean_y,
+        'm2_x': (dx * dx).sum(axis=0),
+        'm2_y': (dy * dy).sum(axis=0),
+        'c_xy': (dx * dy).sum(axis=0)
+    }
+
+
+def _merge_comoments(acc: Dict[str, np.ndarray], batch: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Combine two bivariate co-moment accumulators"""
+    count = acc['count'] + batch['count']
+    safe = np.where(count > 0, count, 1.0)
+    weight = acc['count'] * batch['count'] / safe
+    delta_x = batch['mean_x'] - acc['mean_x']
+    delta_y = batch['mean_y'] - acc['mean_y']
+    return {
+        'count': count,
+        'mean_x': acc['mean_x'] + delta_x * batch['count'] / safe,
+        'mean_y': acc['mean_y'] + delta_y * batch['count'] / safe,
+        'm2_x': acc['m2_x'] + batch['m2_x'] + delta_x ** 2 * weight,
+        'm2_y': acc['m2_y'] + batch['m2_y'] + delta_y ** 2 * weight,
+        'c_xy': acc['c_xy'] + batch['c_xy'] + delta_x * delta_y * weight
+    }
+
+
+def frame_fingerprint(df: pd.DataFrame, n_blocks: int = 8, block_size: int = 1024) -> str:
+    """
+    Cheap content hash of a DataFrame
+    
+    Frames of up to ``n_blocks * block_size`` rows are hashed in full;
+    larger frames are hashed on ``n_blocks`` evenly spaced row blocks
+    (always including the first and last rows), index included, plus the
+    frame's shape, column names and dtypes. Edits confined to unsampled
+    rows of a large frame are therefore not detected.
+    
+    Args:
+        df: Frame to fingerprint
+        n_blocks: Number of sampled row blocks for large frames
+        block_size: Rows per sampled block
+        
+    Returns:
+        Hex digest identifying the frame's content
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((df.shape, list(map(str, df.columns)), list(map(str, df.dtypes)))).encode('utf-8'))
+    
+    n_rows = len(df)
+    if n_rows <= n_blocks * block_size:
+        sample = df
+    else:
+        starts = np.linspace(0, n_rows - block_size, n_blocks).astype(np.int64)
+        rows = (starts[:, None] + np.arange(block_size)).ravel()
+        sample = df.iloc[rows]
+    digest.update(pd.util.hash_pandas_object(sample, index=True).to_numpy().tobytes())
+    
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache for analysis results with an optional on-disk store
+    
+    Entries live in memory up to ``max_entries`` (least recently used
+    evicted first). With ``cache_dir`` every entry is also pickled to disk,
+    so results survive the process and are shared between analyzers
+    pointing at the same directory.
+    
+    Values are held as pickled snapshots and every get() returns a fresh
+    copy, so callers can mutate what they put or got without corrupting
+    later hits.
+    """
+    
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[Union[str, Path]] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Digest of the repr of the key parts"""
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Fresh copy of the cached value for ``key`` or None"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if payload is not None:
+            return pickle.loads(payload)
+        
+        if self.cache_dir is not None and self._path(key).exists():
+            try:
+                with open(self._path(key), 'rb') as f:
+                    payload = f.read()
+                value = pickle.loads(payload)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                value = None
+            if value is not None:
+                self._remember(key, payload)
+                with self._lock:
+                    self.hits += 1
+                return value
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def put(self, key: str, value: Any):
+        """Store a snapshot of ``value`` under ``key`` in memory and, if configured, on disk"""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, payload)
+        
+        if self.cache_dir is not None:
+            # Write-then-rename so concurrent readers never see partial files
+            tmp_path = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(key))
+    
+    def _remember(self, key: str, payload: bytes):
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(self.max_entries, 0):
+                self._entries.popitem(last=False)
+    
+    def clear(self, disk: bool = False):
+        """Drop the in-memory entries (and the on-disk store if ``disk``)"""
+        with self._lock:
+            self._entries.clear()
+        if disk and self.cache_dir is not None:
+            for path in self.cache_dir.glob('*.pkl'):
+                path.unlink()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ParodyMatcher:
+    """
+    Compiled multi-pattern matcher for parody markers
+    
+    Builds an Aho-Corasick automaton over the (lower-cased) markers so a
+    string is scanned once regardless of dictionary size, plus an
+    equivalent trie-shaped regex used as a C-level prefilter by the
+    vectorized pandas path. When several markers occur in a text the one
+    listed first wins, matching a sequential ``marker in text`` scan.
+    """
+    
+    def __init__(self, markers: List[str]):
+        """
+        Compile the marker dictionary
+        
+        Args:
+            markers: Marker strings in precedence order (matched case-insensitively)
+        """
+        self.markers = list(markers)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[int] = [len(self.markers)]
+        
+        for idx, marker in enumerate(self.markers):
+            state = 0
+            for ch in marker.lower():
+                if ch not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(len(self.markers))
+                    self._goto[state][ch] = len(self._goto) - 1
+                state = self._goto[state][ch]
+            self._best[state] = min(self._best[state], idx)
+        
+        # Breadth-first failure links; each state inherits the best
+        # (lowest-index) marker reachable through its suffix chain
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._best[state] = min(self._best[state], self._best[0])
+        for state in queue:
+            for ch, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._best[child] = min(self._best[child], self._best[self._fail[child]])
+                queue.append(child)
+        
+        self.pattern = re.compile(self._trie_regex([marker.lower() for marker in self.markers]))
+    
+    @staticmethod
+    def _trie_regex(words: List[str]) -> str:
+        """Regex matching any of ``words``, factored along shared prefixes"""
+        trie: Dict[str, Any] = {}
+        for word in words:
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[''] = True
+        
+        def build(node: Dict[str, Any]) -> str:
+            # A word ending here already matches; longer continuations are redundant
+            if '' in node:
+                return ''
+            alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items())]
+            if len(alternatives) == 1:
+                return alternatives[0]
+            return '(?:' + '|'.join(alternatives) + ')'
+        
+        if not words:
+            return '(?!)'
+        return build(trie)
+    
+    def first_match(self, text: str) -> int:
+        """
+        Index of the highest-precedence marker contained in ``text``
+        
+        Args:
+            text: Text to scan (lower-cased internally)
+            
+        Returns:
+            Marker index, or -1 when no marker occurs
+        """
+        goto, fail, best_out = self._goto, self._fail, self._best
+        best = best_out[0]
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if best_out[state] < best:
+                best = best_out[state]
+                if best == 0:
+                    break
+        return best if best < len(self.markers) else -1
+    
+    def match_series(self, texts: pd.Series) -> np.ndarray:
+        """
+        Vectorized scan of a Series of strings
+        
+        Args:
+            texts: Series containing only strings
+            
+        Returns:
+            Integer array of marker indices (-1 where nothing matched)
+        """
+        result = np.full(len(texts), -1, dtype=np.int64)
+        if len(texts) == 0 or not self.markers:
+            return result
+        
+        lowered = texts.str.lower()
+        hits = lowered.str.contains(self.pattern.pattern, regex=True).to_numpy(dtype=bool)
+        result[hits] = [self.first_match(text) for text in lowered[hits]]
+        return result
+
+
+@dataclass
+class AnalysisResult:
+    """
+    Columnar result of IntertemporalAnalyzer.analyze_temporal_diffs
+    
+    Per-column temporal statistics are held as NumPy arrays aligned with
+    ``columns`` and the lag correlations as a dense (lag x column) matrix,
+    instead of one nested dict per column. ``to_dict()`` returns the
+    nested layout of the default result format; ``to_arrow()`` exposes the
+    arrays as an Arrow table (one row per column) without copying them.
+    """
+    method: str
+    timestamp: str
+    security_key: Optional[str]
+    data_shape: Tuple[int, int]
+    columns: List[str]
+    observation_counts: np.ndarray
+    delta_mean: np.ndarray
+    delta_std: np.ndarray
+    delta_min: np.ndarray
+    delta_max: np.ndarray
+    lags: np.ndarray
+    lag_correlations: np.ndarray
+    cv_analysis: Dict[str, Any]
+    parody_detection: Optional[Dict[str, Any]] = None
+    volatility_analysis: Optional[Dict[str, Any]] = None
+    
+    @property
+    def autocorrelation_matrix(self) -> Dict[str, Any]:
+        """Dense lag x column correlation view (as in the dict result)"""
+        return {'columns': self.columns, 'lags': self.lags, 'matrix': self.lag_correlations}
+    
+    def temporal_differentials(self) -> Dict[str, Any]:
+        """Per-column nested dicts keyed by '{col}_temporal_delta' and '{col}_rolling_correlations'"""
+        return _temporal_differentials_dict(
+            self.columns, self.observation_counts, self.delta_mean, self.delta_std,
+            self.delta_min, self.delta_max, self.lags, self.lag_correlations
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Nested dictionary identical to the default analyze_temporal_diffs result"""
+        results = {
+            'method': self.method,
+            'timestamp': self.timestamp,
+            'security_key': self.security_key,
+            'data_shape': self.data_shape,
+            'analysis_results': {},
+            'temporal_differentials': self.temporal_differentials(),
+            'autocorrelation_matrix': self.autocorrelation_matrix,
+            'cv_analysis': self.cv_analysis
+        }
+        if self.parody_detection is not None:
+            results['parody_detection'] = self.parody_detection
+        if self.volatility_analysis is not None:
+            results['volatility_analysis'] = self.volatility_analysis
+        return results
+    
+    def to_arrow(self):
+        """
+        Arrow table with one row per analyzed column
+        
+        Numeric columns wrap the result arrays without copying; the scalar
+        metadata and the CV/parody/volatility summaries are stored as JSON
+        in the schema metadata.
+        
+        Returns:
+            pyarrow.Table
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow export")
+        
+        arrays = {
+            'column': pa.array([str(c) for c in self.columns], type=pa.string()),
+            'observations': pa.array(np.asarray(self.observation_counts, dtype=np.int64)),
+            'delta_mean': pa.array(self.delta_mean),
+            'delta_std': pa.array(self.delta_std),
+            'delta_min': pa.array(self.delta_min),
+            'delta_max': pa.array(self.delta_max)
+        }
+        lag_correlations = np.ascontiguousarray(self.lag_correlations)
+        for i, k in enumerate(self.lags):
+            arrays[f'lag{int(k)}_corr'] = pa.array(lag_correlations[i])
+        
+        metadata = {
+            'method': self.method,
+            'timestamp': self.timestamp,
+            'security_key': self.security_key,
+            'data_shape': list(self.data_shape),
+            'cv_analysis': self.cv_analysis,
+            'parody_detection': self.parody_detection,
+            'volatility_analysis': self.volatility_analysis
+        }
+        table = pa.table(arrays)
+        return table.replace_schema_metadata({
+            'intertemporal_analysis': json.dumps(metadata, default=_json_default)
+        })
+    
+    def to_parquet(self, path: Union[str, Path], **kwargs) -> Path:
+        """Write ``to_arrow()`` as Parquet; kwargs go to pyarrow.parquet.write_table"""
+        pq.write_table(self.to_arrow(), path, **kwargs)
+        return Path(path)
+    
+    def to_ipc(self, path: Union[str, Path]) -> Path:
+        """Write ``to_arrow()`` as an Arrow IPC (Feather v2) file"""
+        table = self.to_arrow()
+        with pa_ipc.new_file(str(path), table.schema) as writer:
+            writer.write_table(table)
+        return Path(path)
+
+
+def _temporal_differentials_dict(columns: List[str],
+                                 observation_counts: np.ndarray,
+                                 delta_mean: np.ndarray,
+                                 delta_std: np.ndarray,
+                                 delta_min: np.ndarray,
+                                 delta_max: np.ndarray,
+                                 lags: np.ndarray,
+                                 lag_correlations: np.ndarray) -> Dict[str, Any]:
+    """Nested '{col}_temporal_delta' / '{col}_rolling_correlations' dicts from the columnar arrays"""
+    results = {}
+    for j, col in enumerate(columns):
+        if observation_counts[j] > 1:
+            results[f'{col}_temporal_delta'] = {
+                'mean': delta_mean[j],
+                'std': delta_std[j],
+                'min': delta_min[j],
+                'max': delta_max[j],
+                'trend': 'increasing' if delta_mean[j] > 0 else 'decreasing'
+            }
+            
+            # Rolling correlation with lags
+            if observation_counts[j] > 10:
+                results[f'{col}_rolling_correlations'] = [
+                    {'lag': int(k), 'correlation': lag_correlations[i, j]}
+                    for i, k in enumerate(lags)
+                    if not np.isnan(lag_correlations[i, j])
+                ]
+    return results
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for NumPy scalars/arrays in result metadata"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def _instrumented(stage: str, rows_from: str):
+    """
+    Run an analyzer method inside an instrumentation span
+    
+    Args:
+        stage: Stage name reported in the span
+        rows_from: Name of the argument whose length is reported as the row count
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # Fast path: nobody is listening
+            if self.instrumentation is None and not self.logger.isEnabledFor(logging.DEBUG):
+                return method(self, *args, **kwargs)
+            data = args[0] if args else kwargs.get(rows_from)
+            with self._span(stage, rows=getattr(data, 'shape', (None,))[0]):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
 
 class IntertemporalAnalyzer:
     """
@@ -63,37 +650,96 @@ class IntertemporalAnalyzer:
     - COMBSEC security integration
     """
     
-    def __init__(self, security_key: Optional[str] = None, firm_id: str = "YOURFIRM"):
+    def __init__(self,
+                 security_key: Optional[str] = None,
+                 firm_id: str = "YOURFIRM",
+                 parody_markers: Optional[List[str]] = None,
+                 cache_size: int = 0,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 instrumentation: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 track_memory: bool = False):
         """
         Initialize the IntertemporalAnalyzer with COMBSEC security context
         
         Args:
             security_key: Optional COMBSEC key for authentication
             firm_id: Firm identifier for COMBSEC integration
+            parody_markers: Optional marker dictionary replacing the defaults;
+                earlier entries take precedence when several match
+            cache_size: Number of analyze_temporal_diffs results kept in an
+                in-memory LRU cache keyed by data fingerprint and arguments
+                (0 disables caching unless cache_dir is given)
+            cache_dir: Optional directory for an on-disk result store
+            instrumentation: Optional callback receiving one span dict per
+                analysis stage ('stage', 'seconds', 'rows',
+                'memory_delta_bytes' and 'error' on failure); spans are also
+                logged at DEBUG level
+            track_memory: Record the traced-memory change of each span
+                (starts tracemalloc for the span if it is not running)
         """
         self.firm_id = firm_id
         self.security_key = security_key
         self.combsec_generator = None
+        self.instrumentation = instrumentation
+        self.track_memory = track_memory
+        self.logger = logging.getLogger(__name__)
         
         # Initialize COMBSEC if available
         if COMBSEC_AVAILABLE:
-            self.combsec_generator = EmojiCombsecGenerator(firm_id)
+            self.combsec_generator = get_generator(firm_id)
             if not security_key:
                 self.security_key = self.combsec_generator.generate_combsec_key()
         
         # Initialize analysis parameters
         self.cv_results = {}
-        self.parody_markers = [
+        self.autocorrelation_view = None
+        self.stream_state = None
+        self.parody_markers = list(parody_markers) if parody_markers is not None else [
             '#parody', '#satire', '#fake', '#mock', '#joke', '#humor',
             'parody', 'satire', 'fake', 'mock', 'joke', 'not real'
         ]
+        self._parody_matcher = None
+        self._split_cache = OrderedDict()
+        self.result_cache = None
+        if cache_size or cache_dir is not None:
+            self.result_cache = ResultCache(max_entries=cache_size or 128, cache_dir=cache_dir)
         
-        print(f"🌐 IntertemporalAnalyzer initialized")
+        self.logger.info("IntertemporalAnalyzer initialized for firm %s", firm_id)
         if self.security_key:
-            print(f"🔐 COMBSEC Security: {self.security_key[:20]}...")
+            self.logger.debug("COMBSEC Security: %s...", self.security_key[:20])
     
+    @contextmanager
+    def _span(self, stage: str, rows: Optional[int] = None):
+        """Time a block and report it to the instrumentation hook and DEBUG log"""
+        event = {'stage': stage, 'rows': rows, 'seconds': None, 'memory_delta_bytes': None}
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            memory_before = tracemalloc.get_traced_memory()[0]
+        
+        start = time.perf_counter()
+        try:
+            yield event
+        except Exception as e:
+            event['error'] = str(e)
+            raise
+        finally:
+            event['seconds'] = time.perf_counter() - start
+            if self.track_memory:
+                event['memory_delta_bytes'] = tracemalloc.get_traced_memory()[0] - memory_before
+                if started_tracing:
+                    tracemalloc.stop()
+            
+            self.logger.debug("stage=%s seconds=%.6f rows=%s memory_delta_bytes=%s",
+                              stage, event['seconds'], rows, event['memory_delta_bytes'])
+            if self.instrumentation is not None:
+                self.instrumentation(event)
+    
+    @_instrumented('analyze', rows_from='data')
     def analyze_temporal_diffs(self, 
-                             data: Union[pd.DataFrame, Dict],
+                             data: Union[pd.DataFrame, Dict, str, Path, Iterable[pd.DataFrame]],
                              cv_method: str = 'time_series',
                              parody_detection: bool = True,
                              target_column: Optional[str] = None,
@@ -102,24 +748,67 @@ class IntertemporalAnalyzer:
         Perform intertemporal differential analysis with CV and parody detection
         
         Args:
-            data: Input data (DataFrame or dict)
-            cv_method: CV method ('time_series', 'expanding_window', 'blocked')
+            data: Input data (DataFrame or dict), or for out-of-core analysis a
+                CSV/Parquet/Feather path or an iterator of DataFrame chunks
+            cv_method: CV method ('time_series', 'expanding_window', 'blocked',
+                'purged_blocked')
             parody_detection: Enable parody detection
             target_column: Target column for prediction (if applicable)
             **kwargs: Additional parameters
+                max_lag: Largest lag for temporal lag correlations (default 5)
+                n_jobs: Number of CV folds fitted concurrently (default 1)
+                cv_backend: 'thread' or 'process' pool for parallel folds
+                incremental_ols: Closed-form expanding-window OLS (default True)
+                split_params: Overrides for the CV splitter sizes
+                param_grid: Keyword arguments for grid_search_cv (models,
+                    lag_counts, feature_sets, early_stopping, ...); the CV
+                    stage then reports the best candidate plus a leaderboard
+                chunksize: Rows per chunk when reading from a file (default 100000)
+                result_format: 'dict' (default) for nested dictionaries or
+                    'columnar' for an AnalysisResult backed by NumPy arrays
             
         Returns:
-            Dictionary with analysis results
+            Dictionary with analysis results (AnalysisResult for
+            result_format='columnar')
         """
-        print(f"🔍 Starting intertemporal differential analysis...")
-        print(f"   Method: {cv_method}")
-        print(f"   Parody Detection: {parody_detection}")
+        self.logger.info("Starting intertemporal differential analysis (method=%s, parody_detection=%s)",
+                         cv_method, parody_detection)
+        
+        if not isinstance(data, (pd.DataFrame, dict)):
+            return self._analyze_chunked(data, cv_method, parody_detection, target_column, **kwargs)
         
         # Convert data to DataFrame if needed
         if isinstance(data, dict):
-            df = pd.DataFrame(data)
-        else:
-            df = data.copy()
+            data = pd.DataFrame(data)
+        
+        cache_key = None
+        if self.result_cache is not None:
+            # Parallelism settings do not change the results
+            result_kwargs = {k: v for k, v in kwargs.items() if k not in ('n_jobs', 'cv_backend')}
+            try:
+                cache_key = ResultCache.make_key(
+                    frame_fingerprint(data), cv_method, parody_detection, target_column,
+                    sorted(result_kwargs.items()), self.parody_markers
+                )
+            except TypeError as e:
+                # Unhashable object cells (lists, dicts, ...) cannot be fingerprinted
+                self.logger.debug("Result cache skipped: %s", e)
+            cached = self.result_cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                # The cache returns a private copy; stamp it for this call
+                security_key = self.security_key[:20] + "..." if self.security_key else None
+                timestamp = datetime.now().isoformat()
+                if isinstance(cached, AnalysisResult):
+                    results = replace(cached, security_key=security_key, timestamp=timestamp)
+                    self.autocorrelation_view = results.autocorrelation_matrix
+                else:
+                    results = dict(cached, security_key=security_key, timestamp=timestamp)
+                    self.autocorrelation_view = results.get('autocorrelation_matrix')
+                self.cv_results = results
+                self.logger.info("Intertemporal differential analysis complete (cached)")
+                return results
+        
+        df = data.copy()
         
         # Ensure we have a datetime index
         if not isinstance(df.index, pd.DatetimeIndex):
@@ -131,81 +820,597 @@ class IntertemporalAnalyzer:
                 # Create synthetic timestamps
                 df.index = pd.date_range(start='2020-01-01', periods=len(df), freq='D')
         
-        results = {
-            'method': cv_method,
-            'timestamp': datetime.now().isoformat(),
-            'security_key': self.security_key[:20] + "..." if self.security_key else None,
-            'data_shape': df.shape,
-            'analysis_results': {}
-        }
+        timestamp = datetime.now().isoformat()
+        max_lag = kwargs.get('max_lag', 5)
+        
+        # One kernel pass feeds both the differential and volatility stages
+        numeric_df = df.select_dtypes(include=[np.number])
+        kernels = self._series_kernels(numeric_df, max_lag=self._lag_count(df, max_lag))
         
         # Perform intertemporal differential calculations
-        temporal_diffs = self._calculate_temporal_differentials(df)
-        results['temporal_differentials'] = temporal_diffs
+        differentials = self._temporal_differential_arrays(df, max_lag=max_lag, kernels=kernels)
         
         # Perform cross-validation analysis
-        cv_results = self._perform_cross_validation(df, cv_method, target_column)
-        results['cv_analysis'] = cv_results
+        cv_results = self._perform_cross_validation(
+            df, cv_method, target_column,
+            n_jobs=kwargs.get('n_jobs', 1),
+            cv_backend=kwargs.get('cv_backend', 'thread'),
+            incremental_ols=kwargs.get('incremental_ols', True),
+            split_params=kwargs.get('split_params'),
+            param_grid=kwargs.get('param_grid')
+        )
         
         # Perform parody detection if enabled
-        if parody_detection:
-            parody_results = self._detect_parody_patterns(df)
-            results['parody_detection'] = parody_results
+        parody_results = self._detect_parody_patterns(df) if parody_detection else None
         
         # Add volatility clustering analysis if statsmodels available
+        volatility_results = None
         if STATSMODELS_AVAILABLE and target_column and target_column in df.columns:
-            volatility_results = self._analyze_volatility_clustering(df[target_column])
-            results['volatility_analysis'] = volatility_results
+            target_kernels = None
+            if target_column in numeric_df.columns:
+                target_kernels = select_columns(kernels, [numeric_df.columns.get_loc(target_column)])
+            volatility_results = self._analyze_volatility_clustering(df[target_column], kernels=target_kernels)
+        
+        results = AnalysisResult(
+            method=cv_method,
+            timestamp=timestamp,
+            security_key=self.security_key[:20] + "..." if self.security_key else None,
+            data_shape=df.shape,
+            cv_analysis=cv_results,
+            parody_detection=parody_results,
+            volatility_analysis=volatility_results,
+            **differentials
+        )
+        if kwargs.get('result_format', 'dict') != 'columnar':
+            results = results.to_dict()
         
         # Store results for future reference
         self.cv_results = results
+        if cache_key is not None:
+            self.result_cache.put(cache_key, results)
         
-        print("✅ Intertemporal differential analysis complete")
+        self.logger.info("Intertemporal differential analysis complete")
         return results
     
-    def _calculate_temporal_differentials(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Calculate intertemporal differential metrics"""
-        print("   📊 Calculating temporal differentials...")
+    def _analyze_chunked(self,
+                         source: Union[str, Path, Iterable[pd.DataFrame]],
+                         cv_method: str,
+                         parody_detection: bool,
+                         target_column: Optional[str],
+                         **kwargs) -> Dict[str, Any]:
+        """
+        Out-of-core analysis: stream chunks through the update() engine
         
-        results = {}
+        Memory is bounded by the chunk size; temporal deltas, lag
+        correlations, rolling volatility and parody counts carry over chunk
+        boundaries exactly. Cross-validation and the stationarity test need
+        the full series in memory and are reported as unavailable.
+        """
+        saved_state = self.stream_state
+        self.stream_state = None
+        n_columns = 0
         
-        # Calculate temporal deltas for numeric columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        try:
+            for chunk in _iter_chunks(source, kwargs.get('chunksize', 100_000)):
+                if 'timestamp' in chunk.columns:
+                    chunk = chunk.set_index('timestamp')
+                elif 'date' in chunk.columns:
+                    chunk = chunk.set_index('date')
+                n_columns = max(n_columns, chunk.shape[1])
+                self.update(chunk,
+                            target_column=target_column,
+                            parody_detection=parody_detection,
+                            max_lag=kwargs.get('max_lag', 5))
+            streaming = self.get_streaming_results()
+            chunked_state = self.stream_state
+        finally:
+            self.stream_state = saved_state
         
-        for col in numeric_cols:
-            if len(df[col].dropna()) > 1:
-                # Temporal Delta = f(t+1) - f(t)
-                temporal_delta = df[col].diff()
-                
-                results[f'{col}_temporal_delta'] = {
-                    'mean': temporal_delta.mean(),
-                    'std': temporal_delta.std(),
-                    'min': temporal_delta.min(),
-                    'max': temporal_delta.max(),
-                    'trend': 'increasing' if temporal_delta.mean() > 0 else 'decreasing'
+        if 'error' in streaming:
+            return {'method': cv_method, 'error': 'No data found in chunked source'}
+        
+        cv_analysis = {
+            'method': cv_method,
+            'error': 'Cross-validation requires in-memory data'
+        }
+        parody_results = None
+        if parody_detection:
+            parody_results = streaming.get('parody_detection', {
+                'total_parody_indicators': 0,
+                'total_text_entries': 0,
+                'pattern_confidence': 0.0,
+                'sentiment_analysis': {}
+            })
+        
+        if kwargs.get('result_format', 'dict') == 'columnar':
+            results = self._stream_result(
+                chunked_state, cv_method, (streaming['rows_seen'], n_columns), cv_analysis,
+                parody_results, streaming.get('volatility_analysis')
+            )
+            self.autocorrelation_view = results.autocorrelation_matrix
+            self.cv_results = results
+            self.logger.info("Intertemporal differential analysis complete")
+            return results
+        
+        results = {
+            'method': cv_method,
+            'timestamp': datetime.now().isoformat(),
+            'security_key': self.security_key[:20] + "..." if self.security_key else None,
+            'data_shape': (streaming['rows_seen'], n_columns),
+            'analysis_results': {},
+            'chunked': True,
+            'temporal_differentials': streaming['temporal_differentials'],
+            'autocorrelation_matrix': streaming['autocorrelation_matrix'],
+            'cv_analysis': cv_analysis
+        }
+        if parody_results is not None:
+            results['parody_detection'] = parody_results
+        if 'volatility_analysis' in streaming:
+            results['volatility_analysis'] = streaming['volatility_analysis']
+        
+        self.autocorrelation_view = results['autocorrelation_matrix']
+        self.cv_results = results
+        
+        self.logger.info("Intertemporal differential analysis complete")
+        return results
+    
+    @_instrumented('update', rows_from='new_rows')
+    def update(self,
+               new_rows: Union[pd.DataFrame, Dict],
+               target_column: Optional[str] = None,
+               parody_detection: bool = True,
+               max_lag: int = 5,
+               volatility_window: int = 5) -> Dict[str, Any]:
+        """
+        Streaming mode: fold appended rows into running statistics
+        
+        Only the new rows are touched, so appending N rows costs O(N)
+        regardless of how much history has been seen. The first call fixes
+        the tracked numeric columns and the streaming parameters; call
+        reset_stream() to start over.
+        
+        Args:
+            new_rows: Appended observations (DataFrame or dict)
+            target_column: Column used for rolling volatility (first call only)
+            parody_detection: Accumulate parody counts for text columns
+            max_lag: Largest lag tracked for lag correlations (first call only)
+            volatility_window: Rolling window for return volatility (first call only)
+            
+        Returns:
+            Current streaming snapshot (see get_streaming_results)
+        """
+        df = pd.DataFrame(new_rows) if isinstance(new_rows, dict) else new_rows
+        
+        if self.stream_state is None:
+            numeric_cols = list(df.select_dtypes(include=[np.number]).columns)
+            if target_column not in numeric_cols:
+                target_column = None
+            n_cols = len(numeric_cols)
+            self.stream_state = StreamingState(
+                columns=numeric_cols,
+                target_column=target_column,
+                max_lag=max_lag,
+                volatility_window=volatility_window,
+                value_counts=np.zeros(n_cols),
+                tail=np.empty((0, n_cols)),
+                delta_moments=_empty_moments(n_cols),
+                lag_moments=_empty_comoments((max_lag, n_cols)),
+                return_tail=np.empty(0),
+                volatility_moments=_empty_moments(())
+            )
+        
+        state = self.stream_state
+        if len(df) == 0:
+            return self.get_streaming_results()
+        
+        values = df.reindex(columns=state.columns).to_numpy(dtype=float, na_value=np.nan)
+        state.value_counts += (~np.isnan(values)).sum(axis=0)
+        
+        # Temporal deltas, carrying the last seen row across the boundary
+        extended = np.vstack([state.tail, values])
+        n_tail = len(state.tail)
+        deltas = np.diff(extended[max(n_tail - 1, 0):], axis=0)
+        state.delta_moments = _merge_moments(state.delta_moments, _batch_moments(deltas))
+        
+        # Lag co-moments: pair each new row with the row k steps earlier
+        batch_lag = _empty_comoments(state.lag_moments['count'].shape)
+        for k in range(1, state.max_lag + 1):
+            start = max(n_tail, k)
+            if start >= len(extended):
+                continue
+            pairs = _batch_comoments(extended[start:], extended[start - k:len(extended) - k])
+            for name in batch_lag:
+                batch_lag[name][k - 1] = pairs[name]
+        state.lag_moments = _merge_comoments(state.lag_moments, batch_lag)
+        state.tail = extended[-state.max_lag:] if state.max_lag > 0 else extended[-1:]
+        
+        # Rolling volatility of target returns (prices forward-filled like pct_change)
+        if state.target_column is not None:
+            prices = pd.Series(np.concatenate([[state.last_price], values[:, state.columns.index(state.target_column)]]))
+            prices = prices.ffill().to_numpy()
+            state.last_price = prices[-1]
+            returns = prices[1:] / prices[:-1] - 1
+            returns = returns[~np.isnan(returns)]
+            windowed = np.concatenate([state.return_tail, returns])
+            window = state.volatility_window
+            if len(windowed) >= window:
+                volatility = np.lib.stride_tricks.sliding_window_view(windowed, window).std(axis=-1, ddof=1)
+                state.volatility_moments = _merge_moments(state.volatility_moments, _batch_moments(volatility))
+            state.return_tail = windowed[-(window - 1):] if window > 1 else windowed[:0]
+        
+        # Parody counts only need the new rows
+        if parody_detection:
+            batch_parody = self._detect_parody_patterns(df)
+            state.total_parody_indicators += batch_parody['total_parody_indicators']
+            state.total_text_entries += batch_parody['total_text_entries']
+            for col, stats in batch_parody['sentiment_analysis'].items():
+                state.parody_counts[col] = state.parody_counts.get(col, 0) + stats['parody_instances']
+            for col in df.select_dtypes(include=['object']).columns:
+                state.text_counts[col] = state.text_counts.get(col, 0) + int(df[col].count())
+        
+        state.rows_seen += len(df)
+        return self.get_streaming_results()
+    
+    def get_streaming_results(self) -> Dict[str, Any]:
+        """
+        Snapshot of the streaming statistics accumulated by update()
+        
+        'temporal_differentials' has the same shape as the batch
+        analyze_temporal_diffs() output over the full appended history.
+        
+        Returns:
+            Dictionary with streaming analysis results
+        """
+        state = self.stream_state
+        if state is None:
+            return {'error': 'No streaming data; call update() first'}
+        
+        results = {
+            'rows_seen': state.rows_seen,
+            'timestamp': datetime.now().isoformat(),
+            'temporal_differentials': {}
+        }
+        
+        delta = state.delta_moments
+        n_lags, delta_std, lag_corr = self._stream_correlations(state)
+        results['autocorrelation_matrix'] = {
+            'columns': list(state.columns),
+            'lags': np.arange(1, n_lags + 1),
+            'matrix': lag_corr[:n_lags]
+        }
+        
+        for j, col in enumerate(state.columns):
+            if state.value_counts[j] <= 1:
+                continue
+            has_deltas = delta['count'][j] > 0
+            delta_mean = delta['mean'][j] if has_deltas else np.nan
+            results['temporal_differentials'][f'{col}_temporal_delta'] = {
+                'mean': delta_mean,
+                'std': delta_std[j] if delta['count'][j] > 1 else np.nan,
+                'min': delta['min'][j] if has_deltas else np.nan,
+                'max': delta['max'][j] if has_deltas else np.nan,
+                'trend': 'increasing' if delta_mean > 0 else 'decreasing'
+            }
+            if state.value_counts[j] > 10:
+                results['temporal_differentials'][f'{col}_rolling_correlations'] = [
+                    {'lag': k, 'correlation': float(lag_corr[k - 1, j])}
+                    for k in range(1, n_lags + 1)
+                    if not np.isnan(lag_corr[k - 1, j])
+                ]
+        
+        if state.target_column is not None:
+            vol = state.volatility_moments
+            if vol['count'] > 0:
+                results['volatility_analysis'] = {
+                    'volatility_metrics': {
+                        'mean_volatility': float(vol['mean']),
+                        'volatility_std': float(np.sqrt(vol['m2'] / (vol['count'] - 1))) if vol['count'] > 1 else np.nan,
+                        'max_volatility': float(vol['max']),
+                        'min_volatility': float(vol['min'])
+                    }
                 }
-                
-                # Rolling correlation with lags
-                if len(df[col].dropna()) > 10:
-                    rolling_corrs = []
-                    for k in range(1, min(6, len(df[col])//2)):
-                        if len(df[col]) > k:
-                            lagged_series = df[col].shift(k)
-                            corr = df[col].corr(lagged_series)
-                            if not np.isnan(corr):
-                                rolling_corrs.append({'lag': k, 'correlation': corr})
-                    
-                    results[f'{col}_rolling_correlations'] = rolling_corrs
+            else:
+                results['volatility_analysis'] = {'error': 'Insufficient data for volatility analysis'}
+        
+        if state.text_counts:
+            results['parody_detection'] = {
+                'total_parody_indicators': state.total_parody_indicators,
+                'total_text_entries': state.total_text_entries,
+                'pattern_confidence': state.total_parody_indicators / state.total_text_entries if state.total_text_entries > 0 else 0.0,
+                'sentiment_analysis': {
+                    col: {
+                        'parody_instances': count,
+                        'total_instances': state.text_counts[col],
+                        'parody_ratio': count / state.text_counts[col] if state.text_counts[col] > 0 else 0
+                    }
+                    for col, count in state.parody_counts.items()
+                }
+            }
         
         return results
     
-    def _perform_cross_validation(self, df: pd.DataFrame, cv_method: str, target_column: Optional[str]) -> Dict[str, Any]:
-        """Perform cross-validation analysis based on specified method"""
-        print(f"   🎯 Performing {cv_method} cross-validation...")
+    @staticmethod
+    def _stream_correlations(state: StreamingState) -> Tuple[int, np.ndarray, np.ndarray]:
+        """Reported lag count, per-column delta std and (lag x column) correlations of a stream"""
+        delta = state.delta_moments
+        lag = state.lag_moments
+        n_lags = max(0, min(state.max_lag, state.rows_seen // 2 - 1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta_std = np.sqrt(delta['m2'] / (delta['count'] - 1))
+            lag_corr = lag['c_xy'] / np.sqrt(lag['m2_x'] * lag['m2_y'])
+        lag_corr[(lag['count'] < 2) | (lag['m2_x'] <= 0) | (lag['m2_y'] <= 0)] = np.nan
+        return n_lags, delta_std, np.clip(lag_corr, -1.0, 1.0)
+    
+    def _stream_result(self, state: StreamingState, cv_method: str, data_shape: Tuple[int, int],
+                       cv_analysis: Dict[str, Any], parody_detection: Optional[Dict[str, Any]],
+                       volatility_analysis: Optional[Dict[str, Any]]) -> AnalysisResult:
+        """Columnar AnalysisResult from the statistics of a stream"""
+        delta = state.delta_moments
+        n_lags, delta_std, lag_corr = self._stream_correlations(state)
+        has_deltas = delta['count'] > 0
+        return AnalysisResult(
+            method=cv_method,
+            timestamp=datetime.now().isoformat(),
+            security_key=self.security_key[:20] + "..." if self.security_key else None,
+            data_shape=data_shape,
+            columns=list(state.columns),
+            observation_counts=np.asarray(state.value_counts),
+            delta_mean=np.where(has_deltas, delta['mean'], np.nan),
+            delta_std=np.where(delta['count'] > 1, delta_std, np.nan),
+            delta_min=np.where(has_deltas, delta['min'], np.nan),
+            delta_max=np.where(has_deltas, delta['max'], np.nan),
+            lags=np.arange(1, n_lags + 1),
+            lag_correlations=lag_corr[:n_lags],
+            cv_analysis=cv_analysis,
+            parody_detection=parody_detection,
+            volatility_analysis=volatility_analysis
+        )
+    
+    def reset_stream(self):
+        """Discard all streaming state accumulated by update()"""
+        self.stream_state = None
+    
+    @_instrumented('panel', rows_from='data')
+    def analyze_panel(self,
+                      data: pd.DataFrame,
+                      symbol_column: str = 'symbol',
+                      timestamp_column: str = 'timestamp',
+                      cv_method: Optional[str] = 'time_series',
+                      target_column: Optional[str] = None,
+                      max_lag: int = 5,
+                      n_jobs: int = 1,
+                      split_params: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+        """
+        Temporal differentials, lag correlations and CV scores for many symbols
+        
+        Deltas are computed with grouped pandas kernels and lag correlations
+        with grouped_lag_correlations for all symbols in one pass; per-symbol
+        CV fits run in a process pool when ``n_jobs != 1``. Per-symbol values
+        match analyze_temporal_diffs run on that symbol's frame.
+        
+        Args:
+            data: Long-format frame with a symbol column (and optionally a
+                timestamp column), or a frame with a MultiIndex containing
+                those levels; rows without a symbol are dropped
+            symbol_column: Column/level identifying the series
+            timestamp_column: Column/level used to order rows within a symbol
+            cv_method: CV method per symbol, or None to skip cross-validation
+            target_column: CV target column (first numeric column if missing)
+            max_lag: Largest lag for the lag correlations
+            n_jobs: Processes for the per-symbol CV fits (-1 for all cores)
+            split_params: Overrides for the CV splitter sizes
+            
+        Returns:
+            DataFrame indexed by symbol with 'n_obs', '{col}_delta_mean',
+            '{col}_delta_std', '{col}_delta_min', '{col}_delta_max',
+            '{col}_lag{k}_corr' and (with cv_method) 'cv_mean_score',
+            'cv_std_score', 'cv_out_of_sample_accuracy', 'cv_folds' and
+            'cv_error' columns
+        """
+        self.logger.debug("Analyzing panel")
+        
+        frame = data.reset_index() if symbol_column in (data.index.names or []) else data
+        if symbol_column not in frame.columns:
+            raise ValueError(f"Panel data needs a '{symbol_column}' column or index level")
+        if timestamp_column not in frame.columns and timestamp_column in (frame.index.names or []):
+            frame = frame.reset_index()
+        
+        # factorize codes missing symbols as -1, which grouping cannot index
+        missing = frame[symbol_column].isna()
+        if missing.any():
+            self.logger.warning("Dropping %d panel rows without a '%s'", int(missing.sum()), symbol_column)
+            frame = frame[~missing]
+        
+        sort_by = [symbol_column] + ([timestamp_column] if timestamp_column in frame.columns else [])
+        frame = frame.sort_values(sort_by, kind='stable')
+        codes, symbols = pd.factorize(frame[symbol_column], sort=True)
+        
+        numeric = frame.drop(columns=sort_by).select_dtypes(include=[np.number])
+        value_columns = list(numeric.columns)
+        values = numeric.to_numpy(dtype=float, na_value=np.nan)
+        
+        table = pd.DataFrame(index=pd.Index(symbols, name=symbol_column))
+        table['n_obs'] = np.bincount(codes, minlength=len(symbols))
+        
+        # Temporal deltas within each symbol
+        deltas = numeric.groupby(codes, sort=False).diff()
+        stats = deltas.groupby(codes).agg(['mean', 'std', 'min', 'max'])
+        stats.index = table.index
+        counts = numeric.groupby(codes).count().to_numpy()
+        counts = pd.DataFrame(counts, index=table.index, columns=value_columns)
+        for col in value_columns:
+            for stat in ('mean', 'std', 'min', 'max'):
+                table[f'{col}_delta_{stat}'] = stats[(col, stat)].where(counts[col] > 1)
+        
+        # Lag correlations, restricted like the single-series path to
+        # lags < len/2 and series with more than 10 observations
+        corr = grouped_lag_correlations(values, codes, len(symbols), max_lag)
+        lag_limit = table['n_obs'].to_numpy() // 2 - 1
+        for j, col in enumerate(value_columns):
+            reported = counts[col].to_numpy() > 10
+            for k in range(1, max_lag + 1):
+                table[f'{col}_lag{k}_corr'] = np.where(reported & (k <= lag_limit), corr[k - 1, :, j], np.nan)
+        
+        if cv_method is not None:
+            starts = np.searchsorted(codes, np.arange(len(symbols) + 1))
+            tasks = [
+                (numeric.iloc[starts[i]:starts[i + 1]], cv_method, target_column, split_params)
+                for i in range(len(symbols))
+            ]
+            if n_jobs is None or n_jobs < 1:
+                n_jobs = os.cpu_count() or 1
+            n_jobs = min(n_jobs, len(tasks))
+            
+            if n_jobs <= 1:
+                cv_rows = [_panel_cv_worker(task, self) for task in tasks]
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    cv_rows = list(executor.map(_panel_cv_worker, tasks,
+                                                chunksize=max(1, len(tasks) // (n_jobs * 4))))
+            
+            cv_table = pd.DataFrame(cv_rows, index=table.index)
+            table = pd.concat([table, cv_table], axis=1)
+        
+        return table
+    
+    def _calculate_temporal_differentials(self, df: pd.DataFrame, max_lag: int = 5) -> Dict[str, Any]:
+        """
+        Calculate intertemporal differential metrics
+
+        Temporal deltas and lag correlations are computed for all numeric
+        columns in a single batched pass (see lagged_autocorrelation_matrix)
+        rather than shifting and correlating one column/lag pair at a time.
+        The dense lag x column correlation matrix is kept on
+        ``self.autocorrelation_view``.
+
+        Args:
+            df: Input DataFrame
+            max_lag: Largest lag to correlate against (default 5)
+
+        Returns:
+            Dictionary keyed by '{col}_temporal_delta' and
+            '{col}_rolling_correlations'
+        """
+        arrays = self._temporal_differential_arrays(df, max_lag)
+        return _temporal_differentials_dict(**arrays)
+    
+    @_instrumented('kernels', rows_from='numeric_df')
+    def _series_kernels(self, numeric_df: pd.DataFrame, volatility_window: Optional[int] = 5,
+                        max_lag: int = 0) -> Dict[str, np.ndarray]:
+        """Shared single-pass kernels (see intertemporal_kernels.series_kernels) for a numeric frame"""
+        values = numeric_df.to_numpy(dtype=float, na_value=np.nan)
+        return series_kernels(values, volatility_window=volatility_window, max_lag=max_lag)
+    
+    @staticmethod
+    def _lag_count(df: pd.DataFrame, max_lag: int) -> int:
+        """Number of correlation lags reported for a frame of this length"""
+        return max(0, min(max_lag, len(df) // 2 - 1))
+    
+    @_instrumented('differentials', rows_from='df')
+    def _temporal_differential_arrays(self,
+                                      df: pd.DataFrame,
+                                      max_lag: int = 5,
+                                      kernels: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
+        """
+        Columnar core of _calculate_temporal_differentials
+        
+        Args:
+            df: Input DataFrame
+            max_lag: Largest lag to correlate against (default 5)
+            kernels: series_kernels output for the numeric columns of ``df``
+                (computed here if not given)
+            
+        Returns:
+            Dictionary of AnalysisResult fields: 'columns', per-column
+            'observation_counts' and delta statistics, 'lags' and the
+            (lag x column) 'lag_correlations' matrix
+        """
+        self.logger.debug("Calculating temporal differentials")
+        
+        numeric_df = df.select_dtypes(include=[np.number])
+        n_lags = self._lag_count(df, max_lag)
+        if kernels is None:
+            kernels = self._series_kernels(numeric_df, volatility_window=None, max_lag=n_lags)
+        
+        # Temporal Delta = f(t+1) - f(t) and lag correlations, from the shared kernels
+        temporal_deltas = pd.DataFrame(kernels['diff'], columns=numeric_df.columns)
+        corr_matrix = kernels['lag_correlations'][:n_lags]
+        
+        self.autocorrelation_view = {
+            'columns': list(numeric_df.columns),
+            'lags': np.arange(1, n_lags + 1),
+            'matrix': corr_matrix
+        }
+        
+        return {
+            'columns': self.autocorrelation_view['columns'],
+            'observation_counts': numeric_df.count().to_numpy(),
+            'delta_mean': temporal_deltas.mean().to_numpy(),
+            'delta_std': temporal_deltas.std().to_numpy(),
+            'delta_min': temporal_deltas.min().to_numpy(),
+            'delta_max': temporal_deltas.max().to_numpy(),
+            'lags': self.autocorrelation_view['lags'],
+            'lag_correlations': corr_matrix
+        }
+    
+    @_instrumented('cv', rows_from='df')
+    def _perform_cross_validation(self,
+                                  df: pd.DataFrame,
+                                  cv_method: str,
+                                  target_column: Optional[str],
+                                  n_jobs: int = 1,
+                                  cv_backend: str = 'thread',
+                                  incremental_ols: bool = True,
+                                  split_params: Optional[Dict[str, int]] = None,
+                                  param_grid: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Perform cross-validation analysis based on specified method
+        
+        Args:
+            df: Input DataFrame
+            cv_method: CV method ('time_series', 'expanding_window', 'blocked',
+                'purged_blocked')
+            target_column: Target column (first numeric column if missing)
+            n_jobs: Number of folds fitted concurrently (-1 for all cores)
+            cv_backend: 'thread' or 'process'; the process backend places X/y
+                in shared memory once and ships only fold indices to workers
+            incremental_ols: For expanding-window CV with LinearRegression,
+                solve every fold from running X'X/X'y accumulators instead
+                of refitting on each (strictly larger) prefix
+            split_params: Keyword overrides for the expanding-window/blocked
+                splitters (e.g. min_train_size, test_size, block_size,
+                purge_size, embargo_size)
+            param_grid: Keyword arguments for grid_search_cv; when given, the
+                scores of the best candidate are reported, its model name
+                under 'model' and the full search result under 'grid_search'
+            
+        Returns:
+            Dictionary with CV scores (in fold order) and performance metrics
+        """
+        self.logger.debug("Performing %s cross-validation", cv_method)
         
         if not SKLEARN_AVAILABLE:
             return {'error': 'scikit-learn not available for CV analysis'}
         
+        if param_grid is not None:
+            search = self.grid_search_cv(df, target_column, cv_method=cv_method,
+                                         split_params=split_params, n_jobs=n_jobs, **param_grid)
+            if 'error' in search:
+                return {'method': cv_method, 'error': search['error']}
+            best = search['best']
+            return {
+                'method': cv_method,
+                'cv_scores': best['cv_scores'],
+                'performance_metrics': {
+                    'mean_cv_score': best['mean_cv_score'],
+                    'std_cv_score': best['std_cv_score'],
+                    'out_of_sample_accuracy': 1 / (1 + best['mean_cv_score']) if best['mean_cv_score'] > 0 else 0.5
+                },
+                'model': best['model'],
+                'grid_search': search
+            }
+        _require('LinearRegression', 'RandomForestRegressor')
+        
         results = {
             'method': cv_method,
             'cv_scores': [],
@@ -223,49 +1428,40 @@ class IntertemporalAnalyzer:
         
         # Prepare features (other numeric columns)
         feature_cols = [col for col in numeric_cols if col != target_column]
+        y_values = df[target_column].to_numpy(dtype=float)
         if len(feature_cols) == 0:
-            # Create lagged features
-            df_features = pd.DataFrame()
-            for lag in range(1, 4):
-                df_features[f'{target_column}_lag_{lag}'] = df[target_column].shift(lag)
-            feature_cols = df_features.columns.tolist()
-            df = pd.concat([df, df_features], axis=1)
+            # Lagged target values as a strided view, no per-lag columns
+            feature_cols = [f'{target_column}_lag_{lag}' for lag in range(1, 4)]
+            X_values = lag_matrix(y_values, 3)
+            y_values = y_values[3:]
+        else:
+            X_values = df[feature_cols].to_numpy(dtype=float)
         
-        # Drop NaN values
-        analysis_df = df[[target_column] + feature_cols].dropna()
+        # Drop NaN values (only copies when there are any)
+        valid = ~np.isnan(y_values) & ~np.isnan(X_values).any(axis=1)
+        if not valid.all():
+            X_values, y_values = X_values[valid], y_values[valid]
         
-        if len(analysis_df) < 10:
+        if len(y_values) < 10:
             return {'error': 'Insufficient data for CV analysis'}
         
-        X = analysis_df[feature_cols]
-        y = analysis_df[target_column]
-        
-        # Perform CV based on method
-        if cv_method == 'time_series':
-            cv_splits = TimeSeriesSplit(n_splits=min(5, len(X)//3))
-        elif cv_method == 'expanding_window':
-            # Custom expanding window implementation
-            cv_splits = self._expanding_window_splits(len(X))
-        elif cv_method == 'blocked':
-            # Custom blocked time series implementation
-            cv_splits = self._blocked_time_series_splits(len(X))
-        else:
-            cv_splits = TimeSeriesSplit(n_splits=3)
-        
         # Perform cross-validation
-        model = LinearRegression() if len(feature_cols) <= len(X)//2 else RandomForestRegressor(n_estimators=10)
-        cv_scores = []
+        model = LinearRegression() if len(feature_cols) <= len(y_values)//2 else RandomForestRegressor(n_estimators=10)
         
         try:
-            for train_idx, test_idx in cv_splits:
-                X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
-                y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
-                
-                model.fit(X_train, y_train)
-                y_pred = model.predict(X_test)
-                
-                mse = mean_squared_error(y_test, y_pred)
-                cv_scores.append(mse)
+            # Perform CV based on method
+            cv_splits = self._cached_splits(len(y_values), cv_method, split_params)
+            cv_scores = None
+            
+            if incremental_ols and cv_method == 'expanding_window' and isinstance(model, LinearRegression):
+                cv_scores = _expanding_ols_scores(X_values, y_values, cv_splits)
+            
+            if cv_scores is None:
+                cv_scores = _run_cv_folds(model, X_values, y_values,
+                                          cv_splits, n_jobs=n_jobs, backend=cv_backend)
+                results['solver'] = type(model).__name__
+            else:
+                results['solver'] = 'incremental_ols'
             
             results['cv_scores'] = cv_scores
             results['performance_metrics'] = {
@@ -279,9 +1475,215 @@ class IntertemporalAnalyzer:
         
         return results
     
+    @_instrumented('grid_search', rows_from='data')
+    def grid_search_cv(self,
+                       data: Union[pd.DataFrame, Dict],
+                       target_column: Optional[str] = None,
+                       models: Optional[Dict[str, Any]] = None,
+                       lag_counts: Iterable[int] = (1, 3, 5),
+                       feature_sets: Optional[List[List[str]]] = None,
+                       cv_method: str = 'expanding_window',
+                       split_params: Optional[Dict[str, int]] = None,
+                       n_jobs: int = 1,
+                       early_stopping: Optional[float] = 2.0,
+                       min_folds: int = 2) -> Dict[str, Any]:
+        """
+        Cross-validate a grid of models, target lag counts and feature sets
+        
+        Everything that does not depend on the candidate is computed once:
+        the design matrix holds the target lags up to max(lag_counts)
+        followed by every feature column, each candidate scores a column
+        subset of it (a view when it uses target lags only), and all
+        candidates share one list of fold splits, cached per sample count
+        and splitter settings. The search runs fold by fold: every live
+        candidate scores the current fold (concurrently with ``n_jobs``),
+        then, once ``min_folds`` folds are in, candidates whose running mean
+        MSE exceeds ``early_stopping`` times the best running mean are
+        dropped from the remaining folds.
+        
+        Args:
+            data: Input data
+            target_column: Target column (first numeric column if missing)
+            models: Name -> unfitted scikit-learn estimator (default: linear
+                regression and a 10-tree random forest)
+            lag_counts: Numbers of target lags to try (0 for none)
+            feature_sets: Lists of other numeric columns used as
+                contemporaneous features (default: none, and all of them)
+            cv_method: CV method ('time_series', 'expanding_window', 'blocked',
+                'purged_blocked')
+            split_params: Keyword overrides for the splitter
+            n_jobs: Number of candidates scored concurrently (-1 for all cores)
+            early_stopping: Running-MSE ratio to the leader above which a
+                candidate is stopped (None to score every fold of every
+                candidate)
+            min_folds: Folds scored before early stopping applies
+            
+        Returns:
+            Dictionary with the leaderboard (finished candidates by mean CV
+            score, then stopped ones), the best candidate and search counts
+        """
+        if not SKLEARN_AVAILABLE:
+            return {'error': 'scikit-learn not available for CV analysis'}
+        _require('LinearRegression', 'RandomForestRegressor')
+        
+        df = pd.DataFrame(data) if isinstance(data, dict) else data
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        if len(numeric_cols) == 0:
+            return {'error': 'No numeric columns available for CV analysis'}
+        if not target_column or target_column not in numeric_cols:
+            target_column = numeric_cols[0]
+        
+        other_cols = [col for col in numeric_cols if col != target_column]
+        if feature_sets is None:
+            feature_sets = [[]] + ([other_cols] if other_cols else [])
+        feature_sets = [list(features) for features in feature_sets]
+        unknown = {col for features in feature_sets for col in features} - set(other_cols)
+        if unknown:
+            return {'error': f"Unknown feature columns: {sorted(unknown)}"}
+        if models is None:
+            models = {
+                'linear_regression': LinearRegression(),
+                'random_forest': RandomForestRegressor(n_estimators=10, random_state=0)
+            }
+        lag_counts = sorted(set(int(lag) for lag in lag_counts))
+        if not lag_counts or lag_counts[0] < 0:
+            return {'error': 'lag_counts must hold at least one non-negative lag count'}
+        
+        # Shared design matrix: target lags 1..max_lag, then the features
+        max_lag = max(lag_counts)
+        feature_cols = [col for col in other_cols if any(col in features for features in feature_sets)]
+        target = df[target_column].to_numpy(dtype=float)
+        n_rows = len(target) - max_lag
+        if n_rows < 10:
+            return {'error': 'Insufficient data for CV analysis'}
+        design = lag_matrix(target, max_lag)
+        if feature_cols:
+            design = np.hstack([design, df[feature_cols].to_numpy(dtype=float)[max_lag:]])
+        y = target[max_lag:]
+        
+        valid = np.isfinite(y) & np.isfinite(design).all(axis=1)
+        if not valid.all():
+            design, y = design[valid], y[valid]
+        if len(y) < 10:
+            return {'error': 'Insufficient data for CV analysis'}
+        
+        splits = self._cached_splits(len(y), cv_method, split_params)
+        if not splits:
+            return {'error': 'No CV folds for the given split parameters'}
+        
+        candidates = []
+        for (name, model), n_lags, features in itertools.product(models.items(), lag_counts, feature_sets):
+            columns = list(range(n_lags)) + [max_lag + feature_cols.index(col) for col in features]
+            if not columns:
+                continue
+            X = design[:, :n_lags] if not features else design[:, columns]
+            candidates.append({'model': name, 'n_lags': n_lags, 'features': features,
+                               'estimator': model, 'X': X, 'cv_scores': [], 'stopped': False})
+        if not candidates:
+            return {'error': 'Empty parameter grid'}
+        
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        executor = ThreadPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+        
+        def score(candidate, fold):
+            train_idx, test_idx = fold
+            return _score_fold(candidate['estimator'], candidate['X'], y, train_idx, test_idx)
+        
+        try:
+            for fold_number, fold in enumerate(splits, start=1):
+                alive = [candidate for candidate in candidates if not candidate['stopped']]
+                if executor is None:
+                    fold_scores = [score(candidate, fold) for candidate in alive]
+                else:
+                    fold_scores = list(executor.map(lambda candidate: score(candidate, fold), alive))
+                for candidate, fold_score in zip(alive, fold_scores):
+                    candidate['cv_scores'].append(fold_score)
+                
+                if early_stopping is not None and fold_number >= min_folds and fold_number < len(splits):
+                    running = np.array([np.mean(candidate['cv_scores']) for candidate in alive])
+                    for candidate, mean_score in zip(alive, running):
+                        candidate['stopped'] = bool(mean_score > early_stopping * running.min())
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        leaderboard = sorted((
+            {
+                'model': candidate['model'],
+                'n_lags': candidate['n_lags'],
+                'features': candidate['features'],
+                'mean_cv_score': float(np.mean(candidate['cv_scores'])),
+                'std_cv_score': float(np.std(candidate['cv_scores'])),
+                'folds_evaluated': len(candidate['cv_scores']),
+                'stopped': candidate['stopped'],
+                'cv_scores': candidate['cv_scores']
+            } for candidate in candidates
+        ), key=lambda row: (row['stopped'], row['mean_cv_score']))
+        
+        return {
+            'method': cv_method,
+            'target_column': target_column,
+            'n_samples': len(y),
+            'n_folds': len(splits),
+            'n_candidates': len(candidates),
+            'n_stopped': sum(row['stopped'] for row in leaderboard),
+            'best': leaderboard[0],
+            'leaderboard': leaderboard
+        }
+    
+    def _cached_splits(self,
+                       n_samples: int,
+                       cv_method: str,
+                       split_params: Optional[Dict[str, int]] = None) -> List[Tuple[Any, Any]]:
+        """Materialized _cv_splits folds, memoized per sample count and splitter settings"""
+        key = (n_samples, cv_method, tuple(sorted((split_params or {}).items())))
+        splits = self._split_cache.get(key)
+        if splits is None:
+            splits = [(_as_slice(train_idx), _as_slice(test_idx))
+                      for train_idx, test_idx in self._cv_splits(n_samples, cv_method, split_params)]
+            self._split_cache[key] = splits
+            if len(self._split_cache) > 32:
+                self._split_cache.popitem(last=False)
+        else:
+            self._split_cache.move_to_end(key)
+        return splits
+    
+    def iter_cv_splits(self,
+                       n_samples: int,
+                       cv_method: str = 'time_series',
+                       split_params: Optional[Dict[str, int]] = None) -> Iterator[Tuple[Any, Any]]:
+        """
+        Iterate the (train, test) folds the CV stage uses
+        
+        Args:
+            n_samples: Number of samples
+            cv_method: CV method ('time_series', 'expanding_window', 'blocked',
+                'purged_blocked')
+            split_params: Keyword overrides for the splitter sizes
+            
+        Yields:
+            (train, test) pairs of slices (index arrays for irregular folds)
+        """
+        return iter(self._cached_splits(n_samples, cv_method, split_params))
+    
+    def _get_parody_matcher(self) -> 'ParodyMatcher':
+        """Compiled matcher for the current marker list, rebuilt only when it changes"""
+        if self._parody_matcher is None or self._parody_matcher.markers != list(self.parody_markers):
+            self._parody_matcher = ParodyMatcher(self.parody_markers)
+        return self._parody_matcher
+    
+    @_instrumented('parody', rows_from='df')
     def _detect_parody_patterns(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Detect parody patterns in text data"""
-        print("   🎭 Analyzing parody patterns...")
+        """
+        Detect parody patterns in text data
+        
+        Each text column is scanned once by a compiled ParodyMatcher: a
+        trie-shaped regex rejects non-matching rows inside the pandas str
+        accessor, and only the hits are walked through the Aho-Corasick
+        automaton to recover the highest-precedence marker.
+        """
+        self.logger.debug("Analyzing parody patterns")
         
         results = {
             'parody_indicators_found': [],
@@ -291,34 +1693,36 @@ class IntertemporalAnalyzer:
         
         # Look for text columns
         text_columns = df.select_dtypes(include=['object']).columns
+        matcher = self._get_parody_matcher()
         parody_count = 0
         total_text_entries = 0
         
         for col in text_columns:
-            col_parody_count = 0
-            for text in df[col].dropna():
-                if isinstance(text, str):
-                    total_text_entries += 1
-                    text_lower = text.lower()
-                    
-                    # Check for parody markers
-                    for marker in self.parody_markers:
-                        if marker in text_lower:
-                            parody_count += 1
-                            col_parody_count += 1
-                            results['parody_indicators_found'].append({
-                                'column': col,
-                                'marker': marker,
-                                'text_sample': text[:100] + "..." if len(text) > 100 else text
-                            })
-                            break
+            values = df[col].dropna()
+            if pd.api.types.infer_dtype(values, skipna=False) == 'string':
+                texts = values
+            else:
+                texts = values[[isinstance(text, str) for text in values]]
+            total_text_entries += len(texts)
+            
+            marker_idx = matcher.match_series(texts)
+            found = marker_idx >= 0
+            col_parody_count = int(found.sum())
+            parody_count += col_parody_count
+            
+            for text, idx in zip(texts[found], marker_idx[found]):
+                results['parody_indicators_found'].append({
+                    'column': col,
+                    'marker': matcher.markers[idx],
+                    'text_sample': text[:100] + "..." if len(text) > 100 else text
+                })
             
             # Sentiment differential analysis for this column
             if col_parody_count > 0:
                 results['sentiment_analysis'][col] = {
                     'parody_instances': col_parody_count,
-                    'total_instances': len(df[col].dropna()),
-                    'parody_ratio': col_parody_count / len(df[col].dropna()) if len(df[col].dropna()) > 0 else 0
+                    'total_instances': len(values),
+                    'parody_ratio': col_parody_count / len(values) if len(values) > 0 else 0
                 }
         
         # Calculate overall confidence
@@ -330,105 +1734,240 @@ class IntertemporalAnalyzer:
         
         return results
     
-    def _analyze_volatility_clustering(self, series: pd.Series) -> Dict[str, Any]:
+    def _analyze_volatility_clustering(self,
+                                       series: pd.Series,
+                                       kernels: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
         """Analyze volatility clustering using GARCH-like approach"""
-        print("   📈 Analyzing volatility clustering...")
+        self.logger.debug("Analyzing volatility clustering")
+        
+        if not STATSMODELS_AVAILABLE:
+            return {'error': 'statsmodels not available for volatility analysis'}
+        
+        return self._volatility_universe(series.to_frame(name='series'), kernels=kernels)['series']
+    
+    def analyze_volatility_universe(self,
+                                    data: pd.DataFrame,
+                                    window: int = 5,
+                                    n_jobs: int = 1) -> Dict[str, Dict[str, Any]]:
+        """
+        Volatility clustering analysis for every numeric column at once
+        
+        Returns, rolling volatility and squared-return autocorrelations are
+        computed for the whole frame in vectorized passes; the per-series
+        ADF stationarity tests are fanned out to a process pool.
+        
+        Args:
+            data: DataFrame of price series, one column per symbol
+            window: Rolling window for return volatility
+            n_jobs: Processes for the ADF tests (-1 for all cores, 1 for serial)
+            
+        Returns:
+            Dictionary keyed by column, each value shaped like the
+            'volatility_analysis' result of analyze_temporal_diffs
+        """
+        self.logger.debug("Analyzing volatility clustering across %d series", data.shape[1])
         
         if not STATSMODELS_AVAILABLE:
             return {'error': 'statsmodels not available for volatility analysis'}
         
+        return self._volatility_universe(data.select_dtypes(include=[np.number]), window, n_jobs)
+    
+    @_instrumented('volatility', rows_from='prices')
+    def _volatility_universe(self,
+                             prices: pd.DataFrame,
+                             window: int = 5,
+                             n_jobs: int = 1,
+                             kernels: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Dict[str, Any]]:
+        """Vectorized volatility clustering core shared by the single-series and universe paths"""
         results = {}
         
         try:
-            # Calculate returns
-            returns = series.pct_change().dropna()
-            
-            if len(returns) < 10:
-                return {'error': 'Insufficient data for volatility analysis'}
+            # Returns, rolling volatility and squared-return autocorrelations
+            # from the shared kernels
+            if kernels is None:
+                kernels = self._series_kernels(prices, volatility_window=window)
+            returns = kernels['returns']
+            present = ~np.isnan(returns)
+            counts = pd.Series(present.sum(axis=0), index=prices.columns)
             
             # Basic volatility measures
-            volatility = returns.rolling(window=5).std()
-            
-            results['volatility_metrics'] = {
-                'mean_volatility': volatility.mean(),
-                'volatility_std': volatility.std(),
-                'max_volatility': volatility.max(),
-                'min_volatility': volatility.min()
-            }
-            
-            # Test for stationarity
-            adf_result = adfuller(returns.dropna())
-            results['stationarity_test'] = {
-                'adf_statistic': adf_result[0],
-                'p_value': adf_result[1],
-                'is_stationary': adf_result[1] < 0.05
-            }
+            volatility = pd.DataFrame(kernels['rolling_volatility'], columns=prices.columns)
+            vol_mean = volatility.mean()
+            vol_std = volatility.std()
+            vol_max = volatility.max()
+            vol_min = volatility.min()
             
             # Volatility clustering detection (simplified)
-            squared_returns = returns ** 2
-            volatility_autocorr = []
-            for lag in range(1, min(6, len(squared_returns)//3)):
-                if len(squared_returns) > lag:
-                    autocorr = squared_returns.autocorr(lag=lag)
-                    if not np.isnan(autocorr):
-                        volatility_autocorr.append({'lag': lag, 'autocorr': autocorr})
-            
-            results['volatility_clustering'] = volatility_autocorr
+            clustering = kernels['squared_return_correlations']
             
+            eligible = [j for j, col in enumerate(prices.columns) if counts[col] >= 10]
+            adf_results = dict(zip([prices.columns[j] for j in eligible], _run_adf_tests(
+                [returns[present[:, j], j] for j in eligible], n_jobs
+            )))
         except Exception as e:
-            results['error'] = f"Volatility analysis failed: {str(e)}"
+            return {col: {'error': f"Volatility analysis failed: {str(e)}"} for col in prices.columns}
+        
+        for j, col in enumerate(prices.columns):
+            if counts[col] < 10:
+                results[col] = {'error': 'Insufficient data for volatility analysis'}
+                continue
+            
+            adf_result = adf_results[col]
+            if isinstance(adf_result, str):
+                results[col] = {
+                    'volatility_metrics': {
+                        'mean_volatility': vol_mean[col],
+                        'volatility_std': vol_std[col],
+                        'max_volatility': vol_max[col],
+                        'min_volatility': vol_min[col]
+                    },
+                    'error': f"Volatility analysis failed: {adf_result}"
+                }
+                continue
+            
+            results[col] = {
+                'volatility_metrics': {
+                    'mean_volatility': vol_mean[col],
+                    'volatility_std': vol_std[col],
+                    'max_volatility': vol_max[col],
+                    'min_volatility': vol_min[col]
+                },
+                'stationarity_test': {
+                    'adf_statistic': adf_result[0],
+                    'p_value': adf_result[1],
+                    'is_stationary': adf_result[1] < 0.05
+                },
+                'volatility_clustering': [
+                    {'lag': lag, 'autocorr': clustering[lag - 1, j]}
+                    for lag in range(1, min(6, counts[col] // 3))
+                    if not np.isnan(clustering[lag - 1, j])
+                ]
+            }
         
         return results
     
-    def _expanding_window_splits(self, n_samples: int) -> List[tuple]:
-        """Generate expanding window splits"""
-        min_train_size = max(10, n_samples // 5)
-        test_size = max(5, n_samples // 10)
+    def _cv_splits(self,
+                   n_samples: int,
+                   cv_method: str,
+                   split_params: Optional[Dict[str, int]] = None) -> Iterator[Tuple[Any, Any]]:
+        """
+        Generate (train, test) folds for a CV method
         
-        splits = []
-        for i in range(min_train_size, n_samples - test_size, test_size):
-            train_idx = list(range(i))
-            test_idx = list(range(i, min(i + test_size, n_samples)))
-            if len(test_idx) > 0:
-                splits.append((train_idx, test_idx))
+        Shared by the cross-validation stage and the walk-forward backtest
+        engine so both see exactly the same folds.
         
-        return splits
+        Args:
+            n_samples: Number of samples
+            cv_method: CV method ('time_series', 'expanding_window', 'blocked',
+                'purged_blocked'); anything else falls back to a 3-fold
+                TimeSeriesSplit
+            split_params: Keyword overrides for the expanding-window/blocked
+                splitters
+            
+        Yields:
+            (train, test) index pairs (slices or index arrays)
+        """
+        if cv_method == 'expanding_window':
+            # Custom expanding window implementation
+            return self._expanding_window_splits(n_samples, **(split_params or {}))
+        if cv_method == 'blocked':
+            # Custom blocked time series implementation
+            return self._blocked_time_series_splits(n_samples, **(split_params or {}))
+        if cv_method == 'purged_blocked':
+            # Blocked splits with purge gap and post-test embargo
+            return self._purged_blocked_splits(n_samples, **(split_params or {}))
+        
+        _require('TimeSeriesSplit')
+        n_splits = min(5, n_samples // 3) if cv_method == 'time_series' else 3
+        return TimeSeriesSplit(n_splits=n_splits).split(np.empty((n_samples, 0)))
+    
+    def _expanding_window_splits(self,
+                                 n_samples: int,
+                                 min_train_size: Optional[int] = None,
+                                 test_size: Optional[int] = None) -> Iterator[Tuple[slice, slice]]:
+        """
+        Generate expanding window splits
+        
+        Folds are yielded lazily as (train, test) slices, so memory is O(1)
+        per fold and ``X[train]`` is a zero-copy view.
+        """
+        if min_train_size is None:
+            min_train_size = max(10, n_samples // 5)
+        if test_size is None:
+            test_size = max(5, n_samples // 10)
+        
+        for i in range(min_train_size, n_samples - test_size, test_size):
+            yield slice(0, i), slice(i, min(i + test_size, n_samples))
+    
+    def _blocked_time_series_splits(self,
+                                    n_samples: int,
+                                    block_size: Optional[int] = None,
+                                    gap_size: Optional[int] = None) -> Iterator[Tuple[slice, slice]]:
+        """Generate blocked time series splits as (train, test) slices"""
+        return self._purged_blocked_splits(n_samples, block_size=block_size,
+                                           purge_size=gap_size, embargo_size=0)
     
-    def _blocked_time_series_splits(self, n_samples: int) -> List[tuple]:
-        """Generate blocked time series splits"""
-        block_size = max(10, n_samples // 5)
-        gap_size = max(2, block_size // 5)
+    def _purged_blocked_splits(self,
+                               n_samples: int,
+                               block_size: Optional[int] = None,
+                               purge_size: Optional[int] = None,
+                               embargo_size: Optional[int] = None) -> Iterator[Tuple[slice, slice]]:
+        """
+        Generate blocked splits with purging and an embargo
         
-        splits = []
-        start = 0
+        Each training block is followed by ``purge_size`` dropped samples
+        before its test block (so labels straddling the boundary never leak
+        into training), and the next training block starts only after an
+        ``embargo_size`` gap past the test block.
         
-        while start + 2 * block_size + gap_size <= n_samples:
+        Args:
+            n_samples: Number of samples
+            block_size: Train/test block length (default n_samples // 5, min 10)
+            purge_size: Gap between train and test (default block_size // 5, min 2)
+            embargo_size: Gap after each test block (defaults to purge_size)
+            
+        Yields:
+            (train, test) slice pairs
+        """
+        if block_size is None:
+            block_size = max(10, n_samples // 5)
+        if purge_size is None:
+            purge_size = max(2, block_size // 5)
+        if embargo_size is None:
+            embargo_size = purge_size
+        
+        start = 0
+        while start + 2 * block_size + purge_size <= n_samples:
             train_end = start + block_size
-            test_start = train_end + gap_size
+            test_start = train_end + purge_size
             test_end = min(test_start + block_size, n_samples)
             
-            train_idx = list(range(start, train_end))
-            test_idx = list(range(test_start, test_end))
-            
-            if len(train_idx) > 0 and len(test_idx) > 0:
-                splits.append((train_idx, test_idx))
+            yield slice(start, train_end), slice(test_start, test_end)
             
-            start = test_end
-        
-        return splits
+            start = test_end + embargo_size
     
-    def get_regime_change_detection(self, data: pd.Series, window: int = 20) -> Dict[str, Any]:
+    @_instrumented('regime_changes', rows_from='data')
+    def get_regime_change_detection(self,
+                                    data: pd.Series,
+                                    window: int = 20,
+                                    method: str = 'rolling',
+                                    **detector_params) -> Dict[str, Any]:
         """
         Detect structural breaks/regime changes in time series
         
         Args:
             data: Time series data
             window: Rolling window size for change detection
+            method: 'rolling' (jumps in rolling mean/std above their 95th
+                percentile, fully vectorized) or 'cusum' (online two-sided
+                CUSUM on the series increments, see CusumDetector)
+            **detector_params: Extra CusumDetector arguments for method='cusum'
+                (threshold, drift)
             
         Returns:
             Dictionary with regime change analysis
         """
-        print("🔄 Detecting regime changes...")
+        self.logger.debug("Detecting regime changes")
         
         results = {
             'regime_changes': [],
@@ -441,38 +1980,83 @@ class IntertemporalAnalyzer:
             return results
         
         try:
-            # Rolling statistics
-            rolling_mean = data.rolling(window=window).mean()
-            rolling_std = data.rolling(window=window).std()
+            if method == 'cusum':
+                detector = CusumDetector(warmup=window, **detector_params)
+                increments = data.diff().to_numpy(dtype=float)
+                alarms = detector.update(increments[1:]) + 1
+                
+                results['change_points'] = [
+                    {
+                        'index': int(i),
+                        'timestamp': data.index[i] if hasattr(data.index, 'strftime') else int(i),
+                        'direction': direction
+                    }
+                    for i, direction in zip(alarms, detector.alarm_directions)
+                ]
+                results['change_point_indices'] = alarms
+                results['total_regime_changes'] = len(alarms)
+                return results
             
-            # Detect significant changes in mean
-            mean_changes = rolling_mean.diff().abs()
-            mean_threshold = mean_changes.quantile(0.95)
+            if method != 'rolling':
+                raise ValueError(f"Unknown regime detection method: {method}")
             
-            # Detect significant changes in volatility
-            std_changes = rolling_std.diff().abs()
-            std_threshold = std_changes.quantile(0.95)
+            mask, mean_changes, std_changes = _regime_change_mask(data.to_frame(), window)
+            indices = np.flatnonzero(mask[:, 0])
+            mean_values = mean_changes[indices, 0]
+            std_values = std_changes[indices, 0]
+            timestamps = data.index[indices] if hasattr(data.index, 'strftime') else indices
             
             # Find change points
-            change_points = []
-            for i in range(window, len(data) - window):
-                if (mean_changes.iloc[i] > mean_threshold or 
-                    std_changes.iloc[i] > std_threshold):
-                    change_points.append({
-                        'index': i,
-                        'timestamp': data.index[i] if hasattr(data.index, 'strftime') else i,
-                        'mean_change': mean_changes.iloc[i],
-                        'std_change': std_changes.iloc[i]
-                    })
-            
-            results['change_points'] = change_points
-            results['total_regime_changes'] = len(change_points)
+            results['change_points'] = [
+                {
+                    'index': i,
+                    'timestamp': ts,
+                    'mean_change': mean_change,
+                    'std_change': std_change
+                }
+                for i, ts, mean_change, std_change in zip(
+                    indices.tolist(), timestamps, mean_values, std_values
+                )
+            ]
+            results['change_point_indices'] = indices
+            results['total_regime_changes'] = len(indices)
             
         except Exception as e:
             results['error'] = f"Regime change detection failed: {str(e)}"
         
         return results
     
+    @_instrumented('regime_changes_panel', rows_from='data')
+    def detect_regime_changes_panel(self, data: pd.DataFrame, window: int = 20) -> Dict[str, Any]:
+        """
+        Rolling regime change detection for many series at once
+        
+        Applies the same rule as get_regime_change_detection(method='rolling')
+        to every numeric column with one set of rolling/quantile passes over
+        the whole frame.
+        
+        Args:
+            data: DataFrame with one series per column
+            window: Rolling window size for change detection
+            
+        Returns:
+            Dictionary with a boolean change-point mask (rows x columns),
+            change-point row indices and totals per column
+        """
+        self.logger.debug("Detecting regime changes across panel")
+        
+        numeric = data.select_dtypes(include=[np.number])
+        if len(numeric) < window * 2:
+            return {'error': 'Insufficient data for regime change detection'}
+        
+        mask, _, _ = _regime_change_mask(numeric, window)
+        
+        return {
+            'change_point_mask': pd.DataFrame(mask, index=numeric.index, columns=numeric.columns),
+            'change_points': {col: np.flatnonzero(mask[:, j]) for j, col in enumerate(numeric.columns)},
+            'total_regime_changes': dict(zip(numeric.columns, mask.sum(axis=0).tolist()))
+        }
+    
     def validate_security_context(self) -> Dict[str, Any]:
         """
         Validate COMBSEC security context integration
@@ -509,52 +2093,534 @@ class IntertemporalAnalyzer:
         }
 
 
-def create_sample_financial_data(n_samples: int = 100) -> pd.DataFrame:
+def _as_slice(idx):
+    """Return a slice for contiguous ascending indices, else ``idx`` unchanged"""
+    if isinstance(idx, slice):
+        if idx.step not in (None, 1):
+            return idx
+        return slice(idx.start or 0, idx.stop)
+    if isinstance(idx, range) and idx.step == 1:
+        return slice(idx.start, idx.stop)
+    array = np.asarray(idx)
+    if array.ndim != 1 or len(array) == 0 or array.dtype.kind not in 'iu':
+        return idx
+    if array[-1] - array[0] + 1 == len(array) and np.all(np.diff(array) == 1):
+        return slice(int(array[0]), int(array[-1]) + 1)
+    return idx
+
+
+# Per-worker views onto the shared CV arrays (process backend only)
+_SHARED_CV_ARRAYS: Dict[str, Any] = {}
+
+
+def _score_fold(model, X: np.ndarray, y: np.ndarray, train_idx, test_idx) -> float:
+    """Fit a fresh copy of ``model`` on one fold and return its test MSE"""
+    _require('clone', 'mean_squared_error')
+    fold_model = clone(model)
+    fold_model.fit(X[train_idx], y[train_idx])
+    y_pred = fold_model.predict(X[test_idx])
+    return mean_squared_error(y[test_idx], y_pred)
+
+
+_PANEL_CV_ANALYZER = None
+
+
+def _panel_cv_worker(task, analyzer: Optional['IntertemporalAnalyzer'] = None) -> Dict[str, Any]:
+    """Cross-validate one symbol of analyze_panel; returns one row of the CV columns"""
+    global _PANEL_CV_ANALYZER
+    frame, cv_method, target_column, split_params = task
+    if analyzer is None:
+        if _PANEL_CV_ANALYZER is None:
+            _PANEL_CV_ANALYZER = IntertemporalAnalyzer(security_key="panel-worker")
+        analyzer = _PANEL_CV_ANALYZER
+    
+    cv_results = analyzer._perform_cross_validation(frame, cv_method, target_column, split_params=split_params)
+    metrics = cv_results.get('performance_metrics', {})
+    return {
+        'cv_mean_score': metrics.get('mean_cv_score', np.nan),
+        'cv_std_score': metrics.get('std_cv_score', np.nan),
+        'cv_out_of_sample_accuracy': metrics.get('out_of_sample_accuracy', np.nan),
+        'cv_folds': len(cv_results.get('cv_scores', [])),
+        'cv_error': cv_results.get('error')
+    }
+
+
+def _attach_shared_cv_arrays(name: str, x_shape: tuple, y_len: int):
+    """Process pool initializer: map the parent's shared X/y block"""
+    block = shared_memory.SharedMemory(name=name)
+    X = np.ndarray(x_shape, dtype=np.float64, buffer=block.buf)
+    y = np.ndarray((y_len,), dtype=np.float64, buffer=block.buf, offset=X.nbytes)
+    _SHARED_CV_ARRAYS.update(block=block, X=X, y=y)
+
+
+def _score_shared_fold(model, train_idx, test_idx) -> float:
+    """Score a fold against the arrays attached by _attach_shared_cv_arrays"""
+    return _score_fold(model, _SHARED_CV_ARRAYS['X'], _SHARED_CV_ARRAYS['y'], train_idx, test_idx)
+
+
+def _run_cv_folds(model, X: np.ndarray, y: np.ndarray, cv_splits,
+                  n_jobs: int = 1, backend: str = 'thread') -> List[float]:
+    """
+    Score every CV fold, optionally in parallel
+    
+    Scores are always returned in split order. Contiguous folds are indexed
+    as slices (zero-copy views). Threads share X/y directly; processes
+    attach to a single shared-memory copy so only the fold bounds are
+    pickled per task.
+    
+    Args:
+        model: Unfitted scikit-learn estimator, cloned for every fold
+        X: Feature matrix
+        y: Target vector
+        cv_splits: Iterable of (train_idx, test_idx) pairs
+        n_jobs: Number of workers (-1 for all cores, 1 for serial)
+        backend: 'thread' or 'process'
+        
+    Returns:
+        List of per-fold mean squared errors
+    """
+    if backend not in ('thread', 'process'):
+        raise ValueError(f"Unknown CV backend: {backend}")
+    
+    splits = [(_as_slice(train_idx), _as_slice(test_idx)) for train_idx, test_idx in cv_splits]
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(splits))
+    
+    if n_jobs <= 1:
+        return [_score_fold(model, X, y, train_idx, test_idx) for train_idx, test_idx in splits]
+    
+    if backend == 'thread':
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(
+                lambda split: _score_fold(model, X, y, split[0], split[1]), splits
+            ))
+    
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    block = shared_memory.SharedMemory(create=True, size=max(X.nbytes + y.nbytes, 1))
+    try:
+        np.ndarray(X.shape, dtype=np.float64, buffer=block.buf)[:] = X
+        np.ndarray(y.shape, dtype=np.float64, buffer=block.buf, offset=X.nbytes)[:] = y
+        with ProcessPoolExecutor(max_workers=n_jobs,
+                                 initializer=_attach_shared_cv_arrays,
+                                 initargs=(block.name, X.shape, len(y))) as executor:
+            futures = [executor.submit(_score_shared_fold, model, train_idx, test_idx)
+                       for train_idx, test_idx in splits]
+            return [future.result() for future in futures]
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _expanding_ols_scores(X: np.ndarray, y: np.ndarray, cv_splits) -> Optional[List[float]]:
+    """
+    Score expanding-window folds with one running least-squares fit
+    
+    Keeps the triangular factor R of [1 | X | y] (R'R is the running
+    X'X/X'y cross-product matrix) and folds in only the rows added since
+    the previous fold, a rank-k QR update. The block of R below the
+    intercept row is the factor of the centered data, so each fold solves
+    exactly the centered least-squares problem LinearRegression solves,
+    at O(k p^2 + p^3) per fold instead of O(n p^2) and without squaring
+    the condition number as raw normal equations would.
+    
+    Args:
+        X: Feature matrix
+        y: Target vector
+        cv_splits: (train_idx, test_idx) pairs whose training sets are
+            growing prefixes ``0..end``
+        
+    Returns:
+        List of per-fold mean squared errors, or None when the splits are
+        not expanding prefixes (callers then fall back to refitting)
+    """
+    n_features = X.shape[1]
+    R = np.empty((0, n_features + 2))
+    sums = np.zeros(n_features + 1)
+    count = 0
+    scores = []
+    
+    for train_idx, test_idx in cv_splits:
+        train_idx = _as_slice(train_idx)
+        if not isinstance(train_idx, slice) or train_idx.start != 0:
+            return None
+        end = train_idx.stop
+        if end == 0 or end < count:
+            return None
+        
+        if end > count:
+            batch = np.column_stack([np.ones(end - count), X[count:end], y[count:end]])
+            R = np.linalg.qr(np.vstack([R, batch]), mode='r')
+            sums += batch[:, 1:].sum(axis=0)
+            count = end
+        
+        centered_R = R[1:, 1:]
+        coef = np.linalg.lstsq(centered_R[:, :n_features], centered_R[:, n_features],
+                               rcond=np.finfo(float).eps)[0]
+        means = sums / count
+        intercept = means[n_features] - means[:n_features] @ coef
+        
+        residuals = y[test_idx] - (X[test_idx] @ coef + intercept)
+        scores.append(float(np.mean(residuals ** 2)))
+    
+    return scores
+
+
+def _regime_change_mask(frame: pd.DataFrame, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flag rows where a rolling mean or rolling std jumps above its 95th percentile
+    
+    Only rows in ``[window, len - window)`` can be flagged.
+    
+    Returns:
+        (mask, absolute rolling-mean changes, absolute rolling-std changes),
+        each shaped like ``frame``
+    """
+    rolling_mean, rolling_std = rolling_moments(frame.to_numpy(dtype=float, na_value=np.nan), window)
+    mean_values = np.abs(np.diff(rolling_mean, axis=0, prepend=np.nan))
+    std_values = np.abs(np.diff(rolling_std, axis=0, prepend=np.nan))
+    
+    with warnings.catch_warnings():
+        # All-NaN columns have no threshold (and can never be flagged)
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean_threshold = np.nanquantile(mean_values, 0.95, axis=0)
+        std_threshold = np.nanquantile(std_values, 0.95, axis=0)
+    
+    with np.errstate(invalid='ignore'):
+        mask = (mean_values > mean_threshold) | (std_values > std_threshold)
+    mask[:window] = False
+    mask[max(len(frame) - window, window):] = False
+    
+    return mask, mean_values, std_values
+
+
+class CusumDetector:
+    """
+    Online two-sided CUSUM change-point detector
+    
+    The first ``warmup`` observations after a start or an alarm estimate the
+    reference mean and standard deviation; afterwards each observation is
+    standardized and accumulated into upper/lower CUSUM statistics. An
+    alarm fires when either exceeds ``threshold`` (in standard deviations),
+    and the detector re-arms with a fresh warm-up. State persists across
+    update() calls, so the detector can consume a stream in any batch sizes.
+    """
+    
+    def __init__(self, threshold: float = 5.0, drift: float = 0.5, warmup: int = 20):
+        """
+        Args:
+            threshold: Alarm level h for the cumulative sums
+            drift: Allowance k subtracted at every step (half the shift size
+                to detect, in standard deviations)
+            warmup: Observations used to estimate the reference level
+        """
+        self.threshold = threshold
+        self.drift = drift
+        self.warmup = max(2, warmup)
+        self.n_seen = 0
+        self.alarms: List[int] = []
+        self.alarm_directions: List[str] = []
+        self._start_regime()
+    
+    def _start_regime(self):
+        """Forget the current reference level and start a new warm-up"""
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._upper = 0.0
+        self._lower = 0.0
+    
+    def update(self, values) -> np.ndarray:
+        """
+        Consume new observations
+        
+        Args:
+            values: Iterable of floats (NaN values are skipped)
+            
+        Returns:
+            Array of positions (relative to this call's input) that raised an
+            alarm; absolute stream positions accumulate in ``self.alarms``
+        """
+        values = np.asarray(values, dtype=float)
+        alarms = []
+        for position, value in enumerate(values):
+            if np.isnan(value):
+                continue
+            if self._count < self.warmup:
+                # Welford warm-up for the reference level
+                self._count += 1
+                delta = value - self._mean
+                self._mean += delta / self._count
+                self._m2 += delta * (value - self._mean)
+                continue
+            
+            std = np.sqrt(self._m2 / (self._count - 1))
+            z = (value - self._mean) / std if std > 0 else 0.0
+            self._upper = max(0.0, self._upper + z - self.drift)
+            self._lower = max(0.0, self._lower - z - self.drift)
+            
+            if self._upper > self.threshold or self._lower > self.threshold:
+                alarms.append(position)
+                self.alarms.append(self.n_seen + position)
+                self.alarm_directions.append('up' if self._upper > self.threshold else 'down')
+                self._start_regime()
+        
+        self.n_seen += len(values)
+        return np.asarray(alarms, dtype=np.int64)
+
+
+def _iter_chunks(source: Union[str, Path, Iterable[pd.DataFrame]], chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrame chunks from a file path or an iterable of chunks
+    
+    CSV files are read with pandas' chunked reader; Parquet and Feather
+    (Arrow IPC) files are read batch by batch through pyarrow.
+    """
+    if not isinstance(source, (str, Path)):
+        yield from source
+        return
+    
+    path = Path(source)
+    suffix = ''.join(path.suffixes[-2:]).lower()
+    
+    if suffix.endswith(('.csv', '.csv.gz', '.csv.bz2', '.csv.zip', '.csv.xz')):
+        yield from pd.read_csv(path, chunksize=chunksize)
+        return
+    
+    if path.suffix.lower() in ('.parquet', '.pq', '.feather', '.arrow', '.ipc'):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to read Parquet/Feather files in chunks")
+        if path.suffix.lower() in ('.parquet', '.pq'):
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            reader = pa_ipc.open_file(path)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pandas()
+        return
+    
+    raise ValueError(f"Unsupported file type for chunked analysis: {path.name}")
+
+
+def _adf_test(values: np.ndarray):
+    """ADF test on one return series; returns (statistic, p-value) or an error message"""
+    _require('adfuller')
+    try:
+        adf_result = adfuller(values)
+        return float(adf_result[0]), float(adf_result[1])
+    except Exception as e:
+        return str(e)
+
+
+def _run_adf_tests(series_values: List[np.ndarray], n_jobs: int = 1) -> List[Any]:
+    """Run _adf_test over many series, in a process pool when n_jobs != 1"""
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(series_values))
+    
+    if n_jobs <= 1:
+        return [_adf_test(values) for values in series_values]
+    
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        chunksize = max(1, len(series_values) // (4 * n_jobs))
+        return list(executor.map(_adf_test, series_values, chunksize=chunksize))
+
+
+_SAMPLE_TEXT_TEMPLATES = np.array([
+    "This is a parody analysis #",
+    "Fake news about market #",
+    "Regular market analysis #"
+], dtype=object)
+
+
+def iter_sample_financial_data(n_samples: int = 100,
+                               chunksize: Optional[int] = None,
+                               n_symbols: int = 1,
+                               seed: int = 42,
+                               start: str = '2020-01-01',
+                               freq: str = 'D',
+                               drift: float = 0.0002,
+                               volatility: float = 0.02,
+                               regimes: Optional[List[Dict[str, float]]] = None,
+                               volatility_clustering: float = 0.0,
+                               parody_rate: float = 0.05,
+                               fake_rate: float = 0.03) -> Iterator[pd.DataFrame]:
+    """
+    Generate sample financial data in chunks of at most ``chunksize`` rows
+    
+    Prices are the cumulative product of a drawn return vector and text
+    markers are drawn with ``Generator.choice``; each quantity has its own
+    random stream, so the concatenated chunks are identical for any
+    ``chunksize``.
+    
+    Args:
+        n_samples: Number of timestamps to generate
+        chunksize: Timestamps per chunk (defaults to all of them)
+        n_symbols: Number of symbols; above 1 the chunks are long-format
+            panels indexed by (timestamp, symbol)
+        seed: Seed for reproducible output
+        start: First timestamp
+        freq: Timestamp frequency (use e.g. 'min' for very long series)
+        drift: Per-step mean return (the default, volatility ** 2 / 2, keeps
+            log prices driftless)
+        volatility: Per-step return volatility
+        regimes: Optional list of {'length', 'drift', 'volatility'} dicts,
+            cycled over the series in place of drift/volatility
+        volatility_clustering: Persistence in [0, 1) of a log-volatility
+            AR(1) process scaling the returns; 0 disables clustering
+        parody_rate: Probability of a parody marker per row
+        fake_rate: Probability of a fake marker for rows without a parody marker
+        
+    Yields:
+        DataFrame chunks with price, volume, returns and text_analysis columns
+    """
+    if n_samples < 1:
+        raise ValueError("n_samples must be at least 1")
+    if n_symbols < 1:
+        raise ValueError("n_symbols must be at least 1")
+    if not 0.0 <= volatility_clustering < 1.0:
+        raise ValueError("volatility_clustering must be in [0, 1)")
+    
+    chunksize = chunksize or n_samples
+    return_rng, cluster_rng, volume_rng, text_rng = [
+        np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(4)
+    ]
+    
+    text_probs = [parody_rate, (1 - parody_rate) * fake_rate]
+    text_probs.append(1.0 - sum(text_probs))
+    
+    if regimes:
+        regime_ends = np.cumsum([int(regime['length']) for regime in regimes])
+        regime_drift = np.array([regime.get('drift', drift) for regime in regimes])
+        regime_vol = np.array([regime.get('volatility', volatility) for regime in regimes])
+    
+    # Log-volatility follows h_t = phi * h_{t-1} + (1 - phi) * x_t, which is
+    # exactly pandas' adjust=False EWM; x_t is scaled so that std(h) = vol_of_vol
+    phi = volatility_clustering
+    vol_of_vol = 0.5
+    cluster_scale = vol_of_vol * np.sqrt(1 - phi ** 2) / (1 - phi)
+    
+    step = pd.tseries.frequencies.to_offset(freq)
+    origin = pd.Timestamp(start)
+    symbols = [f"SYM{i:03d}" for i in range(n_symbols)]
+    last_price = np.full(n_symbols, 100.0)
+    log_vol = np.zeros(n_symbols)
+    
+    for lo in range(0, n_samples, chunksize):
+        hi = min(lo + chunksize, n_samples)
+        positions = np.arange(lo, hi)
+        shape = (hi - lo, n_symbols)
+        
+        if regimes:
+            regime = np.searchsorted(regime_ends, positions % regime_ends[-1], side='right')
+            step_drift = regime_drift[regime][:, None]
+            step_vol = regime_vol[regime][:, None]
+        else:
+            step_drift, step_vol = drift, volatility
+        
+        step_returns = step_drift + step_vol * return_rng.standard_normal(shape)
+        
+        if phi > 0:
+            innovations = cluster_rng.standard_normal(shape) * cluster_scale
+            path = pd.DataFrame(np.vstack([log_vol, innovations])).ewm(alpha=1 - phi, adjust=False).mean()
+            path = path.to_numpy()[1:]
+            log_vol = path[-1]
+            step_returns *= np.exp(path - vol_of_vol ** 2 / 2)
+        
+        if lo == 0:
+            step_returns[0] = 0.0
+        prices = last_price * np.cumprod(1 + step_returns, axis=0)
+        last_price = prices[-1]
+        
+        returns = step_returns
+        if lo == 0:
+            returns[0] = np.nan
+        
+        volume = volume_rng.lognormal(10, 0.5, shape)
+        markers = text_rng.choice(len(_SAMPLE_TEXT_TEMPLATES), size=shape, p=text_probs)
+        labels = np.repeat(positions.astype(str).astype(object), n_symbols)
+        text = _SAMPLE_TEXT_TEMPLATES[markers.ravel()] + labels
+        
+        dates = pd.date_range(origin + lo * step, periods=hi - lo, freq=step, name='timestamp')
+        if n_symbols == 1:
+            index = dates
+        else:
+            index = pd.MultiIndex.from_product([dates, symbols], names=['timestamp', 'symbol'])
+        
+        yield pd.DataFrame({
+            'price': prices.ravel(),
+            'volume': volume.ravel(),
+            'returns': returns.ravel(),
+            'text_analysis': text
+        }, index=index)
+
+
+def create_sample_financial_data(n_samples: int = 100, **kwargs) -> pd.DataFrame:
     """
     Create sample financial data for testing the IntertemporalAnalyzer
     
     Args:
         n_samples: Number of samples to generate
+        **kwargs: Generator options (n_symbols, seed, freq, regimes,
+            volatility_clustering, ...); see iter_sample_financial_data
         
     Returns:
         DataFrame with sample financial data
     """
-    np.random.seed(42)  # For reproducible results
-    
-    dates = pd.date_range(start='2020-01-01', periods=n_samples, freq='D')
-    
-    # Generate correlated price series with some trending behavior
-    base_price = 100
-    prices = [base_price]
-    
-    for i in range(1, n_samples):
-        # Add trend and noise
-        trend = 0.001 * i  # Small upward trend
-        noise = np.random.normal(0, 0.02)  # 2% daily volatility
-        price_change = trend + noise
-        new_price = prices[-1] * (1 + price_change)
-        prices.append(new_price)
-    
-    # Add some parody/fake markers randomly
-    text_data = []
-    for i in range(n_samples):
-        if np.random.random() < 0.05:  # 5% chance of parody marker
-            text_data.append(f"This is a parody analysis #{i}")
-        elif np.random.random() < 0.03:  # 3% chance of fake marker
-            text_data.append(f"Fake news about market #{i}")
-        else:
-            text_data.append(f"Regular market analysis #{i}")
-    
-    df = pd.DataFrame({
-        'price': prices,
-        'volume': np.random.lognormal(10, 0.5, n_samples),
-        'returns': pd.Series(prices).pct_change(),
-        'text_analysis': text_data,
-        'timestamp': dates
-    })
-    
-    df.set_index('timestamp', inplace=True)
-    return df
+    kwargs.pop('chunksize', None)
+    return next(iter_sample_financial_data(n_samples, **kwargs))
+
+
+def write_sample_financial_data(path: Union[str, Path],
+                                n_samples: int,
+                                chunksize: int = 1_000_000,
+                                **kwargs) -> Path:
+    """
+    Write sample financial data to disk chunk by chunk
+    
+    Memory use is bounded by ``chunksize`` regardless of ``n_samples``.
+    The index is written as regular columns.
+    
+    Args:
+        path: Output file (.csv, .csv.gz, .parquet or .feather/.arrow)
+        n_samples: Number of timestamps to generate
+        chunksize: Timestamps generated and written per chunk
+        **kwargs: Generator options; see iter_sample_financial_data
+        
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    suffix = ''.join(path.suffixes[-2:]).lower()
+    chunks = (chunk.reset_index() for chunk in iter_sample_financial_data(n_samples, chunksize, **kwargs))
+    
+    if suffix.endswith(('.csv', '.csv.gz')):
+        opener = gzip.open if suffix.endswith('.gz') else open
+        with opener(path, 'wt', newline='') as handle:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(handle, header=(i == 0), index=False)
+        return path
+    
+    if path.suffix.lower() in ('.parquet', '.pq', '.feather', '.arrow', '.ipc'):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to write Parquet/Feather files")
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    if path.suffix.lower() in ('.parquet', '.pq'):
+                        writer = pq.ParquetWriter(path, table.schema)
+                    else:
+                        writer = pa_ipc.new_file(str(path), table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+    
+    raise ValueError(f"Unsupported file type for sample data: {path.name}")
 
 
 if __name__ == "__main__":
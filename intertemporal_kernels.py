@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Shared Single-Pass Kernels for Intertemporal Analysis
+
+Differences, returns, squared returns, rolling moments and lag
+correlations used by the IntertemporalAnalyzer stages. Each kernel works
+on a whole (rows x columns) panel at once; ``series_kernels`` computes all
+per-series quantities of one analysis in a single traversal so the
+differential, volatility and regime stages share them instead of each
+re-scanning the data.
+
+Numba is used when installed; otherwise the pure-NumPy implementations
+give the same results.
+"""
+
+import functools
+import importlib.util
+import numpy as np
+from typing import Dict, Optional, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+
+# Rows per block in the NumPy rolling fallback; bounds the (rows x window)
+# temporaries to a few MB per column
+_ROLLING_BLOCK_ROWS = 1 << 15
+
+
+def _as_panel(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    return values[:, np.newaxis] if values.ndim == 1 else values
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value of each column forward (leading NaNs stay NaN)"""
+    values = _as_panel(values)
+    positions = np.where(np.isnan(values), 0, np.arange(len(values))[:, np.newaxis])
+    np.maximum.accumulate(positions, axis=0, out=positions)
+    return np.take_along_axis(values, positions, axis=0)
+
+
+def _rolling_moments_numpy(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    n_samples, n_columns = values.shape
+    mean = np.full((n_samples, n_columns), np.nan)
+    std = np.full((n_samples, n_columns), np.nan)
+    if window < 1 or n_samples < window:
+        return mean, std
+    
+    windows = sliding_window_view(values, window, axis=0)
+    for start in range(0, len(windows), _ROLLING_BLOCK_ROWS):
+        block = windows[start:start + _ROLLING_BLOCK_ROWS]
+        rows = slice(start + window - 1, start + window - 1 + len(block))
+        block_mean = block.mean(axis=-1)
+        mean[rows] = block_mean
+        if window > 1:
+            deviations = block - block_mean[..., np.newaxis]
+            std[rows] = np.sqrt(np.einsum('ijk,ijk->ij', deviations, deviations) / (window - 1))
+    return mean, std
+
+
+def _fused_numpy(values: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+    diff = np.full_like(values, np.nan)
+    diff[1:] = values[1:] - values[:-1]
+    
+    # pandas pct_change semantics: returns over forward-filled prices
+    filled = forward_fill(values)
+    returns = np.full_like(values, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[1:] = filled[1:] / filled[:-1] - 1
+    
+    squared = returns * returns
+    _, volatility = _rolling_moments_numpy(returns, window)
+    return {'diff': diff, 'returns': returns, 'squared_returns': squared, 'rolling_volatility': volatility}
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_kernels():
+    """Compile the Numba kernels on first use (importing numba is slow)"""
+    from numba import njit
+    
+    @njit(cache=True)
+    def _rolling_moments_numba(values, window):
+        # Two-pass moments per window: O(rows x window) but exact, unlike
+        # add/remove updates that drift over long series
+        n_samples, n_columns = values.shape
+        mean = np.full((n_samples, n_columns), np.nan)
+        std = np.full((n_samples, n_columns), np.nan)
+        for j in range(n_columns):
+            nans = 0
+            for i in range(n_samples):
+                if np.isnan(values[i, j]):
+                    nans += 1
+                if i >= window and np.isnan(values[i - window, j]):
+                    nans -= 1
+                if i < window - 1 or nans > 0:
+                    continue
+                
+                total = 0.0
+                for t in range(i - window + 1, i + 1):
+                    total += values[t, j]
+                window_mean = total / window
+                mean[i, j] = window_mean
+                
+                if window > 1:
+                    ss = 0.0
+                    for t in range(i - window + 1, i + 1):
+                        ss += (values[t, j] - window_mean) ** 2
+                    std[i, j] = np.sqrt(ss / (window - 1))
+        return mean, std
+    
+    @njit(cache=True)
+    def _fused_numba(values, window):
+        n_samples, n_columns = values.shape
+        diff = np.full((n_samples, n_columns), np.nan)
+        returns = np.full((n_samples, n_columns), np.nan)
+        for j in range(n_columns):
+            last = values[0, j]
+            for i in range(1, n_samples):
+                x = values[i, j]
+                diff[i, j] = x - values[i - 1, j]
+                filled = last if np.isnan(x) else x
+                returns[i, j] = filled / last - 1
+                last = filled
+        squared = returns * returns
+        _, volatility = _rolling_moments_numba(returns, window)
+        return diff, returns, squared, volatility
+    
+    return _rolling_moments_numba, _fused_numba
+
+
+def rolling_moments(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling mean and sample standard deviation of every column
+    
+    Matches ``DataFrame.rolling(window).mean()/.std()``: a row is NaN until
+    the window is full and whenever the window contains a NaN.
+    
+    Args:
+        values: 2-D array (rows x columns) or 1-D series
+        window: Window length
+    
+    Returns:
+        (mean, std), each shaped (rows x columns)
+    """
+    values = _as_panel(values)
+    if NUMBA_AVAILABLE and window >= 1:
+        return _numba_kernels()[0](np.ascontiguousarray(values), window)
+    return _rolling_moments_numpy(values, window)
+
+
+def series_kernels(values: np.ndarray,
+                   volatility_window: Optional[int] = 5,
+                   max_lag: int = 0,
+                   clustering_lags: int = 5) -> Dict[str, np.ndarray]:
+    """
+    Per-series quantities shared by the analysis stages, computed once
+    
+    Args:
+        values: 2-D array (rows x columns) or 1-D series; NaN marks missing
+        volatility_window: Window for the rolling volatility of returns;
+            None computes only the differences and level autocorrelations
+        max_lag: Lags for the level autocorrelations
+        clustering_lags: Lags for the squared-return autocorrelations
+    
+    Returns:
+        Dictionary with 'diff', 'returns' (pct change of forward-filled
+        values), 'squared_returns', 'rolling_volatility', 'lag_correlations'
+        (max_lag x columns) and 'squared_return_correlations'
+        (clustering_lags x columns)
+    """
+    values = _as_panel(values)
+    if volatility_window is None:
+        diff = np.full_like(values, np.nan)
+        diff[1:] = values[1:] - values[:-1]
+        return {'diff': diff, 'lag_correlations': lagged_autocorrelation_matrix(values, max_lag)}
+    
+    if NUMBA_AVAILABLE and len(values) > 0 and volatility_window >= 1:
+        diff, returns, squared, volatility = _numba_kernels()[1](np.ascontiguousarray(values), volatility_window)
+        kernels = {'diff': diff, 'returns': returns, 'squared_returns': squared, 'rolling_volatility': volatility}
+    else:
+        kernels = _fused_numpy(values, volatility_window)
+    
+    kernels['lag_correlations'] = lagged_autocorrelation_matrix(values, max_lag)
+    kernels['squared_return_correlations'] = lagged_autocorrelation_matrix(kernels['squared_returns'], clustering_lags)
+    return kernels
+
+
+def select_columns(kernels: Dict[str, np.ndarray], columns) -> Dict[str, np.ndarray]:
+    """Restrict series_kernels output to a subset of columns"""
+    return {name: array[:, columns] for name, array in kernels.items()}
+
+
+def lag_matrix(values: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Lagged copies of one or more columns as a strided window view
+    
+    Row ``t`` holds the ``max_lag`` values preceding ``values[t + max_lag]``,
+    so it lines up with ``values[max_lag:]`` as the regression target.
+    Missing values are passed through; callers drop incomplete rows.
+    
+    Args:
+        values: 1-D series or 2-D array (rows x columns)
+        max_lag: Number of lags
+        
+    Returns:
+        For a 1-D series, a zero-copy (n - max_lag, max_lag) view with
+        lag k in column k - 1. For a 2-D array, an (n - max_lag,
+        n_columns * max_lag) matrix ordered column by column (col0 lag 1..max_lag,
+        col1 lag 1..max_lag, ...); flattening the windows makes this one copy.
+    """
+    values = np.asarray(values, dtype=float)
+    max_lag = int(max_lag)
+    n_rows = max(len(values) - max_lag, 0)
+    if max_lag <= 0 or n_rows == 0:
+        shape = values.shape[1:] if values.ndim > 1 else ()
+        return np.empty((n_rows, int(np.prod(shape, dtype=int)) * max(max_lag, 0)))
+    
+    # windows[t, ..., j] = values[t + j]; reversing the window axis puts lag 1 first
+    windows = sliding_window_view(values[:-1], max_lag, axis=0)[..., ::-1]
+    if values.ndim == 1:
+        return windows
+    return windows.reshape(n_rows, -1)
+
+
+def lagged_autocorrelation_matrix(values: np.ndarray,
+                                  max_lag: int,
+                                  method: str = 'auto') -> np.ndarray:
+    """
+    Compute lag-k Pearson correlations for every column of a panel at once
+    
+    Entry ``[k-1, j]`` equals ``s.corr(s.shift(k))`` for column ``j``: missing
+    values are excluded pairwise, exactly as pandas does. Every required
+    lagged sum (pair counts, first and second moments, cross products) is a
+    cross-correlation of masked columns, so the whole lag x column matrix is
+    built from a handful of vectorized products.
+    
+    Args:
+        values: 2-D array (rows x columns) or 1-D series; NaN marks missing
+        max_lag: Largest lag to compute
+        method: 'direct' (one strided product per lag), 'fft' (zero-padded
+            FFT cross-correlation, best for long series with many lags) or
+            'auto' to pick between them
+    
+    Returns:
+        Array of shape (max_lag, n_columns); NaN where a correlation is
+        undefined (constant or too short overlap)
+    """
+    values = _as_panel(values)
+    
+    n_samples, n_columns = values.shape
+    max_lag = max(0, min(int(max_lag), n_samples - 1))
+    if max_lag == 0 or n_columns == 0:
+        return np.full((max_lag, n_columns), np.nan)
+    
+    if method == 'auto':
+        method = 'fft' if max_lag > 8 * np.log2(n_samples) else 'direct'
+    if method not in ('direct', 'fft'):
+        raise ValueError(f"Unknown autocorrelation method: {method}")
+    
+    mask = ~np.isnan(values)
+    present = mask.astype(float)
+    
+    # Center on the column mean first; correlation is shift-invariant and this
+    # keeps the one-pass moment formulas numerically stable
+    counts = present.sum(axis=0)
+    sums = np.where(mask, values, 0.0).sum(axis=0)
+    col_means = np.divide(sums, counts, out=np.zeros(n_columns), where=counts > 0)
+    centered = np.where(mask, values - col_means, 0.0)
+    centered_sq = centered * centered
+    
+    lags = np.arange(1, max_lag + 1)
+    
+    if method == 'fft':
+        n_fft = 1 << int(n_samples + max_lag - 1).bit_length()
+        spectra = {
+            name: np.fft.rfft(arr, n=n_fft, axis=0)
+            for name, arr in (('m', present), ('a', centered), ('a2', centered_sq))
+        }
+        
+        def lagged_sum(lead: str, follow: str) -> np.ndarray:
+            # sum_t lead[t] * follow[t + k]
+            product = np.conj(spectra[lead]) * spectra[follow]
+            return np.fft.irfft(product, n=n_fft, axis=0)[lags]
+    else:
+        arrays = {'m': present, 'a': centered, 'a2': centered_sq}
+        
+        def lagged_sum(lead: str, follow: str) -> np.ndarray:
+            head, tail = arrays[lead], arrays[follow]
+            return np.stack([
+                np.einsum('ij,ij->j', head[:n_samples - k], tail[k:]) for k in lags
+            ])
+    
+    n_pairs = lagged_sum('m', 'm')
+    sum_x = lagged_sum('m', 'a')
+    sum_y = lagged_sum('a', 'm')
+    sum_xx = lagged_sum('m', 'a2')
+    sum_yy = lagged_sum('a2', 'm')
+    sum_xy = lagged_sum('a', 'a')
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n_pairs = np.round(n_pairs)
+        cov = sum_xy - sum_x * sum_y / n_pairs
+        var_x = sum_xx - sum_x * sum_x / n_pairs
+        var_y = sum_yy - sum_y * sum_y / n_pairs
+        denom = np.sqrt(var_x * var_y)
+        corr = cov / denom
+    
+    # Mirror pandas: undefined for fewer than two pairs or zero variance
+    scale = np.maximum(sum_xx, sum_yy)
+    degenerate = (n_pairs < 2) | (var_x <= 1e-14 * scale) | (var_y <= 1e-14 * scale)
+    corr[degenerate] = np.nan
+    
+    return np.clip(corr, -1.0, 1.0)
+
+
+def grouped_lag_correlations(values: np.ndarray,
+                             codes: np.ndarray,
+                             n_groups: int,
+                             max_lag: int) -> np.ndarray:
+    """
+    Lag-k Pearson correlations of every column within every group at once
+    
+    Rows must be sorted by group. Entry ``[k-1, g, j]`` equals
+    ``s.corr(s.shift(k))`` for column ``j`` restricted to the rows of group
+    ``g``, with missing values excluded pairwise like pandas. Pair sums for
+    all groups and columns are accumulated with one segmented reduction per
+    moment.
+    
+    Args:
+        values: 2-D array (rows x columns); NaN marks missing
+        codes: Group code (0..n_groups-1) of each row, non-decreasing
+        n_groups: Number of groups
+        max_lag: Largest lag to compute
+    
+    Returns:
+        Array of shape (max_lag, n_groups, n_columns); NaN where undefined
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    codes = np.asarray(codes)
+    n_samples, n_columns = values.shape
+    corr = np.full((max_lag, n_groups, n_columns), np.nan)
+    
+    def group_sums(group, weights):
+        # Rows are sorted by group, so each group is one contiguous segment;
+        # the zero row keeps trailing empty groups in bounds
+        starts = np.searchsorted(group, np.arange(n_groups))
+        sums = np.add.reduceat(np.vstack([weights, np.zeros((1, n_columns))]), starts, axis=0)
+        sums[starts == np.append(starts[1:], len(group))] = 0.0
+        return sums
+    
+    # Center on group means for numerically stable one-pass moments
+    mask = ~np.isnan(values)
+    counts = group_sums(codes, mask.astype(float))
+    means = np.divide(group_sums(codes, np.where(mask, values, 0.0)), counts,
+                      out=np.zeros_like(counts), where=counts > 0)
+    centered = np.where(mask, values - means[codes], np.nan)
+    
+    for k in range(1, min(max_lag, n_samples - 1) + 1):
+        head, tail = centered[:-k], centered[k:]
+        valid = (codes[:-k] == codes[k:])[:, None] & ~np.isnan(head) & ~np.isnan(tail)
+        x = np.where(valid, head, 0.0)
+        y = np.where(valid, tail, 0.0)
+        group = codes[k:]
+        
+        n_pairs = group_sums(group, valid.astype(float))
+        sum_x, sum_y = group_sums(group, x), group_sums(group, y)
+        sum_xx, sum_yy = group_sums(group, x * x), group_sums(group, y * y)
+        sum_xy = group_sums(group, x * y)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = sum_xy - sum_x * sum_y / n_pairs
+            var_x = sum_xx - sum_x * sum_x / n_pairs
+            var_y = sum_yy - sum_y * sum_y / n_pairs
+            lag_corr = cov / np.sqrt(var_x * var_y)
+        
+        scale = np.maximum(sum_xx, sum_yy)
+        degenerate = (n_pairs < 2) | (var_x <= 1e-14 * scale) | (var_y <= 1e-14 * scale)
+        lag_corr[degenerate] = np.nan
+        corr[k - 1] = np.clip(lag_corr, -1.0, 1.0)
+    
+    return corr
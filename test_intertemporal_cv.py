@@ -7,7 +7,12 @@ the COMBSEC system as specified in the ChatGPT document.
 """
 
 import unittest
+import warnings
+import contextlib
+import io
 import sys
+import tempfile
+from dataclasses import replace
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -17,7 +22,17 @@ from datetime import datetime, timedelta
 repo_root = Path(__file__).parent
 sys.path.insert(0, str(repo_root))
 
-from intertemporal_cv import IntertemporalAnalyzer, create_sample_financial_data
+from intertemporal_cv import (
+    IntertemporalAnalyzer,
+    AnalysisResult,
+    create_sample_financial_data,
+    iter_sample_financial_data,
+    write_sample_financial_data,
+    frame_fingerprint,
+    ParodyMatcher,
+    CusumDetector
+)
+from intertemporal_kernels import series_kernels, rolling_moments, lag_matrix, lagged_autocorrelation_matrix
 from ACTNEWWORLDODOR.emoji_combsec_generator import EmojiCombsecGenerator
 
 
@@ -75,6 +90,273 @@ class TestIntertemporalAnalyzer(unittest.TestCase):
         price_diff_key = next((k for k in temp_diffs.keys() if 'price_temporal_delta' in k), None)
         self.assertIsNotNone(price_diff_key)
         
+    def test_batched_lag_correlations_match_pandas(self):
+        """Test batched lag correlations against per-column Series.corr"""
+        data = self.sample_data.copy()
+        data.loc[data.index[::4], 'volume'] = np.nan
+        
+        temp_diffs = self.analyzer._calculate_temporal_differentials(data)
+        
+        for col in ['price', 'volume', 'returns']:
+            for entry in temp_diffs[f'{col}_rolling_correlations']:
+                expected = data[col].corr(data[col].shift(entry['lag']))
+                self.assertAlmostEqual(entry['correlation'], expected, places=10)
+        
+    def test_autocorrelation_matrix_view(self):
+        """Test dense autocorrelation view and configurable max lag"""
+        data = create_sample_financial_data(200)
+        results = self.analyzer.analyze_temporal_diffs(
+            data=data,
+            cv_method='time_series',
+            parody_detection=False,
+            max_lag=12
+        )
+        
+        view = results['autocorrelation_matrix']
+        self.assertEqual(view['columns'], ['price', 'volume', 'returns'])
+        self.assertEqual(view['matrix'].shape, (12, 3))
+        self.assertEqual(len(results['temporal_differentials']['price_rolling_correlations']), 12)
+        
+        values = data[view['columns']].to_numpy()
+        np.testing.assert_allclose(
+            lagged_autocorrelation_matrix(values, 12, method='fft'),
+            lagged_autocorrelation_matrix(values, 12, method='direct'),
+            rtol=1e-8
+        )
+        
+    def test_columnar_result_export(self):
+        """Test the columnar result container, its dict view and Arrow export"""
+        data = create_sample_financial_data(120)
+        nested = self.analyzer.analyze_temporal_diffs(data, target_column='price')
+        columnar = self.analyzer.analyze_temporal_diffs(data, target_column='price', result_format='columnar')
+        
+        self.assertIsInstance(columnar, AnalysisResult)
+        self.assertEqual(columnar.columns, ['price', 'volume', 'returns'])
+        converted = columnar.to_dict()
+        self.assertEqual(set(converted), set(nested))
+        self.assertEqual(converted['temporal_differentials'].keys(), nested['temporal_differentials'].keys())
+        self.assertAlmostEqual(
+            converted['temporal_differentials']['price_temporal_delta']['std'],
+            nested['temporal_differentials']['price_temporal_delta']['std']
+        )
+        
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow not available")
+        
+        table = columnar.to_arrow()
+        self.assertEqual(table.num_rows, 3)
+        self.assertIn('lag5_corr', table.column_names)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = columnar.to_parquet(Path(tmp) / 'result.parquet')
+            self.assertTrue(pq.read_table(path).equals(table))
+        
+        # Non-string column labels are exported as strings
+        labeled = replace(columnar, columns=[0, ('price', 'close'), 'returns'])
+        self.assertEqual(labeled.to_arrow().column('column').to_pylist(), ['0', "('price', 'close')", 'returns'])
+    
+    def test_shared_kernels_match_pandas(self):
+        """Test the single-pass kernels against the pandas operations they replace"""
+        import intertemporal_kernels
+        
+        frame = create_sample_financial_data(300)[['price', 'volume']]
+        frame.iloc[[0, 40, 41, 200], 0] = np.nan
+        values = frame.to_numpy()
+        
+        kernels = series_kernels(values, volatility_window=5, max_lag=3)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            returns = frame.pct_change()
+        np.testing.assert_allclose(kernels['diff'], frame.diff(), equal_nan=True)
+        np.testing.assert_allclose(kernels['returns'], returns, equal_nan=True)
+        np.testing.assert_allclose(kernels['rolling_volatility'], returns.rolling(5).std(), equal_nan=True)
+        np.testing.assert_allclose(
+            kernels['squared_return_correlations'],
+            lagged_autocorrelation_matrix((returns ** 2).to_numpy(), 5), equal_nan=True
+        )
+        
+        mean, std = rolling_moments(values, 20)
+        np.testing.assert_allclose(mean, frame.rolling(20).mean(), equal_nan=True)
+        np.testing.assert_allclose(std, frame.rolling(20).std(), equal_nan=True)
+        
+        if intertemporal_kernels.NUMBA_AVAILABLE:
+            fused = intertemporal_kernels._numba_kernels()[1](np.ascontiguousarray(values), 5)
+            np.testing.assert_allclose(fused[3], kernels['rolling_volatility'], equal_nan=True)
+    
+    def test_lag_matrix_matches_shift(self):
+        """Test the strided lag matrix against shifted columns"""
+        frame = create_sample_financial_data(50)[['price', 'volume']]
+        values = frame.to_numpy()
+        
+        lags = lag_matrix(values[:, 0], 4)
+        self.assertTrue(np.shares_memory(lags, values))
+        expected = pd.concat([frame['price'].shift(k) for k in range(1, 5)], axis=1).iloc[4:]
+        np.testing.assert_array_equal(lags, expected)
+        
+        both = lag_matrix(values, 2)
+        expected = pd.concat([frame[col].shift(k) for col in frame for k in (1, 2)], axis=1).iloc[2:]
+        np.testing.assert_array_equal(both, expected)
+        self.assertEqual(lag_matrix(values[:3, 0], 5).shape, (0, 5))
+    
+    def test_streaming_update_matches_batch(self):
+        """Test streaming update() against a full batch recomputation"""
+        data = create_sample_financial_data(120)
+        
+        for start in range(0, len(data), 25):
+            streaming = self.analyzer.update(data.iloc[start:start + 25], target_column='price')
+        
+        batch = self.analyzer._calculate_temporal_differentials(data)
+        self.assertEqual(streaming['rows_seen'], 120)
+        self.assertEqual(list(streaming['temporal_differentials']), list(batch))
+        
+        for key, expected in batch.items():
+            actual = streaming['temporal_differentials'][key]
+            if isinstance(expected, dict):
+                self.assertAlmostEqual(actual['mean'], expected['mean'], places=10)
+                self.assertAlmostEqual(actual['std'], expected['std'], places=10)
+            else:
+                np.testing.assert_allclose(
+                    [entry['correlation'] for entry in actual],
+                    [entry['correlation'] for entry in expected],
+                    rtol=1e-9
+                )
+        
+        volatility = self.analyzer._analyze_volatility_clustering(data['price'])
+        self.assertAlmostEqual(
+            streaming['volatility_analysis']['volatility_metrics']['mean_volatility'],
+            volatility['volatility_metrics']['mean_volatility'],
+            places=10
+        )
+        
+        parody = self.analyzer._detect_parody_patterns(data)
+        self.assertEqual(
+            streaming['parody_detection']['total_parody_indicators'],
+            parody['total_parody_indicators']
+        )
+        
+        self.analyzer.reset_stream()
+        self.assertIn('error', self.analyzer.get_streaming_results())
+        
+    def test_chunked_file_analysis(self):
+        """Test out-of-core analysis of a CSV file and an iterator of chunks"""
+        data = create_sample_financial_data(150)
+        in_memory = self.analyzer.analyze_temporal_diffs(
+            data=data, cv_method='time_series', target_column='price'
+        )
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "bars.csv"
+            data.to_csv(csv_path)
+            from_file = self.analyzer.analyze_temporal_diffs(
+                data=csv_path, cv_method='time_series', target_column='price', chunksize=40
+            )
+        
+        chunks = (data.iloc[start:start + 33] for start in range(0, len(data), 33))
+        from_iterator = self.analyzer.analyze_temporal_diffs(
+            data=chunks, cv_method='time_series', target_column='price'
+        )
+        
+        for chunked in (from_file, from_iterator):
+            self.assertTrue(chunked['chunked'])
+            self.assertEqual(chunked['data_shape'], data.shape)
+            self.assertEqual(list(chunked['temporal_differentials']), list(in_memory['temporal_differentials']))
+            self.assertAlmostEqual(
+                chunked['temporal_differentials']['price_temporal_delta']['std'],
+                in_memory['temporal_differentials']['price_temporal_delta']['std'],
+                places=8
+            )
+            np.testing.assert_allclose(
+                chunked['autocorrelation_matrix']['matrix'],
+                in_memory['autocorrelation_matrix']['matrix'],
+                rtol=1e-8
+            )
+            self.assertEqual(
+                chunked['parody_detection']['total_parody_indicators'],
+                in_memory['parody_detection']['total_parody_indicators']
+            )
+        self.assertIs(self.analyzer.autocorrelation_view, from_iterator['autocorrelation_matrix'])
+        
+        # result_format is honoured for chunked sources too
+        chunks = (data.iloc[start:start + 33] for start in range(0, len(data), 33))
+        columnar = self.analyzer.analyze_temporal_diffs(
+            data=chunks, cv_method='time_series', target_column='price', result_format='columnar'
+        )
+        self.assertIsInstance(columnar, AnalysisResult)
+        self.assertEqual(columnar.data_shape, data.shape)
+        self.assertEqual(list(columnar.temporal_differentials()), list(in_memory['temporal_differentials']))
+        np.testing.assert_allclose(columnar.lag_correlations, in_memory['autocorrelation_matrix']['matrix'], rtol=1e-8)
+        self.assertIs(self.analyzer.autocorrelation_view['matrix'], columnar.lag_correlations)
+        
+    def test_result_cache(self):
+        """Test fingerprint-keyed result caching in memory and on disk"""
+        analyzer = IntertemporalAnalyzer(cache_size=2)
+        first = analyzer.analyze_temporal_diffs(self.sample_data, target_column='price')
+        second = analyzer.analyze_temporal_diffs(self.sample_data.copy(), target_column='price')
+        
+        self.assertEqual(analyzer.result_cache.hits, 1)
+        self.assertEqual(first['cv_analysis'], second['cv_analysis'])
+        
+        # Different content or arguments miss the cache
+        changed = self.sample_data.copy()
+        changed.iloc[5, 0] += 1.0
+        analyzer.analyze_temporal_diffs(changed, target_column='price')
+        analyzer.analyze_temporal_diffs(self.sample_data, cv_method='blocked', target_column='price')
+        self.assertEqual(analyzer.result_cache.misses, 3)
+        self.assertEqual(len(analyzer.result_cache), 2)
+        self.assertNotEqual(frame_fingerprint(changed), frame_fingerprint(self.sample_data))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            IntertemporalAnalyzer(cache_dir=tmp).analyze_temporal_diffs(self.sample_data, target_column='price')
+            fresh = IntertemporalAnalyzer(cache_dir=tmp)
+            cached = fresh.analyze_temporal_diffs(self.sample_data, target_column='price')
+            self.assertEqual(fresh.result_cache.hits, 1)
+            self.assertEqual(cached['cv_analysis'], first['cv_analysis'])
+        
+    def test_result_cache_isolates_callers(self):
+        """Test that mutating a cached result does not leak into later hits"""
+        analyzer = IntertemporalAnalyzer(cache_size=4)
+        first = analyzer.analyze_temporal_diffs(self.sample_data, target_column='price')
+        expected = first['cv_analysis']['cv_scores'][:]
+        first['cv_analysis']['cv_scores'].append(-1.0)
+        first['autocorrelation_matrix']['matrix'][:] = 0.0
+        
+        second = analyzer.analyze_temporal_diffs(self.sample_data, target_column='price')
+        self.assertEqual(analyzer.result_cache.hits, 1)
+        self.assertEqual(second['cv_analysis']['cv_scores'], expected)
+        self.assertFalse((second['autocorrelation_matrix']['matrix'] == 0.0).all())
+        second['temporal_differentials'].clear()
+        self.assertTrue(analyzer.analyze_temporal_diffs(self.sample_data, target_column='price')['temporal_differentials'])
+        
+        # Unhashable object cells skip the cache instead of failing
+        tagged = self.sample_data.assign(tags=[['a']] * len(self.sample_data))
+        self.assertIn('cv_analysis', analyzer.analyze_temporal_diffs(tagged, target_column='price'))
+        self.assertEqual(len(analyzer.result_cache), 1)
+    
+    def test_instrumentation_spans(self):
+        """Test silent-by-default stage spans reported to an instrumentation hook"""
+        spans = []
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            analyzer = IntertemporalAnalyzer(instrumentation=spans.append, track_memory=True)
+            analyzer.analyze_temporal_diffs(self.sample_data, target_column='price')
+        
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertEqual(
+            [span['stage'] for span in spans],
+            ['kernels', 'differentials', 'cv', 'parody', 'volatility', 'analyze']
+        )
+        for span in spans:
+            self.assertGreaterEqual(span['seconds'], 0.0)
+            self.assertIsInstance(span['memory_delta_bytes'], int)
+        self.assertEqual(spans[-1]['rows'], len(self.sample_data))
+        
+        # Failing stages still report their span
+        with self.assertRaises(TypeError):
+            analyzer.get_regime_change_detection(None)
+        self.assertEqual(spans[-1]['stage'], 'regime_changes')
+        self.assertIn('error', spans[-1])
+    
     def test_cross_validation_methods(self):
         """Test different CV methods"""
         cv_methods = ['time_series', 'expanding_window', 'blocked']
@@ -94,6 +376,62 @@ class TestIntertemporalAnalyzer(unittest.TestCase):
                 cv_analysis = results['cv_analysis']
                 self.assertEqual(cv_analysis['method'], method)
                 
+    def test_parallel_cv_fold_ordering(self):
+        """Test thread/process fold executors reproduce serial CV scores"""
+        data = create_sample_financial_data(120)
+        serial = self.analyzer._perform_cross_validation(data, 'expanding_window', 'price')
+        
+        for backend in ['thread', 'process']:
+            with self.subTest(backend=backend):
+                parallel = self.analyzer._perform_cross_validation(
+                    data, 'expanding_window', 'price', n_jobs=2, cv_backend=backend
+                )
+                self.assertNotIn('error', parallel)
+                np.testing.assert_allclose(parallel['cv_scores'], serial['cv_scores'])
+        
+    def test_incremental_ols_matches_sklearn(self):
+        """Test closed-form expanding-window OLS against refitting per fold"""
+        rng = np.random.default_rng(7)
+        walk = pd.DataFrame({'value': 50 + rng.normal(size=600).cumsum()})
+        
+        for split_params in [None, {'min_train_size': 100, 'test_size': 1}]:
+            with self.subTest(split_params=split_params):
+                fast = self.analyzer._perform_cross_validation(
+                    walk, 'expanding_window', 'value', split_params=split_params
+                )
+                slow = self.analyzer._perform_cross_validation(
+                    walk, 'expanding_window', 'value',
+                    incremental_ols=False, split_params=split_params
+                )
+                
+                self.assertEqual(fast['solver'], 'incremental_ols')
+                self.assertEqual(slow['solver'], 'LinearRegression')
+                np.testing.assert_allclose(fast['cv_scores'], slow['cv_scores'], rtol=1e-8)
+        
+    def test_split_generators_yield_slices(self):
+        """Test lazy slice-based splitters and purge/embargo gaps"""
+        expanding = list(self.analyzer._expanding_window_splits(100))
+        self.assertEqual(expanding[0], (slice(0, 20), slice(20, 30)))
+        self.assertTrue(all(train.stop == test.start for train, test in expanding))
+        
+        blocked = list(self.analyzer._blocked_time_series_splits(100))
+        self.assertEqual(blocked, [(slice(0, 20), slice(24, 44)), (slice(44, 64), slice(68, 88))])
+        
+        purged = list(self.analyzer._purged_blocked_splits(200, block_size=30, purge_size=5, embargo_size=10))
+        for (train, test), (next_train, _) in zip(purged, purged[1:]):
+            self.assertEqual(test.start - train.stop, 5)
+            self.assertEqual(next_train.start - test.stop, 10)
+        
+        # Five million rows cost nothing to split
+        folds = self.analyzer._expanding_window_splits(5_000_000)
+        self.assertEqual(next(folds), (slice(0, 1_000_000), slice(1_000_000, 1_500_000)))
+        
+        results = self.analyzer._perform_cross_validation(
+            create_sample_financial_data(120), 'purged_blocked', 'price'
+        )
+        self.assertNotIn('error', results)
+        self.assertGreater(len(results['cv_scores']), 0)
+        
     def test_parody_detection(self):
         """Test parody detection functionality"""
         # Create data with parody markers
@@ -117,6 +455,44 @@ class TestIntertemporalAnalyzer(unittest.TestCase):
         # Should find at least the parody markers we added
         self.assertGreater(parody_results['total_parody_indicators'], 0)
         
+    def test_parody_matcher_precedence(self):
+        """Test compiled matcher agrees with a sequential marker scan"""
+        markers = self.analyzer.parody_markers
+        matcher = ParodyMatcher(markers)
+        texts = [
+            "This is NOT REAL, just a joke",
+            "#satire and parody",
+            "Mocking the market",
+            "Plain analysis",
+            ""
+        ]
+        
+        for text in texts:
+            expected = next((i for i, marker in enumerate(markers) if marker in text.lower()), -1)
+            self.assertEqual(matcher.first_match(text), expected)
+        
+        np.testing.assert_array_equal(
+            matcher.match_series(pd.Series(texts)),
+            [matcher.first_match(text) for text in texts]
+        )
+        
+    def test_custom_parody_dictionary(self):
+        """Test large configurable marker dictionaries"""
+        markers = [f"codeword{i:04d}" for i in range(2000)] + ['rug pull']
+        analyzer = IntertemporalAnalyzer(firm_id="TESTFIRM", parody_markers=markers)
+        data = pd.DataFrame({
+            'headline': ["Codeword1999 spotted", "Classic RUG PULL", "Nothing here", None, 42]
+        })
+        
+        results = analyzer._detect_parody_patterns(data)
+        
+        self.assertEqual(results['total_text_entries'], 3)
+        self.assertEqual(results['total_parody_indicators'], 2)
+        self.assertEqual(
+            [found['marker'] for found in results['parody_indicators_found']],
+            ['codeword1999', 'rug pull']
+        )
+        
     def test_volatility_clustering_analysis(self):
         """Test volatility clustering analysis"""
         results = self.analyzer.analyze_temporal_diffs(
@@ -132,6 +508,63 @@ class TestIntertemporalAnalyzer(unittest.TestCase):
         self.assertIn('volatility_metrics', vol_analysis)
         self.assertIn('stationarity_test', vol_analysis)
         
+    def test_volatility_universe_matches_single_series(self):
+        """Test vectorized universe volatility analysis against per-series calls"""
+        rng = np.random.default_rng(2)
+        universe = pd.DataFrame(
+            100 * np.exp(rng.normal(0, 0.02, size=(200, 6)).cumsum(axis=0)),
+            columns=[f'SYM{i}' for i in range(6)]
+        )
+        universe.iloc[:195, 5] = np.nan
+        
+        batch = self.analyzer.analyze_volatility_universe(universe, n_jobs=2)
+        
+        self.assertIn('error', batch['SYM5'])
+        for col in universe.columns[:5]:
+            single = self.analyzer._analyze_volatility_clustering(universe[col])
+            self.assertAlmostEqual(
+                batch[col]['volatility_metrics']['mean_volatility'],
+                single['volatility_metrics']['mean_volatility'],
+                places=12
+            )
+            self.assertAlmostEqual(
+                batch[col]['stationarity_test']['p_value'],
+                single['stationarity_test']['p_value'],
+                places=12
+            )
+            for entry in batch[col]['volatility_clustering']:
+                squared = universe[col].pct_change().dropna() ** 2
+                self.assertAlmostEqual(entry['autocorr'], squared.autocorr(lag=entry['lag']), places=10)
+        
+    def test_panel_analysis_matches_single_series(self):
+        """Test the panel table against per-symbol single-series analysis"""
+        panel = create_sample_financial_data(60, n_symbols=3)
+        panel.iloc[::7, 0] = np.nan
+        
+        table = self.analyzer.analyze_panel(panel, max_lag=4)
+        self.assertEqual(list(table.index), ['SYM000', 'SYM001', 'SYM002'])
+        self.assertTrue((table['n_obs'] == 60).all())
+        
+        for symbol in table.index:
+            series_frame = panel.xs(symbol, level='symbol')
+            diffs = self.analyzer._calculate_temporal_differentials(series_frame, max_lag=4)
+            cv = self.analyzer._perform_cross_validation(series_frame, 'time_series', None)
+            
+            self.assertAlmostEqual(table.loc[symbol, 'price_delta_std'], diffs['price_temporal_delta']['std'])
+            for entry in diffs['volume_rolling_correlations']:
+                self.assertAlmostEqual(table.loc[symbol, f"volume_lag{entry['lag']}_corr"], entry['correlation'])
+            self.assertAlmostEqual(table.loc[symbol, 'cv_mean_score'], cv['performance_metrics']['mean_cv_score'])
+        
+        # Long format with shuffled rows gives the same table
+        long_format = panel.reset_index().sample(frac=1.0, random_state=0)
+        pd.testing.assert_frame_equal(self.analyzer.analyze_panel(long_format, max_lag=4), table)
+        
+        # Rows without a symbol are dropped rather than shifting the groups
+        orphans = long_format.iloc[:25].assign(symbol=None)
+        with self.assertLogs('intertemporal_cv', level='WARNING'):
+            with_orphans = self.analyzer.analyze_panel(pd.concat([long_format, orphans]), max_lag=4)
+        pd.testing.assert_frame_equal(with_orphans, table)
+    
     def test_regime_change_detection(self):
         """Test regime change detection"""
         # Use longer series for regime change detection
@@ -151,6 +584,42 @@ class TestIntertemporalAnalyzer(unittest.TestCase):
             # If we have enough data, should have total_regime_changes
             self.assertIn('total_regime_changes', regime_results)
         
+    def test_regime_change_panel_matches_single_series(self):
+        """Test batch panel detection against per-series detection"""
+        rng = np.random.default_rng(11)
+        panel = pd.DataFrame(rng.normal(size=(300, 4)).cumsum(axis=0), columns=list('abcd'))
+        
+        batch = self.analyzer.detect_regime_changes_panel(panel)
+        
+        for col in panel.columns:
+            single = self.analyzer.get_regime_change_detection(panel[col])
+            self.assertEqual(batch['total_regime_changes'][col], single['total_regime_changes'])
+            np.testing.assert_array_equal(
+                batch['change_points'][col],
+                [point['index'] for point in single['change_points']]
+            )
+            self.assertTrue(all(20 <= point['index'] < 280 for point in single['change_points']))
+        
+    def test_cusum_regime_detection(self):
+        """Test online CUSUM detection on a drift shift, streamed or in one pass"""
+        rng = np.random.default_rng(5)
+        increments = np.r_[rng.normal(0, 1, 400), rng.normal(2, 1, 100)]
+        prices = pd.Series(100 + increments.cumsum())
+        
+        results = self.analyzer.get_regime_change_detection(
+            prices, window=100, method='cusum', threshold=10.0
+        )
+        first_alarm = results['change_points'][0]
+        self.assertTrue(395 <= first_alarm['index'] <= 420)
+        self.assertEqual(first_alarm['direction'], 'up')
+        
+        streaming = CusumDetector(threshold=10.0, warmup=100)
+        for chunk in np.array_split(increments, 9):
+            streaming.update(chunk)
+        one_shot = CusumDetector(threshold=10.0, warmup=100)
+        one_shot.update(increments)
+        self.assertEqual(streaming.alarms, one_shot.alarms)
+        
     def test_security_context_validation(self):
         """Test COMBSEC security context validation"""
         validation_result = self.analyzer.validate_security_context()
@@ -205,6 +674,49 @@ class TestIntertemporalAnalyzer(unittest.TestCase):
         
         # Should fallback to first numeric column
         self.assertIn('cv_analysis', results)
+        
+    def test_grid_search_shares_design_and_stops_losers(self):
+        """Test grid search scores against per-candidate refits, early stopping and threading"""
+        from sklearn.linear_model import LinearRegression
+        from sklearn.metrics import mean_squared_error
+        
+        df = create_sample_financial_data(400, seed=3)
+        grid = dict(lag_counts=[0, 2, 4], feature_sets=[[], ['volume']], cv_method='expanding_window')
+        
+        full = self.analyzer.grid_search_cv(df, 'returns', early_stopping=None, **grid)
+        self.assertEqual(full['n_candidates'], 10)  # (0 lags, no features) is skipped
+        self.assertEqual(full['n_stopped'], 0)
+        self.assertTrue(all(row['folds_evaluated'] == full['n_folds'] for row in full['leaderboard']))
+        
+        # One candidate against an independent lagged-feature refit on the shared rows
+        # (all candidates use the rows where the largest lag count is available)
+        row = next(r for r in full['leaderboard'] if (r['model'], r['n_lags'], r['features']) ==
+                   ('linear_regression', 2, ['volume']))
+        frame = pd.DataFrame({'y': df['returns'], 'volume': df['volume'], 'lag_1': df['returns'].shift(1),
+                              'lag_2': df['returns'].shift(2), 'lag_4': df['returns'].shift(4)}).dropna()
+        X, y = frame[['lag_1', 'lag_2', 'volume']].to_numpy(), frame['y'].to_numpy()
+        expected = []
+        for train, test in self.analyzer._cv_splits(len(y), 'expanding_window'):
+            model = LinearRegression().fit(X[train], y[train])
+            expected.append(mean_squared_error(y[test], model.predict(X[test])))
+        np.testing.assert_allclose(row['cv_scores'], expected, rtol=1e-8)
+        
+        pruned = self.analyzer.grid_search_cv(df, 'returns', early_stopping=1.01, n_jobs=4, **grid)
+        self.assertGreater(pruned['n_stopped'], 0)
+        self.assertEqual(pruned['best']['cv_scores'], full['best']['cv_scores'])
+        for stopped in (r for r in pruned['leaderboard'] if r['stopped']):
+            self.assertLess(stopped['folds_evaluated'], pruned['n_folds'])
+        
+        results = self.analyzer.analyze_temporal_diffs(df, cv_method='expanding_window', parody_detection=False,
+                                                       target_column='returns', param_grid={'lag_counts': [1, 3]})
+        cv = results['cv_analysis']
+        self.assertEqual(cv['grid_search']['n_candidates'], 8)  # 2 models x 2 lag counts x 2 feature sets
+        self.assertEqual(cv['cv_scores'], cv['grid_search']['best']['cv_scores'])
+        self.assertEqual(cv['model'], cv['grid_search']['best']['model'])
+        self.assertNotIn('solver', cv)
+        
+        for lag_counts in ([], [-1, 2]):
+            self.assertIn('error', self.analyzer.grid_search_cv(df, 'returns', lag_counts=lag_counts))
 
 
 class TestSampleDataGeneration(unittest.TestCase):
@@ -234,6 +746,155 @@ class TestSampleDataGeneration(unittest.TestCase):
         
         # Should be identical due to fixed random seed
         pd.testing.assert_frame_equal(data1, data2)
+    
+    def test_chunked_generation_matches_single_pass(self):
+        """Test that chunked panel generation does not depend on chunksize"""
+        params = dict(
+            n_symbols=3, volatility_clustering=0.9,
+            regimes=[{'length': 40, 'drift': 0.001, 'volatility': 0.01},
+                     {'length': 20, 'drift': -0.002, 'volatility': 0.04}]
+        )
+        panel = create_sample_financial_data(200, **params)
+        chunked = pd.concat(iter_sample_financial_data(200, chunksize=37, **params))
+        
+        pd.testing.assert_frame_equal(panel, chunked, check_freq=False)
+        self.assertEqual(panel.index.names, ['timestamp', 'symbol'])
+        self.assertEqual(len(panel), 600)
+        self.assertTrue(panel['returns'].groupby(level='symbol').head(1).isna().all())
+        
+        # Large row counts no longer overflow the timestamp range
+        minutes = create_sample_financial_data(100_000, freq='min')
+        self.assertEqual(len(minutes), 100_000)
+        self.assertTrue(np.isfinite(minutes['price']).all())
+    
+    def test_write_sample_data_in_chunks(self):
+        """Test chunked writing of sample data to disk"""
+        expected = create_sample_financial_data(250, n_symbols=2).reset_index()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_sample_financial_data(Path(tmp) / 'sample.csv.gz', 250, chunksize=60, n_symbols=2)
+            written = pd.read_csv(path)
+        
+        self.assertEqual(list(written.columns), list(expected.columns))
+        np.testing.assert_allclose(written['price'], expected['price'])
+        self.assertTrue((written['text_analysis'] == expected['text_analysis']).all())
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """Test the stage benchmark harness"""
+    
+    def test_benchmark_report_structure(self):
+        """Test per-stage timings, memory and report comparison"""
+        from benchmark_intertemporal_cv import run_benchmark, compare_reports, STAGES
+        
+        report = run_benchmark(rows=[200], columns=[5], cv_methods=['time_series', 'blocked'], repeat=1)
+        
+        self.assertIn('git_commit', report['metadata'])
+        self.assertEqual(len(report['results']), 2)
+        for entry in report['results']:
+            self.assertEqual(set(entry['stages']), set(STAGES))
+            for stage_result in entry['stages'].values():
+                self.assertGreaterEqual(stage_result['seconds'], 0.0)
+                self.assertGreater(stage_result['peak_memory_bytes'], 0)
+        
+        comparison = compare_reports(report, report)
+        self.assertEqual(len(comparison), 8)
+        self.assertFalse(any(row['regression'] for row in comparison))
+        
+    def test_cold_import_defers_heavy_modules(self):
+        """Test that a cold import of the module defers heavy dependencies"""
+        from benchmark_intertemporal_cv import measure_import_time
+        
+        # Wall-clock time against the budget is checked by the benchmark CLI
+        result = measure_import_time(repeat=1)
+        
+        self.assertEqual(result['heavy_modules_loaded'], [])
+
+
+class TestWalkForwardBacktest(unittest.TestCase):
+    """Test the walk-forward backtest engine"""
+    
+    def setUp(self):
+        self.prices = create_sample_financial_data(400, seed=7)['price']
+        
+    def test_folds_follow_cv_splits(self):
+        """Test that folds reuse the analyzer splitters and summarize the out-of-sample path"""
+        from walk_forward_backtest import walk_forward_backtest, performance_metrics
+        
+        analyzer = IntertemporalAnalyzer()
+        for cv_method in ['time_series', 'expanding_window', 'blocked']:
+            with self.subTest(cv_method=cv_method):
+                results = walk_forward_backtest(self.prices, cv_method=cv_method, n_lags=3, analyzer=analyzer)
+                
+                self.assertNotIn('error', results)
+                n_splits = len(list(analyzer.iter_cv_splits(len(self.prices) - 4, cv_method)))
+                self.assertEqual(len(results['folds']), n_splits)
+                self.assertEqual(results['summary']['n_folds'], n_splits)
+                self.assertEqual(len(results['positions']), sum(f['periods'] for f in results['folds']))
+                self.assertTrue(set(np.unique(results['positions'])) <= {-1.0, 0.0, 1.0})
+                
+                # Summary equity compounds the concatenated out-of-sample P&L
+                self.assertAlmostEqual(results['summary']['total_return'], np.prod(1 + results['pnl']) - 1)
+                self.assertGreaterEqual(results['summary']['max_drawdown'], 0.0)
+        
+        metrics = performance_metrics(np.array([1.0, 1.0, -1.0, 0.0]), np.array([0.1, -0.5, 0.1, 0.2]),
+                                      transaction_cost=0.01)
+        self.assertEqual(metrics['total_trades'], 3)
+        self.assertAlmostEqual(metrics['turnover'], 4.0)
+        self.assertAlmostEqual(metrics['max_drawdown'], 1 - (1.09 * 0.5 * 0.88 * 0.99) / 1.09)
+        self.assertAlmostEqual(metrics['avg_holding_periods'], 1.5)
+        
+    def test_missing_prices_keep_row_positions(self):
+        """Test that missing prices are forward-filled instead of shifting the folds"""
+        from walk_forward_backtest import walk_forward_backtest
+        
+        gappy = self.prices.copy()
+        gappy.iloc[[50, 51, 300]] = np.nan
+        results = walk_forward_backtest(gappy)
+        filled = walk_forward_backtest(gappy.ffill())
+        
+        self.assertEqual(results['filled_prices'], 3)
+        self.assertEqual([f['test_start'] for f in results['folds']], [f['test_start'] for f in filled['folds']])
+        self.assertEqual(results['summary'], filled['summary'])
+        
+        gappy.iloc[0] = np.nan
+        self.assertIn('error', walk_forward_backtest(gappy))
+        self.assertIn('error', walk_forward_backtest(self.prices.replace(self.prices.iloc[9], np.inf)))
+        
+    def test_parallel_sweep_matches_serial(self):
+        """Test that a process-parallel parameter sweep matches the serial sweep"""
+        from walk_forward_backtest import sweep_backtests
+        
+        grid = {'n_lags': [1, 3], 'threshold': [0.0, 0.001], 'cv_method': ['expanding_window', 'blocked']}
+        serial = sweep_backtests(self.prices, grid, n_jobs=1, transaction_cost=0.001)
+        parallel = sweep_backtests(self.prices, grid, n_jobs=2, transaction_cost=0.001)
+        
+        self.assertEqual(len(serial), 8)
+        self.assertTrue(serial['error'].isna().all())
+        pd.testing.assert_frame_equal(serial, parallel)
+        
+    def test_notion_backtest_results_are_measured(self):
+        """Test that the Notion page generator reports walk-forward results when given prices"""
+        sys.path.insert(0, str(repo_root / "QXR"))
+        sys.path.insert(0, str(repo_root / "ACTNEWWORLDODOR"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            from notion_page_generator import NotionPageGenerator
+            from walk_forward_backtest import walk_forward_backtest
+            
+            generator = NotionPageGenerator("WalkForwardTest")
+            measured = generator._create_backtest_results({'prices': self.prices})
+        
+            illustrative = generator._create_backtest_results({})
+        
+        self.assertTrue(measured.measured)
+        self.assertFalse(illustrative.measured)
+        self.assertIn(['Source', 'Illustrative (not measured)', 'Out-of-Sample Folds'],
+                      generator._generate_performance_table(illustrative))
+        
+        summary = walk_forward_backtest(self.prices)['summary']
+        self.assertAlmostEqual(measured.total_return, summary['total_return'] * 100)
+        self.assertAlmostEqual(measured.sharpe_ratio, summary['sharpe_ratio'])
+        self.assertEqual(measured.total_trades, summary['total_trades'])
 
 
 class TestIntegrationWithExistingSystems(unittest.TestCase):
@@ -291,6 +952,8 @@ def run_comprehensive_tests():
     test_classes = [
         TestIntertemporalAnalyzer,
         TestSampleDataGeneration,
+        TestBenchmarkHarness,
+        TestWalkForwardBacktest,
         TestIntegrationWithExistingSystems
     ]
     
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Backtest Engine for the Intertemporal Differentials Analysis Module
+
+Trades the out-of-sample predictions of the IntertemporalAnalyzer CV folds:
+every fold fits a lagged-return model on its training window, turns the
+test-window predictions into long/flat/short signals and books the P&L,
+turnover and drawdown of those signals with vectorized NumPy arithmetic.
+The folds come from the same splitters as the CV stage ('time_series',
+'expanding_window', 'blocked', 'purged_blocked'), and sweep_backtests runs
+many parameter sets across worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from intertemporal_cv import IntertemporalAnalyzer
+from intertemporal_kernels import lag_matrix
+
+
+PERIODS_PER_YEAR = 252
+
+_SPLIT_ANALYZER = None
+_SWEEP_PRICES = None
+
+
+def _split_analyzer() -> IntertemporalAnalyzer:
+    """Process-wide analyzer whose splitters define the walk-forward folds"""
+    global _SPLIT_ANALYZER
+    if _SPLIT_ANALYZER is None:
+        _SPLIT_ANALYZER = IntertemporalAnalyzer(firm_id="BACKTEST")
+    return _SPLIT_ANALYZER
+
+
+def _lagged_returns(prices: np.ndarray, n_lags: int):
+    """Next-period returns and the ``n_lags`` preceding returns for each of them"""
+    returns = prices[1:] / prices[:-1] - 1.0
+    return lag_matrix(returns, n_lags), returns[n_lags:]
+
+
+def _fit_predict(X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray, model=None) -> np.ndarray:
+    """Out-of-sample predictions from OLS with intercept (or a fit/predict estimator)"""
+    if model is not None:
+        from sklearn.base import clone
+        return clone(model).fit(X_train, y_train).predict(X_test)
+
+    design = np.column_stack([np.ones(len(X_train)), X_train])
+    coef = np.linalg.lstsq(design, y_train, rcond=None)[0]
+    return coef[0] + X_test @ coef[1:]
+
+
+def signals_from_predictions(predictions: np.ndarray, threshold: float = 0.0,
+                             allow_short: bool = True) -> np.ndarray:
+    """
+    Turn return predictions into positions
+
+    Args:
+        predictions: Predicted next-period returns
+        threshold: Minimum absolute prediction before a position is taken
+        allow_short: Go short on negative predictions (otherwise stay flat)
+
+    Returns:
+        Positions in {-1, 0, 1}
+    """
+    positions = np.where(predictions > threshold, 1.0, 0.0)
+    if allow_short:
+        positions[predictions < -threshold] = -1.0
+    return positions
+
+
+def performance_metrics(positions: np.ndarray, returns: np.ndarray,
+                        transaction_cost: float = 0.0,
+                        periods_per_year: int = PERIODS_PER_YEAR) -> Dict[str, Any]:
+    """
+    Vectorized P&L, turnover and drawdown of a position path
+
+    Positions are held over the period whose return they are paired with;
+    every unit of position change pays ``transaction_cost``. The path starts
+    flat, so the first position is a trade.
+
+    Args:
+        positions: Position per period
+        returns: Realized return per period
+        transaction_cost: Cost per unit of turnover, as a fraction of equity
+        periods_per_year: Periods used to annualize return and Sharpe ratio
+
+    Returns:
+        Dictionary of performance metrics (returns and drawdown as fractions)
+    """
+    n = len(returns)
+    trades = np.abs(np.diff(positions, prepend=0.0))
+    pnl = positions * returns - transaction_cost * trades
+    equity = np.cumprod(1.0 + pnl)
+    drawdown = 1.0 - equity / np.maximum.accumulate(np.maximum(equity, 1.0))
+
+    active = positions != 0
+    entries = np.count_nonzero(active & (np.diff(positions, prepend=0.0) != 0))
+    std = pnl.std()
+    total_return = float(equity[-1] - 1.0) if n else 0.0
+
+    return {
+        'periods': n,
+        'total_return': total_return,
+        'annualized_return': float((1.0 + total_return) ** (periods_per_year / n) - 1.0) if n and total_return > -1 else -1.0,
+        'sharpe_ratio': float(np.sqrt(periods_per_year) * pnl.mean() / std) if std > 0 else 0.0,
+        'max_drawdown': float(drawdown.max()) if n else 0.0,
+        'turnover': float(trades.sum()),
+        'total_trades': int(np.count_nonzero(trades)),
+        'win_rate': float((pnl[active] > 0).mean()) if active.any() else 0.0,
+        'exposure': float(active.mean()) if n else 0.0,
+        'avg_holding_periods': float(active.sum() / entries) if entries else 0.0
+    }
+
+
+def walk_forward_backtest(prices: Union[pd.Series, np.ndarray, List[float]],
+                          cv_method: str = 'expanding_window',
+                          n_lags: int = 3,
+                          threshold: float = 0.0,
+                          transaction_cost: float = 0.0005,
+                          allow_short: bool = True,
+                          split_params: Optional[Dict[str, int]] = None,
+                          periods_per_year: int = PERIODS_PER_YEAR,
+                          model=None,
+                          analyzer: Optional[IntertemporalAnalyzer] = None) -> Dict[str, Any]:
+    """
+    Walk-forward backtest of a lagged-return model over CV folds
+
+    Each fold fits the model on its training rows only and trades its
+    test rows, so every booked return is out of sample. Fold metrics are
+    reported individually and for the concatenated out-of-sample path.
+    Missing prices are forward-filled (a flat price over the gap), so row
+    positions keep matching the input; a missing first price or an
+    infinite price is rejected.
+
+    Args:
+        prices: Price series
+        cv_method: Splitter ('time_series', 'expanding_window', 'blocked',
+            'purged_blocked')
+        n_lags: Number of lagged returns used as features
+        threshold: Minimum absolute predicted return before trading
+        transaction_cost: Cost per unit of turnover
+        allow_short: Trade negative predictions short instead of flat
+        split_params: Keyword overrides for the splitter
+        periods_per_year: Periods used for annualization
+        model: Optional estimator with fit/predict (default: OLS via lstsq)
+        analyzer: Analyzer providing the splitters (default: a shared one)
+
+    Returns:
+        Dictionary with the parameters, per-fold metrics, a summary, the
+        out-of-sample positions/P&L and the number of filled prices
+    """
+    prices = pd.Series(np.asarray(prices, dtype=float))
+    if np.isinf(prices.to_numpy()).any():
+        return {'error': 'Prices must not be infinite'}
+    missing = prices.isna()
+    if missing.any():
+        if missing.iloc[0]:
+            return {'error': 'Prices must start with a valid price'}
+        prices = prices.ffill()
+    prices = prices.to_numpy()
+    if n_lags < 1 or len(prices) - n_lags - 1 < 10:
+        return {'error': 'Insufficient data for walk-forward backtest'}
+
+    X, y = _lagged_returns(prices, n_lags)
+    analyzer = analyzer or _split_analyzer()
+
+    results = {
+        'parameters': {
+            'cv_method': cv_method,
+            'n_lags': n_lags,
+            'threshold': threshold,
+            'transaction_cost': transaction_cost,
+            'allow_short': allow_short,
+            'split_params': split_params or {}
+        },
+        'folds': [],
+        'summary': {},
+        'filled_prices': int(missing.sum())
+    }
+
+    test_rows, fold_positions = [], []
+    try:
+        for fold, (train, test) in enumerate(analyzer.iter_cv_splits(len(y), cv_method, split_params)):
+            rows = np.arange(len(y))[test]
+            if len(rows) == 0:
+                continue
+            predictions = _fit_predict(X[train], y[train], X[test], model)
+            positions = signals_from_predictions(predictions, threshold, allow_short)
+
+            metrics = performance_metrics(positions, y[test], transaction_cost, periods_per_year)
+            metrics.update({
+                'fold': fold,
+                'train_size': len(np.arange(len(y))[train]),
+                # Rows of ``prices`` whose close realizes the first/last test return
+                'test_start': int(rows[0] + n_lags + 1),
+                'test_end': int(rows[-1] + n_lags + 1)
+            })
+            results['folds'].append(metrics)
+            test_rows.append(rows)
+            fold_positions.append(positions)
+    except Exception as e:
+        results['error'] = f"Walk-forward backtest failed: {str(e)}"
+        return results
+
+    if not test_rows:
+        results['error'] = 'No walk-forward folds for the given split parameters'
+        return results
+
+    rows = np.concatenate(test_rows)
+    positions = np.concatenate(fold_positions)
+    results['summary'] = performance_metrics(positions, y[rows], transaction_cost, periods_per_year)
+    results['summary']['n_folds'] = len(results['folds'])
+    results['positions'] = positions
+    results['pnl'] = positions * y[rows] - transaction_cost * np.abs(np.diff(positions, prepend=0.0))
+
+    return results
+
+
+def _expand_grid(param_grid: Union[Dict[str, List[Any]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Parameter dicts from a grid of value lists (or pass an explicit list through)"""
+    if isinstance(param_grid, dict):
+        keys = list(param_grid)
+        return [dict(zip(keys, values)) for values in product(*(param_grid[k] for k in keys))]
+    return [dict(params) for params in param_grid]
+
+
+def _set_sweep_prices(prices: np.ndarray) -> None:
+    """Pool initializer: ship the price array to each worker once"""
+    global _SWEEP_PRICES
+    _SWEEP_PRICES = prices
+
+
+def _sweep_worker(params: Dict[str, Any], prices: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """Summary row of one walk-forward backtest in a sweep"""
+    result = walk_forward_backtest(_SWEEP_PRICES if prices is None else prices, **params)
+    row = {key: (value if not isinstance(value, dict) else repr(value)) for key, value in params.items()}
+    row.update(result.get('summary', {}))
+    row['error'] = result.get('error')
+    return row
+
+
+def sweep_backtests(prices: Union[pd.Series, np.ndarray, List[float]],
+                    param_grid: Union[Dict[str, List[Any]], List[Dict[str, Any]]],
+                    n_jobs: int = 1,
+                    **fixed_params) -> pd.DataFrame:
+    """
+    Run walk-forward backtests for many parameter sets
+
+    With ``n_jobs`` > 1 the parameter sets are spread over worker
+    processes; the price array is sent to each worker once through the
+    pool initializer and only the small parameter dicts travel per task.
+
+    Args:
+        prices: Price series
+        param_grid: Dict of parameter -> list of values (full cross product)
+            or an explicit list of parameter dicts
+        n_jobs: Number of worker processes (-1 for all cores)
+        **fixed_params: Parameters shared by every backtest
+
+    Returns:
+        DataFrame with one row per parameter set: the parameters, the
+        summary metrics and an error column
+    """
+    prices = np.asarray(prices, dtype=float)
+    configs = [{**fixed_params, **params} for params in _expand_grid(param_grid)]
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(configs)))
+
+    if n_jobs == 1:
+        rows = [_sweep_worker(params, prices) for params in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_set_sweep_prices,
+                                 initargs=(prices,)) as executor:
+            chunksize = max(1, len(configs) // (4 * n_jobs))
+            rows = list(executor.map(_sweep_worker, configs, chunksize=chunksize))
+
+    return pd.DataFrame(rows)